@@ -0,0 +1,413 @@
+import click
+import geopandas as gpd
+import json
+import logging
+import numpy as np
+import pandas as pd
+import platform
+import pygeos
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+from tabulate import tabulate
+from typing import Any, Dict, List, Sequence, Tuple
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+import helpers
+import topology
+from validate_segment import DatasetValidation
+
+# Set logger.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler(sys.stdout)
+handler.setLevel(logging.INFO)
+handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
+logger.addHandler(handler)
+
+# Define the spacing of network nodes, in the units of the coordinate reference system.
+SPACING = 100
+
+
+def _gen_edges(size: int, topology_type: str, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generates the edges of a planar network of approximately the given number of edges.
+
+    \b
+    :param int size: approximate number of edges.
+    :param str topology_type: network topology, one of: grid (jittered lattice), random (random planar graph, being a
+        Delaunay triangulation of random points with a quarter of its edges removed). Removed edges may leave edges
+        outside of all faces, which are removed by gen_network.
+    :param np.random.Generator rng: random number generator.
+    :return np.ndarray: float64 array of shape (edges, 2, 2) of edge start and end coordinates.
+    """
+
+    if topology_type == "grid":
+
+        # Generate a lattice of n x n cells (2n(n + 1) edges) with jittered nodes.
+        n = max(int(round(np.sqrt(size / 2))), 1)
+        nodes = np.stack(np.meshgrid(np.arange(n + 1), np.arange(n + 1)), axis=-1) * float(SPACING)
+        nodes += rng.uniform(-SPACING / 5, SPACING / 5, nodes.shape)
+
+        return np.concatenate([np.stack([nodes[:, :-1], nodes[:, 1:]], axis=2).reshape(-1, 2, 2),
+                               np.stack([nodes[:-1, :], nodes[1:, :]], axis=2).reshape(-1, 2, 2)])
+
+    # Generate a Delaunay triangulation (~3 edges per point) of random points and remove a quarter of its edges.
+    n = max(int(size / 2.25), 3)
+    pts = rng.uniform(0, SPACING * np.sqrt(n), (n, 2))
+    edges = pygeos.get_parts(pygeos.delaunay_triangles(pygeos.multipoints(pts), only_edges=True))
+    coords = pygeos.get_coordinates(edges).reshape(-1, 2, 2)
+
+    return coords[rng.random(len(coords)) >= 0.25]
+
+
+def _gen_cul_de_sacs(polys: np.ndarray, fraction: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generates cul-de-sacs (dangles) within a random subset of faces, from the first ring vertex (a node) of each face
+    towards a point within the face. Cul-de-sacs which would touch the face boundary beyond their start node are
+    discarded.
+
+    \b
+    :param np.ndarray polys: pygeos polygons (faces).
+    :param float fraction: fraction of faces containing a cul-de-sac.
+    :param np.random.Generator rng: random number generator.
+    :return np.ndarray: float64 array of shape (cul-de-sacs, 2, 2) of start and end coordinates.
+    """
+
+    polys = polys[rng.random(len(polys)) < fraction]
+    if not len(polys):
+        return np.empty((0, 2, 2))
+
+    starts = pygeos.get_coordinates(pygeos.get_point(pygeos.get_exterior_ring(polys), 0))
+    ends = starts + 0.5 * (pygeos.get_coordinates(pygeos.point_on_surface(polys)) - starts)
+    coords = np.stack([starts, ends], axis=1)
+
+    # Keep cul-de-sacs which are within their face, except for their start node on the face boundary.
+    flag = pygeos.relate_pattern(pygeos.linestrings(coords), polys, "1FF00F***")
+
+    return coords[flag]
+
+
+def _gen_errors(codes: Sequence[int], n_errors: int, origin: Tuple[float, float],
+                rng: np.random.Generator) -> List[Tuple[List[Tuple[float, float]], int]]:
+    """
+    Generates arcs which violate each validation, isolated from each other and from the network in a strip of cells
+    starting at the origin. Each error is self-contained, such that it is flagged by its own validation (although
+    isolated arcs are also flagged by validation 401).
+
+    \b
+    :param Sequence[int] codes: validation codes.
+    :param int n_errors: number of errors per validation code.
+    :param Tuple[float, float] origin: xy coordinates of the error strip origin.
+    :param np.random.Generator rng: random number generator.
+    :return List[Tuple[List[Tuple[float, float]], int]]: list of arc coordinates and segment types.
+    """
+
+    s = SPACING
+    templates = {
+        101: [([(0, 0), (0, 0)], 1)],
+        102: [([(0, 0), (s, s), (s, 0), (0, s)], 1)],
+        103: [([(0, 0), (0.001, 0), (s, 0)], 1)],
+        201: [([(0, 0), (s, 0)], 1), ([(0, 0), (s, 0)], 1)],
+        202: [([(0, 0), (s, 0)], 1), ([(s / 2, 0), (s * 1.5, 0)], 1)],
+        301: [([(0, 0), (s / 2, s / 2), (s, 0)], 1), ([(s / 2, s / 2), (s / 2, s * 1.5)], 1)],
+        302: [([(0, 0), (s, s)], 1), ([(0, s), (s, 0)], 1)],
+        401: [([(0, 0), (s, 0)], 1)],
+        402: [([(0, 0), (s, 0)], 2)]
+    }
+
+    arcs = list()
+    for row, code in enumerate(sorted(codes)):
+        for col in range(n_errors):
+
+            # Offset the template to its cell, with a random jitter.
+            x, y = np.array(origin) + np.array([col, row]) * s * 3 + rng.uniform(0, s / 2, 2)
+            for pts, segment_type in templates[code]:
+                arcs.append(([(x + pt[0], y + pt[1]) for pt in pts], segment_type))
+
+    return arcs
+
+
+def gen_network(size: int, topology_type: str = "grid", seed: int = 0, cul_de_sacs: float = 0.05,
+                errors: Sequence[int] = (), n_errors: int = 1, crs: str = "EPSG:3347") -> \
+        Tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+    """
+    Generates a synthetic road network (segment) and its matching meshblock (basic_block) coverage. Arcs with a
+    meshblock polygon on one side only (the outer boundary of the network) are boundary arcs (segment_type=2). The
+    meshblock polygons are grouped into parents (cb_uid) of 4 x 4 network cells, and the arc-meshblock identifiers
+    (bb_uid_l, bb_uid_r) are consistent with the meshblock, such that an error-free network is fully valid.
+
+    \b
+    :param int size: approximate number of arcs.
+    :param str topology_type: network topology, one of: grid, random (see _gen_edges), default=grid.
+    :param int seed: random seed, default=0.
+    :param float cul_de_sacs: fraction of meshblock polygons containing a cul-de-sac, default=0.05.
+    :param Sequence[int] errors: validation codes for which errors are injected, default=() (none).
+    :param int n_errors: number of errors injected per validation code, default=1.
+    :param str crs: coordinate reference system, default=EPSG:3347.
+    :return Tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]: segment and basic_block GeoDataFrames.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    def gen_uuids(n: int) -> List[uuid.UUID]:
+        return [uuid.UUID(bytes=val.tobytes(), version=4) for val in rng.integers(0, 256, (n, 16), dtype=np.uint8)]
+
+    # Generate network edges and faces.
+    edges = _gen_edges(size, topology_type, rng)
+    store = topology.CoordinateStore(edges.reshape(-1, 2), np.arange(0, 2 * len(edges) + 1, 2))
+    polys, faces = topology.NodeEdgeGraph(store).polygonize()
+
+    # Remove edges outside of all faces (isolated edges, and dangles and bridges of the unbounded face), which would
+    # not be covered by a meshblock polygon.
+    edges = edges[(faces >= 0).any(axis=1)]
+
+    # Generate cul-de-sacs and the faces of all arcs.
+    edges = np.concatenate([edges, _gen_cul_de_sacs(polys, cul_de_sacs, rng)])
+    store = topology.CoordinateStore(edges.reshape(-1, 2), np.arange(0, 2 * len(edges) + 1, 2))
+    polys, faces = topology.NodeEdgeGraph(store).polygonize()
+
+    # Generate meshblock, with parents of 4 x 4 network cells.
+    bb_uids = np.array(gen_uuids(len(polys)) + [None], dtype=object)
+    keys = np.floor(pygeos.get_coordinates(pygeos.point_on_surface(polys)) / (SPACING * 4)).astype(np.int64)
+    _, parents = np.unique(keys, axis=0, return_inverse=True)
+    meshblock = gpd.GeoDataFrame({"bb_uid": bb_uids[:-1],
+                                  "cb_uid": np.array(gen_uuids(parents.max(initial=-1) + 1), dtype=object)[
+                                      parents.ravel()]},
+                                 geometry=gpd.GeoSeries(polys, crs=crs))
+
+    # Generate arcs, with boundary arcs and arc-meshblock identifiers.
+    df = gpd.GeoDataFrame({"segment_id": gen_uuids(len(edges)),
+                           "bb_uid_l": bb_uids[faces[:, 0]],
+                           "bb_uid_r": bb_uids[faces[:, 1]],
+                           "segment_type": np.where((faces == -1).sum(axis=1) == 1, 2, 1)},
+                          geometry=gpd.GeoSeries(pygeos.linestrings(edges), crs=crs))
+
+    # Inject errors.
+    if len(errors):
+        origin = (pygeos.total_bounds(pygeos.linestrings(edges))[2] + SPACING * 10, 0)
+        arcs = _gen_errors(errors, n_errors, origin, rng)
+        df = pd.concat([df, gpd.GeoDataFrame(
+            {"segment_id": gen_uuids(len(arcs)), "bb_uid_l": None, "bb_uid_r": None,
+             "segment_type": [segment_type for _, segment_type in arcs]},
+            geometry=gpd.GeoSeries(pygeos.linestrings([pt for pts, _ in arcs for pt in pts],
+                                                      indices=np.repeat(np.arange(len(arcs)),
+                                                                        [len(pts) for pts, _ in arcs])),
+                                   crs=crs))], ignore_index=True)
+
+    df.rename_geometry("geom", inplace=True)
+    meshblock.rename_geometry("geom", inplace=True)
+
+    return df, meshblock
+
+
+def _flatten_stages(records: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Flattens a hierarchy of traced stage records (see helpers.Tracer) into the wall time of each stage path. Wall times
+    of repeated stages (identical paths) are summed.
+
+    \b
+    :param List[Dict[str, Any]] records: stage records.
+    :return Dict[str, float]: dictionary of stage paths and wall times in seconds.
+    """
+
+    stages = dict()
+    stack = list(reversed(records))
+
+    while stack:
+        record = stack.pop()
+        stages[record["path"]] = stages.get(record["path"], 0.0) + (record["wall_seconds"] or 0.0)
+        stack.extend(reversed(record["stages"]))
+
+    return stages
+
+
+def _compile_updates(validation: DatasetValidation) -> int:
+    """
+    Compiles the meshblock updates of a dataset validation as a full rewrite (all meshblock polygons added, all arc-
+    meshblock identifiers updated, and all existing meshblock polygons removed), since the updates of an unchanged
+    network are empty, and encodes their records in the binary COPY format, in batches, without writing them.
+
+    \b
+    :param DatasetValidation validation: dataset validation.
+    :return int: number of encoded bytes.
+    """
+
+    cols = [validation.id_meshblock, validation.id_meshblock_parent, validation.geom_col]
+    updates = {"meshblock_added": validation.meshblock[cols],
+               "arcs_modified": validation.df[[validation.id, validation.id_meshblock_left,
+                                               validation.id_meshblock_right]],
+               "meshblock_removed": validation.meshblock_existing[cols]}
+
+    nbytes = 0
+    for update in validation._compile_meshblock_updates(updates).values():
+        records = list(update["copy"]["records"])
+        for idx in range(0, len(records), 100000):
+            nbytes += len(helpers.encode_copy_binary(records[idx: idx + 100000]))
+
+    return nbytes
+
+
+def run(size: int, topology_type: str = "grid", seed: int = 0, cul_de_sacs: float = 0.05,
+        errors: Sequence[int] = (), n_errors: int = 1) -> Dict[str, Any]:
+    """
+    Benchmarks dataset validation of a synthetic network (see gen_network) without a database, via the public path
+    (DatasetValidation.from_datasets(...)()). Stages are timed by the stage tracer (see helpers.Tracer), including:
+    network generation (generate), initialization (init: topology, validation scope, and meshblock), each validation
+    (run/validate/validation_<code>) and, if no errors are found, the meshblock update (run/update_meshblock).
+
+    Stages which are not executed without a database writer, or for noded arcs, are timed separately: the compilation
+    of the SQL statements of validation errors (compile_errors_sql) and, if no errors are found, the compilation and
+    binary COPY encoding of the meshblock updates of a full rewrite (compile_meshblock_updates) and the meshblock
+    update from parity assignment (update_meshblock_parity, including its configure_meshblock_parity stage).
+
+    \b
+    :param int size: approximate number of arcs.
+    :param str topology_type: network topology, one of: grid, random, default=grid.
+    :param int seed: random seed, default=0.
+    :param float cul_de_sacs: fraction of meshblock polygons containing a cul-de-sac, default=0.05.
+    :param Sequence[int] errors: validation codes for which errors are injected, default=() (none).
+    :param int n_errors: number of errors injected per validation code, default=1.
+    :return Dict[str, Any]: benchmark results.
+    """
+
+    logger.info(f"Benchmarking network: {size} arcs ({topology_type}).")
+
+    helpers.tracer.configure()
+
+    try:
+
+        # Generate network.
+        with helpers.tracer.stage("generate"):
+            df, meshblock = gen_network(size, topology_type, seed, cul_de_sacs, errors, n_errors)
+
+        # Initialize and execute validation.
+        with helpers.tracer.stage("init"):
+            validation = DatasetValidation.from_datasets(df, meshblock, engine="python")
+        with helpers.tracer.stage("run"):
+            errors_found, _ = validation()
+
+        # Compile SQL statements of validation errors.
+        with helpers.tracer.stage("compile_errors_sql"):
+            validation._compile_errors_sql()
+
+        # Compile COPY records of meshblock updates and update meshblock from parity assignment. As per
+        # DatasetValidation.__call__, the meshblock is only updated if no errors remain.
+        if not any(map(len, errors_found.values())):
+            with helpers.tracer.stage("compile_meshblock_updates"):
+                _compile_updates(validation)
+            arc_faces, validation.arc_faces = validation.arc_faces, None
+            with helpers.tracer.stage("update_meshblock_parity"):
+                validation._update_meshblock()
+            validation.arc_faces = arc_faces
+
+        stages = _flatten_stages(helpers.tracer.stages)
+
+    finally:
+        helpers.tracer.configure(enabled=False)
+
+    return {"size": size, "topology": topology_type, "seed": seed, "arcs": len(df), "meshblock": len(meshblock),
+            "errors": {code: len(ids) for code, ids in errors_found.items()}, "stages": stages,
+            "peak_rss": helpers.get_peak_rss()}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> str:
+    """
+    Tabulates the stage wall times of benchmark results against a baseline, for matching runs (size and topology).
+
+    \b
+    :param Dict[str, Any] results: benchmark results.
+    :param Dict[str, Any] baseline: baseline benchmark results.
+    :return str: table of stage wall times and ratios (results / baseline).
+    """
+
+    runs_baseline = {(run_["size"], run_["topology"]): run_ for run_ in baseline["runs"]}
+    rows = list()
+
+    for run_ in results["runs"]:
+        run_baseline = runs_baseline.get((run_["size"], run_["topology"]))
+        if run_baseline:
+            for stage, seconds in run_["stages"].items():
+                seconds_baseline = run_baseline["stages"].get(stage)
+                if seconds_baseline is not None:
+                    rows.append([run_["size"], run_["topology"], stage, f"{seconds_baseline:.3f}", f"{seconds:.3f}",
+                                 f"{seconds / max(seconds_baseline, 1e-9):.2f}"])
+
+    return tabulate(rows, headers=["Size", "Topology", "Stage", "Baseline (s)", "Current (s)", "Ratio"],
+                    tablefmt="rst", colalign=("right", "left", "left", "right", "right", "right"))
+
+
+@click.command()
+@click.option("--size", "sizes", type=click.IntRange(min=1), multiple=True,
+              default=(10000, 100000, 1000000, 2000000), show_default=True,
+              help="Approximate number of arcs of each synthetic network. Can be repeated.")
+@click.option("--topology", "topology_type", type=click.Choice(["grid", "random"], False), default="grid",
+              show_default=True, help="Network topology: jittered lattice (grid) or random planar graph (random).")
+@click.option("--seed", type=click.INT, default=0, show_default=True, help="Random seed.")
+@click.option("--cul_de_sacs", type=click.FloatRange(min=0, max=1), default=0.05, show_default=True,
+              help="Fraction of meshblock polygons containing a cul-de-sac.")
+@click.option("--errors", type=click.Choice(list(map(str, (101, 102, 103, 201, 202, 301, 302, 401, 402)))),
+              multiple=True, default=(), help="Validation code for which errors are injected. Can be repeated.")
+@click.option("--n_errors", type=click.IntRange(min=1), default=1, show_default=True,
+              help="Number of errors injected per validation code.")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), default="benchmark_segment.json",
+              show_default=True, help="Output JSON file of benchmark results.")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None,
+              help="JSON file of previous benchmark results to compare against.")
+def main(sizes: Tuple[int, ...] = (10000, 100000, 1000000, 2000000), topology_type: str = "grid", seed: int = 0,
+         cul_de_sacs: float = 0.05, errors: Tuple[str, ...] = (), n_errors: int = 1,
+         output: Path = Path("benchmark_segment.json"), baseline: Path = None) -> None:
+    """
+    Benchmarks validate_segment on synthetic networks, without a database.
+
+    \f\b
+    :param Tuple[int, ...] sizes: approximate number of arcs of each synthetic network,
+        default=(10000, 100000, 1000000, 2000000).
+    :param str topology_type: network topology, one of: grid, random, default=grid.
+    :param int seed: random seed, default=0.
+    :param float cul_de_sacs: fraction of meshblock polygons containing a cul-de-sac, default=0.05.
+    :param Tuple[str, ...] errors: validation codes for which errors are injected, default=() (none).
+    :param int n_errors: number of errors injected per validation code, default=1.
+    :param Path output: output JSON file of benchmark results, default=benchmark_segment.json.
+    :param Path baseline: JSON file of previous benchmark results to compare against, default=None.
+    """
+
+    try:
+
+        with helpers.Timer():
+
+            # Execute benchmarks.
+            results = {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "platform": {"python": platform.python_version(), "machine": platform.machine(),
+                             "system": platform.system(), "numpy": np.__version__, "geopandas": gpd.__version__,
+                             "pygeos": pygeos.__version__, "geos": pygeos.geos_version_string},
+                "runs": [run(size, topology_type, seed, cul_de_sacs, list(map(int, errors)), n_errors)
+                         for size in sorted(sizes)]
+            }
+
+            # Write results.
+            with open(output, "w") as f:
+                json.dump(results, f, indent=2)
+            logger.info(f"Benchmark results written to: {output}.")
+
+            # Log results.
+            for run_ in results["runs"]:
+                summary = tabulate([[stage, f"{seconds:.3f}"] for stage, seconds in run_["stages"].items()],
+                                   headers=["Stage", "Wall Time (s)"], tablefmt="rst", colalign=("left", "right"))
+                logger.info(f"Benchmark results: {run_['arcs']} arcs ({run_['topology']}):\n" + summary)
+
+            # Compare results against baseline.
+            if baseline:
+                with open(baseline) as f:
+                    logger.info(f"Benchmark comparison against: {baseline}.\n" + compare(results, json.load(f)))
+
+    except Exception as e:
+        logger.exception(f"Unhandled exception encountered. Exception details:\n{type(e).__name__}: {e}",
+                         exc_info=False)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pygeos
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Sequence, Tuple
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+import helpers
+import registry
+
+# Define the data model and its datasets.
+MODEL = Path(__file__).resolve().parent.name
+DATASETS = helpers.load_yaml(Path(__file__).resolve().parent / "datasets.yaml")
+
+# Define spatial datasets with unique geometries (see the data dictionary of the data model). Excludes segment, which is
+# validated by validate_segment.py (validation 201).
+UNIQUE_GEOMETRY = ("basic_block", "blocked_passage", "crossing", "ferry", "toll_point")
+
+# Define identifier references of each dataset as column: referenced dataset(s), shared with the AOI checkout.
+REFERENCES = helpers.load_yaml(Path(__file__).resolve().parent / "references.yaml")
+
+# Define lookup domains of each dataset as column: lookup dataset (see the data dictionary of the data model).
+LOOKUPS = {
+    "address_range": {"first_house_number_type": "house_number_type_lookup",
+                      "last_house_number_type": "house_number_type_lookup",
+                      "house_number_structure": "house_number_structure_lookup",
+                      "reference_system_indicator": "reference_system_indicator_lookup",
+                      "acquisition_technique": "acquisition_technique_lookup",
+                      "provider": "provider_lookup"},
+    "blocked_passage": {"blocked_passage_type": "blocked_passage_type_lookup",
+                        "acquisition_technique": "acquisition_technique_lookup",
+                        "provider": "provider_lookup"},
+    "crossing": {"crossing_status": "crossing_status_lookup"},
+    "ferry": {"closing_period": "closing_period_lookup",
+              "functional_road_class": "functional_road_class_lookup",
+              "province": "province_lookup",
+              "acquisition_technique": "acquisition_technique_lookup",
+              "provider": "provider_lookup"},
+    "junction": {"junction_type": "junction_type_lookup",
+                 "province": "province_lookup",
+                 "acquisition_technique": "acquisition_technique_lookup",
+                 "provider": "provider_lookup"},
+    "segment": {"segment_type": "segment_type_lookup",
+                "closing_period": "closing_period_lookup",
+                "functional_road_class": "functional_road_class_lookup",
+                "traffic_direction": "traffic_direction_lookup",
+                "road_surface_type": "road_surface_type_lookup",
+                "trans_canada_highway": "trans_canada_highway_lookup",
+                "national_highway_system": "national_highway_system_lookup",
+                "acquisition_technique": "acquisition_technique_lookup",
+                "provider": "provider_lookup"},
+    "street_name": {"street_direction_prefix": "street_direction_lookup",
+                    "street_type_prefix": "street_type_lookup",
+                    "street_article": "street_article_lookup",
+                    "street_type_suffix": "street_type_lookup",
+                    "street_direction_suffix": "street_direction_lookup"},
+    "street_name_translation": {"language_code": "language_code_lookup"},
+    "structure": {"structure_type": "structure_type_lookup"},
+    "toll_point": {"toll_point_type": "toll_point_type_lookup",
+                   "acquisition_technique": "acquisition_technique_lookup",
+                   "provider": "provider_lookup"}
+}
+
+# Define datasets which are streamed in batches rather than loaded, being the link datasets.
+STREAMED = tuple(dataset for dataset in DATASETS if dataset.endswith("_link"))
+
+
+def flag_invalid_references(vals: pd.Series, keys: Sequence[pd.Index]) -> np.ndarray:
+    """
+    Flags non-null values which do not exist in any of the given identifier indexes. Values are integer-encoded such
+    that each distinct value is tested once via a hash lookup, and flags are mapped back to records by their codes.
+
+    \b
+    :param pd.Series vals: values.
+    :param Sequence[pd.Index] keys: identifier indexes of the referenced datasets.
+    :return np.ndarray: boolean array of invalid values.
+    """
+
+    # Integer-encode values. Null values are encoded as -1.
+    codes, uniques = pd.factorize(vals)
+
+    # Flag distinct values missing from all identifier indexes.
+    missing = np.ones(len(uniques), dtype=bool)
+    for index in keys:
+        missing &= index.get_indexer(uniques) < 0
+
+    # Map flags to records, with a trailing False for null values.
+    return np.append(missing, False)[codes]
+
+
+def invalid_references(dataset: str, references: Dict[str, Tuple[str, ...]], code: int,
+                       dfs: Dict[str, Any], artifacts: Dict[str, Any]) -> Dict[int, Dict[str, set]]:
+    """
+    Validates: Referenced identifiers or lookup codes must exist in the referenced dataset(s).
+
+    \b
+    :param str dataset: dataset name.
+    :param Dict[str, Tuple[str, ...]] references: dictionary of columns and referenced dataset names.
+    :param int code: validation code.
+    :param Dict[str, Any] dfs: dictionary of dataset names and DataFrames, or callables returning an iterator of
+        DataFrames for streamed datasets.
+    :param Dict[str, Any] artifacts: dictionary of artifact names and artifacts.
+    :return Dict[int, Dict[str, set]]: validation code and dictionary of dataset names and identifiers of erroneous
+        records.
+    """
+
+    df = dfs[dataset]
+    errors = set()
+
+    # Validate each batch of the dataset.
+    for batch in df() if callable(df) else (df,):
+
+        flag = np.zeros(len(batch), dtype=bool)
+        for column, datasets in references.items():
+            flag |= flag_invalid_references(batch[column], [artifacts[f"keys:{name}"] for name in datasets])
+
+        errors.update(batch.index[flag])
+
+    return {code: {dataset: errors}}
+
+
+def duplicated_geometry(dataset: str, dfs: Dict[str, gpd.GeoDataFrame], artifacts: Dict[str, Any]) -> \
+        Dict[int, Dict[str, set]]:
+    """
+    Validates: Geometries must be unique.
+
+    \b
+    :param str dataset: dataset name.
+    :param Dict[str, gpd.GeoDataFrame] dfs: dictionary of dataset names and GeoDataFrames.
+    :param Dict[str, Any] artifacts: dictionary of artifact names and artifacts.
+    :return Dict[int, Dict[str, set]]: validation code and dictionary of dataset names and identifiers of erroneous
+        records.
+    """
+
+    df = dfs[dataset]
+    geoms = helpers.to_pygeos(df.geometry)
+
+    # Query distinct geometry pairs with covering geometries, then filter to equal geometries.
+    idxs, idxs_other = artifacts[f"sindex:{dataset}"].query_bulk(df.geometry, predicate="covers")
+    flag = idxs != idxs_other
+    idxs, idxs_other = idxs[flag], idxs_other[flag]
+    flag = pygeos.equals(geoms[idxs], geoms[idxs_other])
+
+    return {502: {dataset: set(df.index[np.unique(idxs[flag])])}}
+
+
+# Register validations.
+for _dataset in UNIQUE_GEOMETRY:
+    registry.register(MODEL, registry.Validation(f"duplicated_geometry:{_dataset}",
+                                                 partial(duplicated_geometry, _dataset),
+                                                 datasets={_dataset: [registry.GEOMETRY]},
+                                                 artifacts=[f"sindex:{_dataset}"]))
+
+for _name, _code, _specs in (("referential_integrity", 601, REFERENCES),
+                             ("lookup_domain", 602, {dataset: {column: (lookup,) for column, lookup in columns.items()}
+                                                     for dataset, columns in LOOKUPS.items()})):
+    for _dataset, _references in _specs.items():
+
+        # Exclude references to datasets outside the data model.
+        _references = {column: tuple(name for name in names if name in DATASETS)
+                       for column, names in _references.items()}
+        _references = {column: names for column, names in _references.items() if len(names)}
+
+        _columns = {_dataset: list(_references)}
+        registry.register(MODEL, registry.Validation(
+            f"{_name}:{_dataset}", partial(invalid_references, _dataset, _references, _code),
+            datasets=None if _dataset in STREAMED else _columns, streams=_columns if _dataset in STREAMED else None,
+            artifacts=sorted({f"keys:{name}" for names in _references.values() for name in names})))
@@ -1,22 +1,28 @@
 import click
 import geopandas as gpd
 import logging
-import math
+import multiprocessing
+import numpy as np
 import pandas as pd
+import pygeos
 import sys
+import time
 import uuid
-from copy import deepcopy
-from itertools import tee
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from itertools import combinations, repeat
 from math import atan2, cos, dist, radians, sin
-from operator import attrgetter, itemgetter
+from operator import itemgetter
 from pathlib import Path
-from shapely.geometry import LineString
+from shapely.geometry import LineString, box
 from shapely.ops import polygonize, unary_union
 from tabulate import tabulate
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 
 sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
 import helpers
+import registry
+import topology
 
 # Set logger.
 logger = logging.getLogger(__name__)
@@ -26,11 +32,26 @@ handler.setLevel(logging.INFO)
 handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
 logger.addHandler(handler)
 
+# Define the dataset validation instance shared with forked worker processes (inherited copy-on-write).
+_validation = None
+
+# Define the data model of the dataset.
+MODEL = Path(__file__).resolve().parent.name
+
 
 class DatasetValidation:
     """Validates a dataset."""
 
-    def __init__(self, url: str, schema: str = "public", geom_col: str = "geom") -> None:
+    # Define the minimum number of arcs in scope for which validations are planned in-database (engine=auto).
+    _min_pushdown_arcs = 500000
+
+    def __init__(self, url: str, schema: str = "public", geom_col: str = "geom", write_mode: str = "copy",
+                 chunksize: int = None, pool_size: int = 5, cache_dir: Union[Path, str] = None,
+                 cache_size: int = 10 * 1024 ** 3, state_dir: Union[Path, str] = None,
+                 incremental: bool = False, workers: int = 1, tile_mode: str = None,
+                 tile_size: float = 10000, engine: str = "auto",
+                 datasets: Dict[str, gpd.GeoDataFrame] = None, writer: str = "postgis",
+                 output: Union[Path, str] = None, copy: bool = True) -> None:
         """
         Class initialization.
 
@@ -38,6 +59,36 @@ class DatasetValidation:
         :param str url: database URL. General format: postgresql://[user[:password]@][netloc][:port][/dbname]
         :param str schema: database schema, default=public.
         :param str geom_col: geometry column for spatial datasets, default=geom.
+        :param str write_mode: method of writing results to the database, one of: copy (bulk COPY into a staging
+            table), sql (SQL statements with literal values), default=copy.
+        :param int chunksize: number of records per batch when streaming datasets from the database. If not provided,
+            datasets are loaded with a single query, default=None.
+        :param int pool_size: maximum number of concurrent database connections, default=5.
+        :param Union[Path, str] cache_dir: directory of the local dataset snapshot cache. Unchanged datasets are loaded
+            from their snapshot instead of the database. Disabled if not provided, default=None.
+        :param int cache_size: maximum total size of the dataset snapshot cache, in bytes, default=10 GiB.
+        :param Union[Path, str] state_dir: directory of the validation state (arc hashes, bounds, and validation
+            results) which is written after each run. Disabled if not provided, default=None.
+        :param bool incremental: only revalidate arcs changed since the previous run and their neighbourhood, merging
+            the results with those of the previous run. Requires state_dir, default=False.
+        :param int workers: number of worker processes used to apply validations concurrently, default=1.
+        :param str tile_mode: method of partitioning arcs into spatial tiles which are validated independently (with a
+            halo of neighbouring arcs), one of: grid (regular grid, see tile_size), parent (existing meshblock parent
+            polygons). Disabled if not provided, default=None.
+        :param float tile_size: size of grid tiles, in the units of the dataset coordinate reference system,
+            default=10000.
+        :param str engine: engine used to apply validations with an in-database equivalent, one of: python (in
+            memory), postgis (SQL within the database), auto (planned per validation, see _plan_validations),
+            default=auto.
+        :param Dict[str, gpd.GeoDataFrame] datasets: in-memory datasets (segment and basic_block), keyed by dataset
+            name, to be validated instead of loading them from the database. No database engine is created if provided,
+            unless required by engine=postgis or writer=postgis, default=None.
+        :param str writer: destination of validation errors and meshblock updates, one of: postgis (the database, see
+            write_mode), file (see output), none (kept in memory only, see errors and updates), default=postgis.
+        :param Union[Path, str] output: path of the output file (.gpkg, .fgb, .parquet) for writer=file, default=None.
+        :param bool copy: copy the required columns of the in-memory datasets. Otherwise, the datasets are used with all
+            of their columns and share their data without copying, such that they are modified in place by the meshblock
+            update (identifier linkages). Use only if the datasets are not modified concurrently, default=True.
         """
 
         self.dataset = "segment"
@@ -53,12 +104,46 @@ class DatasetValidation:
         self.url = url
         self.schema = schema
         self.geom_col = geom_col
+        self.write_mode = write_mode
+        self.chunksize = chunksize
+        self.pool_size = pool_size
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.state_dir = state_dir
+        self.incremental = incremental
+        self.workers = workers
+        self.tile_mode = tile_mode
+        self.tile_size = tile_size
+        self.validation_engine = engine
+        self.writer = writer
+        self.output = output
 
         # Define outputs.
         self.errors = dict()
-
-        # Create database engine.
-        self.engine = helpers.create_db_engine(self.url)
+        self.updates = None
+
+        # Validate writer.
+        if self.writer == "file" and not self.output:
+            logger.exception("An output path is required for writer: file.")
+            sys.exit(1)
+
+        # Validate engine. In-database validations query the live table, and therefore require the in-memory datasets to
+        # be loaded directly from it, rather than from in-memory or file datasets or the snapshot cache.
+        self.source_live = datasets is None and not self.cache_dir
+        if self.validation_engine == "postgis" and not self.source_live:
+            logger.exception("Engine postgis requires datasets loaded directly from the database, without in-memory "
+                             "or file datasets or the snapshot cache (cache_dir), such that both engines validate the "
+                             "same records.")
+            sys.exit(1)
+
+        # Create database engine, only if datasets are loaded from, validated in, or written to the database.
+        self.engine = None
+        if datasets is None or self.validation_engine == "postgis" or self.writer == "postgis":
+            if not self.url:
+                logger.exception("A database URL is required to load datasets from the database, or for engine: "
+                                 "postgis, or writer: postgis.")
+                sys.exit(1)
+            self.engine = helpers.create_db_engine(self.url, pool_size=self.pool_size)
 
         # Define validations.
         self.validations = {
@@ -73,40 +158,197 @@ class DatasetValidation:
             402: self.meshblock_boundary,
         }
 
+        # Define validations which only depend on individual geometries, as opposed to neighbouring geometries.
+        self.validations_geometry = {101, 102, 103}
+
+        # Define validations which depend on the meshblock.
+        self.validations_meshblock = {401, 402}
+
+        # Define in-database (PostGIS) equivalents of validations, as a condition on each arc (a) or, for pairwise
+        # validations, on each pair of distinct arcs (a, b) with intersecting bounding boxes.
+        self.validations_sql = {
+            101: f"ST_Length(a.{self.geom_col}) = 0",
+            102: f"NOT ST_IsSimple(a.{self.geom_col})",
+            201: f"ST_Equals(a.{self.geom_col}, b.{self.geom_col})",
+            202: f"ST_Overlaps(a.{self.geom_col}, b.{self.geom_col})",
+            302: f"ST_Crosses(a.{self.geom_col}, b.{self.geom_col})"
+        }
+        self.validations_sql_pairwise = {201, 202, 302}
+
         # Define validation thresholds.
         self._min_vertex_dist = 0.01
 
+        # Define required dataset columns.
+        self.columns = {
+            self.dataset: [self.id, self.id_meshblock_left, self.id_meshblock_right, "segment_type", self.geom_col],
+            self.dataset_meshblock: [self.id_meshblock, self.id_meshblock_parent, self.geom_col]
+        }
+
         # Load datasets.
-        dfs = helpers.load_db_datasets(self.engine, subset=[self.dataset, self.dataset_meshblock], schema=self.schema,
-                                       geom_col=self.geom_col)
+        if datasets is None:
+            with helpers.tracer.stage("load_db_datasets"):
+                dfs, coords = helpers.load_db_datasets(self.engine, subset=[self.dataset, self.dataset_meshblock],
+                                                       schema=self.schema, geom_col=self.geom_col,
+                                                       columns=self.columns, chunksize=self.chunksize, wkb=True,
+                                                       return_coords=True, cache_dir=self.cache_dir,
+                                                       cache_size=self.cache_size)
+        else:
+
+            # Validate dataset columns.
+            for name, columns in self.columns.items():
+                if name not in datasets:
+                    logger.exception(f"Missing dataset: {name}.")
+                    sys.exit(1)
+                missing = set(columns).difference(datasets[name].columns)
+                if len(missing):
+                    logger.exception(f"Invalid dataset: {name}. Missing column(s): {*sorted(missing),}."
+                                     .replace(",)", ")"))
+                    sys.exit(1)
+
+            # Copy datasets, or share their data via a shallow copy (such that the index can be set independently).
+            if copy:
+                dfs = {name: datasets[name][columns].copy(deep=True) for name, columns in self.columns.items()}
+            else:
+                dfs = {name: datasets[name].copy(deep=False) for name in self.columns}
+            coords = {self.dataset: helpers.get_coordinate_arrays(dfs[self.dataset][self.geom_col])}
 
         # Load dataset - Arcs.
-        self.df = dfs[self.dataset].copy(deep=True)
+        self.df = dfs[self.dataset]
         self.df.index = self.df[self.id]
+        self.arc_coords = topology.CoordinateStore(*coords[self.dataset])
+
+        # Generate arc topology (nodes and arc adjacency).
+        with helpers.tracer.stage("gen_topology", rows_in=len(self.df)):
+            self.graph = topology.NodeEdgeGraph(self.arc_coords)
 
         # Load dataset - Meshblock.
-        self.meshblock_existing = dfs[self.dataset_meshblock].copy(deep=True)
+        self.meshblock_existing = dfs[self.dataset_meshblock]
         self.meshblock_existing.index = self.meshblock_existing[self.id_meshblock]
 
+        # Configure validation scope.
+        with helpers.tracer.stage("configure_scope", rows_in=len(self.df)) as stage:
+            self._configure_scope()
+            stage["rows_out"] = len(self.scope_neighbourhood)
+
         # Generate reusable geometry variables.
         self._gen_reusable_variables()
 
-    def __call__(self) -> None:
-        """Executes the class."""
+        # Plan validation engines, before the meshblock generation such that its noding check can reuse the results of
+        # in-database validations (see _is_noded).
+        self._results_sql = dict()
+        self.plan = self._plan_validations()
+
+        # Generate meshblock. In tiled mode, the meshblock is generated per tile and only generated for all arcs when
+        # required by the meshblock update.
+        self.meshblock = None
+        if not self.tile_mode:
+            with helpers.tracer.stage("gen_meshblock", rows_in=len(self.df)) as stage:
+                self._gen_meshblock()
+                stage["rows_out"] = len(self.meshblock)
+
+    @classmethod
+    def from_datasets(cls, segment: Union[gpd.GeoDataFrame, Path, str],
+                      basic_block: Union[gpd.GeoDataFrame, Path, str], url: str = None, writer: str = "none",
+                      **kwargs: Any) -> "DatasetValidation":
+        """
+        Initializes the class from in-memory datasets or files, without requiring a database.
 
-        self._validate()
-        self._write_errors()
+        \b
+        :param Union[gpd.GeoDataFrame, Path, str] segment: GeoDataFrame or path to a file (.gpkg, .fgb, .parquet) of
+            dataset: segment.
+        :param Union[gpd.GeoDataFrame, Path, str] basic_block: GeoDataFrame or path to a file (.gpkg, .fgb, .parquet)
+            of dataset: basic_block.
+        :param str url: database URL, only required for engine=postgis or writer=postgis, default=None.
+        :param str writer: destination of validation errors and meshblock updates, one of: postgis, file, none,
+            default=none.
+        :param Any kwargs: keyword arguments passed to the class initialization.
+        :return DatasetValidation: class instance.
+        """
+
+        geom_col = kwargs.get("geom_col", "geom")
+
+        # Load datasets.
+        datasets = dict()
+        with helpers.tracer.stage("load_file_datasets"):
+            for name, df in (("segment", segment), ("basic_block", basic_block)):
+                if isinstance(df, gpd.GeoDataFrame):
+                    datasets[name] = df.rename_geometry(geom_col) if df.geometry.name != geom_col else df
+                else:
+                    datasets[name] = helpers.load_file_dataset(df, layer=name, geom_col=geom_col)
+
+        return cls(url, datasets=datasets, writer=writer, **kwargs)
+
+    def __call__(self) -> Tuple[Dict[int, set], Union[Dict[str, pd.DataFrame], None]]:
+        """
+        Executes the class.
+
+        \b
+        :return Tuple[Dict[int, set], Union[Dict[str, pd.DataFrame], None]]: validation errors (dictionary of
+            validation codes and invalid arc identifiers) and, if the meshblock was regenerated, meshblock updates (see
+            _gen_meshblock_updates).
+        """
+
+        self.validate()
+        with helpers.tracer.stage("write_errors"):
+            self._write_errors()
+
+        # Write validation state.
+        if self.state_dir:
+            with helpers.tracer.stage("write_state"):
+                self._write_state()
 
         # Update meshblock only if no errors remain on the primary arc dataset.
         if not any(map(len, self.errors.values())):
-            self._update_meshblock()
-            self._write_meshblock_updates()
+            with helpers.tracer.stage("update_meshblock", rows_in=len(self.meshblock_existing)) as stage:
+                if self.meshblock_state_prior is not None:
+                    self._update_meshblock_incremental()
+                else:
+                    if self.meshblock is None:
+                        self._gen_meshblock()
+                    self._update_meshblock()
+                stage["rows_out"] = len(self.meshblock)
+            with helpers.tracer.stage("write_meshblock_updates"):
+                self._write_meshblock_updates()
+
+            # Write meshblock state, such that the meshblock is only updated from the arcs of the last update.
+            if self.state_dir:
+                with helpers.tracer.stage("write_meshblock_state"):
+                    self._write_state(meshblock=True)
         else:
             logger.warning(f"Regeneration of the meshblock dataset ({self.dataset_meshblock}) and associated "
                            f"identifier linkages with ({self.dataset}) will not commence until all validation errors "
                            f"are resolved.")
 
-    def _configure_meshblock_parity(self, pts: Tuple[tuple, ...], indexes: Tuple[int, ...]) -> Tuple[int, int]:
+        # Write validation errors and meshblock updates to file.
+        if self.writer == "file":
+            with helpers.tracer.stage("write_file"):
+                self._write_file()
+
+        return self.errors, self.updates
+
+    @property
+    def _state_path(self) -> Path:
+        """
+        Returns the path of the validation state.
+
+        \b
+        :return Path: validation state path.
+        """
+
+        return Path(self.state_dir).resolve() / f"{self.schema}.{self.dataset}.state.feather"
+
+    @property
+    def _meshblock_state_path(self) -> Path:
+        """
+        Returns the path of the meshblock state, being the arc state of the last meshblock update.
+
+        \b
+        :return Path: meshblock state path.
+        """
+
+        return Path(self.state_dir).resolve() / f"{self.schema}.{self.dataset}.meshblock_state.feather"
+
+    def _configure_meshblock_parity(self, pts: np.ndarray, indexes: Tuple[int, ...]) -> Tuple[int, int]:
         """
         Returns the indexes of the meshblock polygons which are formed by the left and right sides of a LineString. The
         process creates a LineString from the first point to halfway towards the second point and then, alternating
@@ -115,13 +357,13 @@ class DatasetValidation:
         side of the LineString but wrap around to occupy space on the other side as well.
 
         \b
-        :param Tuple[tuple, ...] pts: Tuple coordinate sequence extracted from a LineString.
+        :param np.ndarray pts: Coordinate array of a LineString (view of the arc coordinate store).
         :param Tuple[int, ...] indexes: Positional indexes of meshblock polygons which cover the LineString.
         :return Tuple[int, int]: Positional index of left and right side meshblock polygons, in that order.
         """
 
         # Calculate angle (theta) and half distance of current vector.
-        pt1, pt2 = itemgetter(0, 1)(pts)
+        pt1, pt2 = map(tuple, itemgetter(0, 1)(pts))
         distance = dist(pt1, pt2) / 2
         theta = atan2((itemgetter(1)(pt2) - itemgetter(1)(pt1)), (itemgetter(0)(pt2) - itemgetter(0)(pt1)))
         if theta < 0:
@@ -158,32 +400,235 @@ class DatasetValidation:
         else:
             return idx_opposite, idx
 
+    def _configure_meshblock_parity_bulk(self, idxs: np.ndarray, indexes: pd.Series) -> \
+            Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the indexes of the meshblock polygons which are formed by the left and right sides of multiple
+        LineStrings. For each LineString, a probe point is offset to the left and right of the midpoint of its first
+        segment by half the cluster tolerance. All probe points are then located within meshblock polygons with a
+        single bulk query, keeping only the polygons which cover the LineString. LineStrings with ambiguous results
+        (i.e. a side located in more than 1 polygon, or the located polygons do not match the covering polygons) are
+        flagged to be configured by _configure_meshblock_parity.
+
+        \b
+        :param np.ndarray idxs: Positional indexes of LineStrings.
+        :param pd.Series indexes: Positional indexes of meshblock polygons which cover each LineString.
+        :return Tuple[np.ndarray, np.ndarray]: int64 array of shape (k, 2) of positional index of left and right side
+            meshblock polygons, in that order (-1 for side of 1-sided arcs without a meshblock polygon), and boolean
+            array of shape (k,) of ambiguous flags.
+        """
+
+        k = len(idxs)
+        results = np.full((k, 2), -1, dtype=np.int64)
+        if not k:
+            return results, np.zeros(0, dtype=bool)
+
+        # Generate left and right probe points from the first segment of each LineString.
+        pt1 = self.arc_coords.coords[self.arc_coords.start[idxs]]
+        vectors = self.arc_coords.coords[self.arc_coords.start[idxs] + 1] - pt1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normals = np.column_stack([-vectors[:, 1], vectors[:, 0]]) / np.hypot(*vectors.T)[:, None]
+        normals *= self._min_vertex_dist / 2
+        mids = pt1 + (vectors / 2)
+        probes = pygeos.points(np.concatenate([mids + normals, mids - normals]))
+
+        # Locate probe points within meshblock polygons.
+        idxs_probe, idxs_meshblock = self.meshblock.sindex.query_bulk(probes, predicate="within")
+        sides, positions = np.divmod(idxs_probe, k)
+
+        # Filter located polygons to covering polygons.
+        counts = indexes.map(len).values
+        keys = np.repeat(np.arange(k), counts) * len(self.meshblock) + \
+            np.fromiter((idx for vals in indexes for idx in vals), dtype=np.int64, count=counts.sum())
+        flag = np.isin(positions * len(self.meshblock) + idxs_meshblock, keys)
+        sides, positions, idxs_meshblock = sides[flag], positions[flag], idxs_meshblock[flag]
+
+        # Assign located polygon indexes to left and right sides.
+        hits = np.zeros((k, 2), dtype=np.int64)
+        np.add.at(hits, (positions, sides), 1)
+        results[positions, sides] = idxs_meshblock
+
+        # Flag ambiguous results.
+        ambiguous = (hits > 1).any(axis=1) | (hits.sum(axis=1) != counts) | \
+            ((counts == 2) & (results[:, 0] == results[:, 1]))
+
+        return results, ambiguous
+
+    def _configure_tiles(self) -> List[np.ndarray]:
+        """
+        Partitions arcs into spatial tiles, based on the representative point of each arc, using either a regular grid
+        or the existing meshblock parent polygons. Tiles without arcs within the validation scope are excluded.
+
+        \b
+        :return List[np.ndarray]: positional indexes of the arcs of each tile.
+        """
+
+        pts = pygeos.point_on_surface(self.geoms)
+
+        # Assign arcs to grid cells.
+        if self.tile_mode == "grid":
+            keys = np.floor(pygeos.get_coordinates(pts) / self.tile_size).astype(np.int64)
+            _, tiles = np.unique(keys, axis=0, return_inverse=True)
+
+        # Assign arcs to existing meshblock parent polygons. Arcs outside of all parent polygons form one tile.
+        else:
+            idxs, idxs_existing = self.meshblock_existing.sindex.query_bulk(pts, predicate="intersects")
+            idxs, first = np.unique(idxs, return_index=True)
+            keys = np.full(len(self.df), "", dtype=object)
+            keys[idxs] = self.meshblock_existing[self.id_meshblock_parent].values[idxs_existing[first]]
+            _, tiles = np.unique(keys.astype(str), return_inverse=True)
+
+        # Compile arcs per tile.
+        order = np.argsort(tiles, kind="stable")
+        tiles = np.split(order, np.flatnonzero(np.diff(tiles[order])) + 1)
+
+        # Filter tiles to those with arcs within the validation scope.
+        flag = self.df.index.isin(self.scope_neighbourhood)
+
+        return [idxs for idxs in tiles if flag[idxs].any()]
+
+    def _configure_scope(self) -> None:
+        """
+        Configures the arcs to be validated. By default, all arcs are validated. In incremental mode, arcs are compared
+        against the state of the previous run to identify added, modified, and deleted arcs. Validations of individual
+        geometries are then limited to added and modified arcs, while all other validations are limited to the
+        neighbourhood of added, modified, and deleted arcs (intersecting arcs and arcs of intersecting meshblock
+        polygons) plus any previously invalid arcs.
+
+        The meshblock is incrementally updated from a separate state (see _meshblock_state_path), written only after a
+        meshblock update, such that arcs changed by runs which did not update the meshblock (i.e. runs with validation
+        errors) are included in the next update.
+        """
+
+        self.scope_changed = self.df.index
+        self.scope_neighbourhood = self.df.index
+        self.scope_regions = gpd.GeoSeries([], crs=self.df.crs)
+        self.state_prior = None
+        self.meshblock_state_prior = None
+        self.meshblock_changed = self.df.index
+        self.meshblock_regions = gpd.GeoSeries([], crs=self.df.crs)
+        self.hashes = None
+
+        # Compute arc hashes from geometry and type (the only attributes used by the validations), only if the
+        # validation state is read or written.
+        if self.state_dir:
+            with helpers.tracer.stage("hash_arcs", rows_in=len(self.df)):
+                self.hashes = pd.Series(pd.util.hash_pandas_object(pd.DataFrame({
+                    "wkb": gpd.array.to_wkb(self.df[self.geom_col].values),
+                    "segment_type": self.df["segment_type"].values
+                }), index=False).values, index=self.df.index)
+
+        if not self.incremental:
+            return
+
+        # Load meshblock state.
+        if self.state_dir and self._meshblock_state_path.exists():
+            self.meshblock_state_prior = pd.read_feather(self._meshblock_state_path)
+            self.meshblock_state_prior.index = self.meshblock_state_prior[self.id]
+            _, _, _, self.meshblock_changed, self.meshblock_regions = self._compare_state(self.meshblock_state_prior)
+
+        # Load previous state.
+        if not self.state_dir or not self._state_path.exists():
+            logger.warning(f"No previous validation state found for dataset: {self.schema}.{self.dataset}. All arcs "
+                           f"will be validated.")
+            return
+
+        logger.info(f"Configuring incremental validation scope from state: {self._state_path}.")
+
+        self.state_prior = pd.read_feather(self._state_path)
+        self.state_prior.index = self.state_prior[self.id]
+
+        # Compile added, modified, and deleted arcs and their query regions.
+        added, modified, deleted, self.scope_changed, regions = self._compare_state(self.state_prior)
+        self.scope_regions = regions
+
+        # Compile neighbourhood.
+        neighbourhood = set()
+        if len(regions):
+
+            # Intersecting arcs.
+            neighbourhood.update(self.df.sindex.query_bulk(regions, predicate="intersects")[1])
+
+            # Arcs of intersecting meshblock polygons.
+            meshblock_idxs = np.unique(self.meshblock_existing.sindex.query_bulk(regions, predicate="intersects")[1])
+            if len(meshblock_idxs):
+                neighbourhood.update(self.df.sindex.query_bulk(
+                    self.meshblock_existing[self.geom_col].iloc[meshblock_idxs], predicate="intersects")[1])
+
+        # Previously invalid arcs.
+        invalid_prior = self.state_prior.loc[self.state_prior[[f"v{code}" for code in self.validations]].any(axis=1),
+                                             self.id]
+
+        self.scope_neighbourhood = self.df.index[sorted(neighbourhood)].union(self.scope_changed)\
+            .union(invalid_prior.index.intersection(self.df.index))
+
+        logger.info(f"Incremental validation scope: {len(added)} added, {len(modified)} modified, {len(deleted)} "
+                    f"deleted, {len(self.scope_neighbourhood)} arcs in neighbourhood (of {len(self.df)} arcs).")
+
+    def _compare_state(self, state: pd.DataFrame) -> \
+            Tuple[pd.Index, pd.Index, pd.Index, pd.Index, gpd.GeoSeries]:
+        """
+        Compares the arcs against a previous state to identify added, modified, and deleted arcs.
+
+        \b
+        :param pd.DataFrame state: previous state, indexed by arc identifier.
+        :return Tuple[pd.Index, pd.Index, pd.Index, pd.Index, gpd.GeoSeries]: added, modified, deleted, and changed
+            (added and modified) arc identifiers, and query regions: current geometries of added and modified arcs and
+            previous bounds of modified and deleted arcs.
+        """
+
+        hashes_prior = state["hash"]
+        added = self.df.index.difference(hashes_prior.index)
+        deleted = hashes_prior.index.difference(self.df.index)
+        common = self.df.index.intersection(hashes_prior.index)
+        modified = common[self.hashes.loc[common].values != hashes_prior.loc[common].values]
+        changed = added.union(modified)
+
+        bounds_prior = state.loc[modified.union(deleted), ["minx", "miny", "maxx", "maxy"]]
+        regions = gpd.GeoSeries(list(self.df.loc[changed, self.geom_col]) +
+                                [box(*bounds) for bounds in bounds_prior.itertuples(index=False)], crs=self.df.crs)
+
+        return added, modified, deleted, changed, regions
+
     def _gen_reusable_variables(self) -> None:
         """Generates reusable geometry attributes."""
 
         logger.info("Generating reusable geometry attributes.")
 
-        # Generate vertex attributes as new columns.
-        self.df["pts_tuple"] = self.df[self.geom_col].map(attrgetter("coords")).map(tuple)
-        self.df["pt_start"] = self.df["pts_tuple"].map(itemgetter(0))
-        self.df["pt_end"] = self.df["pts_tuple"].map(itemgetter(-1))
-        self.df["pts_ordered_pairs"] = self.df["pts_tuple"].map(self._ordered_pairs)
+        with helpers.tracer.stage("gen_reusable_variables", rows_in=len(self.df)):
 
-        # Generate original arc-meshblock identifier lookups.
-        self.arc_id_meshblock_left_lookup = dict(zip(self.df[self.id], self.df[self.id_meshblock_left]))
-        self.arc_id_meshblock_right_lookup = dict(zip(self.df[self.id], self.df[self.id_meshblock_right]))
+            # Generate pygeos geometry array.
+            with helpers.tracer.stage("geometries"):
+                self.geoms = helpers.to_pygeos(self.df[self.geom_col])
 
-        # Generate meshblock.
-        self.meshblock = gpd.GeoDataFrame(geometry=list(polygonize(unary_union(self.df[self.geom_col].to_list()))),
-                                          crs=self.df.crs)
+            # Generate original arc-meshblock identifier lookups.
+            with helpers.tracer.stage("meshblock_lookups"):
+                self.arc_id_meshblock_left_lookup = dict(zip(self.df[self.id], self.df[self.id_meshblock_left]))
+                self.arc_id_meshblock_right_lookup = dict(zip(self.df[self.id], self.df[self.id_meshblock_right]))
+
+            # Register geometries for spatial predicate queries.
+            self._predicate_cache = dict()
+            self._predicate_geometries = {"arcs": self.df[self.geom_col]}
+
+    def _gen_meshblock(self) -> None:
+        """Generates the meshblock and existing meshblock attributes."""
+
+        logger.info(f"Generating meshblock from dataset: {self.dataset}.")
+
+        # Generate meshblock and the left and right-side meshblock polygon of each arc. Faces are traversed directly
+        # from the arc topology if the arcs are noded, otherwise the arcs are noded and polygonized.
+        if self._is_noded():
+            polys, self.arc_faces = self.graph.polygonize()
+        else:
+            logger.warning("Arcs are not noded. Meshblock will be generated by noding and polygonizing all arcs.")
+            polys = list(polygonize(unary_union(self.df[self.geom_col].to_list())))
+            self.arc_faces = None
+
+        self.meshblock = gpd.GeoDataFrame(geometry=gpd.GeoSeries(polys, crs=self.df.crs))
         self.meshblock.rename_geometry(self.geom_col, inplace=True)
 
-        # Generate meshblock attributes as new columns.
-        self.df["meshblock_covered_by"] = self.df[self.geom_col].map(
-            lambda g: tuple(self.meshblock.sindex.query(g, predicate="covered_by")))
-        meshblock_boundaries = self.meshblock.boundary
-        self.df["meshblock_boundary_covered_by"] = self.df[self.geom_col].map(
-            lambda g: tuple(meshblock_boundaries.sindex.query(g, predicate="covered_by")))
+        # Generate meshblock boundaries.
+        self.meshblock_boundaries = self.meshblock.boundary
 
         # Generate placeholder variable for to-be-generated meshblock lookup.
         self.meshblock_idx_geom_lookup = dict()
@@ -195,24 +640,116 @@ class DatasetValidation:
                                                                self.meshblock_existing[self.id_meshblock_parent]))
 
         # Generate existing meshblock parent dataset and lookup.
-        self.meshblock_parent = self.meshblock_existing.dissolve(by=self.id_meshblock_parent, as_index=False)
+        self.meshblock_parent = self._dissolve_meshblock(self.meshblock_existing)
         self.meshblock_parent_idx_id_lookup = dict(zip(range(len(self.meshblock_parent)),
                                                        self.meshblock_parent[self.id_meshblock_parent]))
 
-    @staticmethod
-    def _ordered_pairs(coords: Tuple[tuple, ...]) -> List[Tuple[tuple, tuple]]:
+        # Register geometries for spatial predicate queries.
+        self._predicate_geometries.update({
+            "meshblock": self.meshblock[self.geom_col],
+            "meshblock_boundary": self.meshblock_boundaries,
+            "meshblock_existing": self.meshblock_existing[self.geom_col],
+            "meshblock_parent": self.meshblock_parent[self.geom_col]
+        })
+
+    def _dissolve_meshblock(self, meshblock: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """
+        Dissolves meshblock polygons by their parent unique identifier. Since the meshblock is a polygonal coverage,
+        parent polygons are rebuilt from the boundary edges which are not shared between polygons of the same parent,
+        rather than by a unary union of each parent (see topology.dissolve).
+
+        \b
+        :param gpd.GeoDataFrame meshblock: meshblock GeoDataFrame.
+        :return gpd.GeoDataFrame: GeoDataFrame of parent unique identifiers and dissolved polygons.
+        """
+
+        meshblock = meshblock.loc[meshblock[self.id_meshblock_parent].notna()]
+        codes, parents = pd.factorize(meshblock[self.id_meshblock_parent])
+        geoms = topology.dissolve(helpers.to_pygeos(meshblock[self.geom_col]), codes)
+
+        meshblock_parent = gpd.GeoDataFrame({self.id_meshblock_parent: parents},
+                                            geometry=gpd.GeoSeries(geoms, crs=meshblock.crs))
+        meshblock_parent.rename_geometry(self.geom_col, inplace=True)
+
+        return meshblock_parent
+
+    def _is_noded(self) -> bool:
+        """
+        Returns whether the arcs are noded, i.e. arcs are simple, have non-zero length, do not cross nor overlap, and
+        only intersect other arcs at shared nodes.
+
+        \b
+        :return bool: flag.
         """
-        Creates an ordered sequence of adjacent coordinate pairs, sorted.
+
+        # Validate individual arcs.
+        if not (pygeos.is_simple(self.geoms).all() and (pygeos.length(self.geoms) > 0).all()):
+            return False
+
+        # Validate crossing and overlapping arcs, including arcs which overlap at a node. Validations applied
+        # in-database to all arcs (see _plan_validations) are reused instead of evaluating their predicate in memory.
+        for code, predicate in ((302, "crosses"), (202, "overlaps")):
+            if self.plan[code] == "postgis" and len(self.scope_neighbourhood) == len(self.df):
+                if len(self._apply_validation_sql(code)[1]):
+                    return False
+            elif len(self._query_predicate("arcs", "arcs", predicate)[0]):
+                return False
+        if self.graph.overlaps:
+            return False
+
+        # Validate that intersecting arcs only intersect at nodes shared by both arcs, such that arcs ending within the
+        # interior of another arc (unsplit T-junctions) are rejected.
+        idxs_1, idxs_2 = self._query_predicate("arcs", "arcs", "intersects")
+        flag = idxs_1 < idxs_2
+        idxs_1, idxs_2 = idxs_1[flag], idxs_2[flag]
+
+        nodes = pygeos.multipoints(np.stack([pygeos.get_point(self.geoms, 0), pygeos.get_point(self.geoms, -1)],
+                                            axis=1))
+        intersections = pygeos.intersection(self.geoms[idxs_1], self.geoms[idxs_2])
+        nodes_shared = pygeos.intersection(nodes[idxs_1], nodes[idxs_2])
+
+        return bool(pygeos.covered_by(intersections, nodes_shared).all())
+
+    def _query_predicate(self, source: str, tree: str, predicate: str, idxs: np.ndarray = None) -> \
+            Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the positional index pairs of source and tree geometries which satisfy a spatial predicate. Source
+        geometries are queried against the spatial index of the tree geometries in bulk and the resulting pairs are
+        cached per (source, tree, predicate) combination, such that each source geometry is only ever queried once.
 
         \b
-        :param Tuple[tuple, ...] coords: tuple of coordinate tuples.
-        :return List[Tuple[tuple, tuple]]: ordered sequence of coordinate pair tuples.
+        :param str source: name of the registered source geometries.
+        :param str tree: name of the registered tree geometries.
+        :param str predicate: spatial predicate (e.g. covered_by, crosses, overlaps).
+        :param np.ndarray idxs: positional indexes of the source geometries to return pairs for, default=None (all).
+        :return Tuple[np.ndarray, np.ndarray]: positional indexes of source and tree geometries, sorted by source then
+            tree index.
         """
 
-        coords_1, coords_2 = tee(coords)
-        next(coords_2, None)
+        geoms = self._predicate_geometries[source]
+        idxs = np.arange(len(geoms)) if idxs is None else np.asarray(idxs, dtype=np.int64)
+
+        # Configure cache.
+        key = (source, tree, predicate)
+        if key not in self._predicate_cache:
+            self._predicate_cache[key] = {"queried": np.zeros(len(geoms), dtype=bool),
+                                          "pairs": np.empty((2, 0), dtype=np.int64)}
+        cache = self._predicate_cache[key]
 
-        return sorted(zip(coords_1, coords_2))
+        # Query geometries which have not yet been queried.
+        missing = idxs[~cache["queried"][idxs]]
+        if len(missing):
+            pairs = self._predicate_geometries[tree].sindex.query_bulk(geoms.values[missing], predicate=predicate)
+            pairs = np.concatenate([cache["pairs"], np.stack([missing[pairs[0]], pairs[1]])], axis=1)
+            cache["pairs"] = pairs[:, np.lexsort((pairs[1], pairs[0]))]
+            cache["queried"][missing] = True
+
+        # Filter pairs to requested geometries.
+        pairs = cache["pairs"]
+        if len(idxs) != len(geoms):
+            pairs = pairs[:, np.isin(pairs[0], idxs)]
+
+        return pairs[0], pairs[1]
 
     def _update_meshblock(self) -> None:
         f"""
@@ -223,10 +760,12 @@ class DatasetValidation:
         logger.info(f"Updating meshblock dataset: {self.dataset_meshblock}.")
 
         # Meshblock - Restore unique identifiers. For non-matches, generate a new identifier.
-        self.meshblock[self.id_meshblock] = self.meshblock[self.geom_col]\
-            .map(lambda g: self.meshblock_existing.sindex.query(g, predicate="covers"))\
-            .map(lambda idxs: itemgetter(itemgetter(0)(idxs))(self.meshblock_existing_idx_id_lookup)\
-            if len(idxs) else uuid.uuid4())
+        idxs, idxs_existing = self._query_predicate("meshblock", "meshblock_existing", "covers")
+        idxs, first = np.unique(idxs, return_index=True)
+        matches = dict(zip(idxs, idxs_existing[first]))
+        self.meshblock[self.id_meshblock] = [
+            self.meshblock_existing_idx_id_lookup[matches[idx]] if idx in matches else uuid.uuid4()
+            for idx in range(len(self.meshblock))]
 
         # Meshblock - Restore parent unique identifiers. Populate non-matches with the Nil UUID.
         self.meshblock[self.id_meshblock_parent] = self.meshblock[self.id_meshblock]\
@@ -234,18 +773,34 @@ class DatasetValidation:
 
         # Meshblock - Assign the Nil UUID to all parent unique identifiers where the dissolved meshblock polygons no
         # longer match.
-        meshblock_dissolve = self.meshblock.dissolve(by=self.id_meshblock_parent, as_index=False)
-        meshblock_invalid_parent_ids = set(meshblock_dissolve.loc[meshblock_dissolve[self.geom_col]
-                                           .map(lambda g: self.meshblock_parent.sindex.query(g, predicate="covers"))
-                                           .map(len) == 0, self.id_meshblock_parent])
+        meshblock_dissolve = self._dissolve_meshblock(self.meshblock)
+        self._predicate_geometries["meshblock_dissolve"] = meshblock_dissolve[self.geom_col]
+        idxs, _ = self._query_predicate("meshblock_dissolve", "meshblock_parent", "covers")
+        meshblock_invalid_parent_ids = set(meshblock_dissolve.loc[~np.isin(np.arange(len(meshblock_dissolve)), idxs),
+                                                                  self.id_meshblock_parent])
         self.meshblock.loc[self.meshblock[self.id_meshblock_parent].isin(meshblock_invalid_parent_ids),
                            self.id_meshblock_parent] = uuid.UUID(int=0)
 
         # Arcs - Populate left and right-side meshblock identifiers.
 
+        # Assign meshblock identifiers from the faces traversed on each side of each arc. Index -1 (no meshblock
+        # polygon) maps to a null identifier.
+        if self.arc_faces is not None:
+            ids = np.array([*self.meshblock[self.id_meshblock], None], dtype=object)
+            self.df[self.id_meshblock_left] = ids[self.arc_faces[:, 0]]
+            self.df[self.id_meshblock_right] = ids[self.arc_faces[:, 1]]
+            return
+
+        # Compile covering meshblock polygons of each arc.
+        idxs, idxs_meshblock = self._query_predicate("arcs", "meshblock", "covered_by")
+        bounds = np.searchsorted(idxs, np.arange(len(self.df) + 1))
+        meshblock_covered_by = pd.Series([tuple(idxs_meshblock[start: end].tolist())
+                                          for start, end in zip(bounds[:-1], bounds[1:])], index=self.df.index)
+
         # Classify arcs according to the amount of meshblock polygons they form (covered_by boundary results).
-        flag_contained = self.df["meshblock_boundary_covered_by"].map(len) == 0
-        flag_not_contained = self.df["meshblock_boundary_covered_by"].map(len) > 0
+        idxs, _ = self._query_predicate("arcs", "meshblock_boundary", "covered_by")
+        flag_contained = pd.Series(np.bincount(idxs, minlength=len(self.df)) == 0, index=self.df.index)
+        flag_not_contained = ~flag_contained
 
         # Generate meshblock index, identifier, and geometry lookups.
         meshblock_idx_id_lookup = dict(zip(range(len(self.meshblock)), self.meshblock[self.id_meshblock]))
@@ -253,46 +808,608 @@ class DatasetValidation:
         self.meshblock_idx_geom_lookup = dict(zip(range(len(self.meshblock)), self.meshblock[self.geom_col]))
 
         # Arc scenario: contained - Populate meshblock identifiers based on single result of non-boundary covered_by.
-        self.df.loc[flag_contained, self.id_meshblock_left] = self.df.loc[flag_contained, "meshblock_covered_by"]\
+        self.df.loc[flag_contained, self.id_meshblock_left] = meshblock_covered_by.loc[flag_contained]\
             .map(lambda idxs: meshblock_idx_id_lookup[itemgetter(0)(idxs)])
         self.df.loc[flag_contained, self.id_meshblock_right] = self.df.loc[flag_contained, self.id_meshblock_left]
 
-        # Arc scenario: not contained - Pass points tuple and meshblock covered_by indexes to configuration function.
-        df_not_contained = self.df.loc[flag_not_contained].copy(deep=True)
-        df_not_contained["_args"] = df_not_contained[["pts_tuple", "meshblock_covered_by"]].apply(
-            lambda row: (row[0], row[1]), axis=1)
-        df_not_contained["_results"] = df_not_contained["_args"].map(
-            lambda args: self._configure_meshblock_parity(*args))
+        # Arc scenario: not contained - Configure parity in bulk from probe points. Pass the points array and meshblock
+        # covered_by indexes of ambiguous arcs to the iterative configuration function.
+        idxs = np.flatnonzero(flag_not_contained)
+        with helpers.tracer.stage("configure_meshblock_parity", rows_in=len(idxs)):
+            results, ambiguous = self._configure_meshblock_parity_bulk(idxs, meshblock_covered_by.iloc[idxs])
+            for idx in np.flatnonzero(ambiguous):
+                results[idx] = self._configure_meshblock_parity(self.arc_coords[idxs[idx]],
+                                                                meshblock_covered_by.iloc[idxs[idx]])
 
         # Arc scenario: not contained - Assign parity results (indexes) as meshblock identifiers.
-        self.df.loc[df_not_contained.index, self.id_meshblock_left] = df_not_contained["_results"].map(
-            lambda idx: meshblock_idx_id_lookup[itemgetter(0)(idx)])
-        self.df.loc[df_not_contained.index, self.id_meshblock_right] = df_not_contained["_results"].map(
-            lambda idx: meshblock_idx_id_lookup[itemgetter(-1)(idx)])
+        self.df.loc[self.df.index[idxs], self.id_meshblock_left] = list(map(meshblock_idx_id_lookup.get, results[:, 0]))
+        self.df.loc[self.df.index[idxs], self.id_meshblock_right] = list(map(meshblock_idx_id_lookup.get,
+                                                                             results[:, 1]))
+
+    def _plan_validations(self) -> Dict[int, str]:
+        """
+        Returns the engine (python or postgis) used to apply each validation. With engine=auto, pairwise spatial
+        predicate validations (202, 302) are applied in-database, using the spatial index of the table, if all arcs are
+        in scope and number at least _min_pushdown_arcs. Their results then replace the in-memory evaluation of the
+        same predicates by the noding check of the meshblock generation (see _is_noded), which otherwise requires them
+        for all arcs. All other validations are applied in memory, since they are vectorized over the already loaded
+        geometries. Validations are never applied in-database if the datasets were not loaded directly from the
+        database (see source_live).
+
+        \b
+        :return Dict[int, str]: engine of each validation code.
+        """
+
+        plan = {code: "python" for code in self.validations}
+
+        if self.validation_engine == "postgis":
+            plan.update({code: "postgis" for code in self.validations_sql})
+
+        elif self.validation_engine == "auto" and self.engine is not None and self.source_live:
+
+            if len(self.scope_neighbourhood) == len(self.df) >= self._min_pushdown_arcs:
+                plan.update({202: "postgis", 302: "postgis"})
+
+        return plan
+
+    def _apply_validation_sql(self, code: int) -> Tuple[int, set, float]:
+        """
+        Executes a validation within its configured scope as a SQL query within the database (see validations_sql),
+        returning only the identifiers of erroneous records. Results are kept, such that each validation is only
+        queried once (see _is_noded).
+
+        \b
+        :param int code: validation code.
+        :return Tuple[int, set, float]: validation code, set containing identifiers of erroneous records, and wall time
+            in seconds.
+        """
+
+        if code in self._results_sql:
+            return self._results_sql[code]
+
+        start_time = time.perf_counter()
+        table = f"{self.schema}.{self.dataset}"
+
+        # Configure validation scope.
+        scope = self.scope_changed if code in self.validations_geometry else self.scope_neighbourhood
+        conditions = [self.validations_sql[code]]
+        params = dict()
+        if len(scope) != len(self.df):
+            conditions.append(f"a.{self.id} = ANY(CAST(:ids AS uuid[]))")
+            params["ids"] = list(map(str, scope))
+
+        # Compile query, joining distinct arcs with intersecting bounding boxes (GiST index) for pairwise validations.
+        if code in self.validations_sql_pairwise:
+            query = f"""
+            SELECT DISTINCT a.{self.id} FROM {table} AS a 
+            JOIN {table} AS b ON a.{self.geom_col} && b.{self.geom_col} AND a.{self.id} <> b.{self.id} 
+            WHERE {' AND '.join(conditions)};
+            """
+        else:
+            query = f"SELECT a.{self.id} FROM {table} AS a WHERE {' AND '.join(conditions)};"
+
+        # Execute query and compile errors.
+        with helpers.tracer.stage(f"validation_{code}", rows_in=len(scope)) as stage:
+            ids = {str(row[0]) for row in helpers.execute_query(self.engine, query, params)}
+            errors = set(self.df.index[self.df.index.map(str).isin(ids)]) if len(ids) else set()
+            stage["rows_out"] = len(errors)
+
+        self._results_sql[code] = code, errors, time.perf_counter() - start_time
+
+        return self._results_sql[code]
+
+    def _apply_validation(self, code: int) -> Tuple[int, set, float]:
+        """
+        Executes a validation within its configured scope.
+
+        \b
+        :param int code: validation code.
+        :return Tuple[int, set, float]: validation code, set containing identifiers of erroneous records, and wall time
+            in seconds.
+        """
+
+        func = self.validations[code]
+        start_time = time.perf_counter()
+
+        try:
+
+            # Configure validation scope.
+            scope = self.scope_changed if code in self.validations_geometry else self.scope_neighbourhood
+            self.df_scope = self.df.loc[scope]
+
+            # Execute validation.
+            with helpers.tracer.stage(f"validation_{code}", rows_in=len(scope)) as stage:
+                errors = func()
+                stage["rows_out"] = len(errors)
+
+        except (KeyError, SyntaxError, ValueError) as e:
+            logger.exception(f"Unable to apply validation {code}: {func.__name__}. Exception details:\n"
+                             f"{type(e).__name__}: {e}", exc_info=False)
+            sys.exit(1)
+
+        return code, errors, time.perf_counter() - start_time
+
+    def _update_meshblock_incremental(self) -> None:
+        """
+        Updates meshblock dataset based on changes to the underlying arc dataset since the previous run and repairs
+        their attribute linkages, limited to dirty faces. Existing meshblock polygons intersecting the added,
+        modified, or deleted arcs are dirty. Only the arcs bounding the dirty region are polygonized, expanded until
+        all faces formed by dirty sides (sides of added or modified arcs and sides previously linked to a dirty polygon)
+        are complete (i.e. their full face cycles are included and no other arc enters them). Identifiers are then only
+        matched for these faces and the parents of affected faces, and arc-meshblock identifiers are only repaired for
+        the polygonized arcs.
+
+        Changes are identified against the meshblock state (see _configure_scope). Requires the existing meshblock and
+        arc-meshblock identifiers to be consistent with the last meshblock update.
+        """
+
+        logger.info(f"Updating meshblock dataset incrementally: {self.dataset_meshblock}.")
+
+        changed = self.df.index.get_indexer(self.meshblock_changed)
+        existing = self.meshblock_existing[self.geom_col]
+
+        # Compile dirty existing meshblock polygons.
+        dirty = np.unique(existing.sindex.query_bulk(self.meshblock_regions, predicate="intersects")[1])
+        ids_dirty = self.meshblock_existing[self.id_meshblock].values[dirty]
+
+        # Compile arcs intersecting the changed regions and dirty polygons.
+        idxs = np.union1d(changed, np.concatenate([
+            self.df.sindex.query_bulk(self.meshblock_regions, predicate="intersects")[1],
+            self.df.sindex.query_bulk(existing.iloc[dirty], predicate="intersects")[1]
+        ])).astype(np.int64)
+
+        # Skip update if the arcs are unchanged.
+        if not len(idxs):
+            logger.info("No arcs changed since the previous run. Meshblock is unchanged.")
+            self.meshblock = self.meshblock_existing.copy(deep=True)
+            return
+
+        # Compile face cycles of all arcs (without geometries), as a CSR structure.
+        labels, areas = self.graph.cycles()
+        order = np.argsort(labels, kind="stable")
+        cycle_arcs = order // 2
+        cycle_offsets = np.searchsorted(labels[order], np.arange(len(labels) + 1))
+
+        # Polygonize arcs, expanding them until all candidate faces are complete.
+        while True:
+            polys, faces = topology.NodeEdgeGraph(topology.CoordinateStore.from_geometry(self.geoms[idxs]))\
+                .polygonize()
+
+            # Compile dirty sides: both sides of added and modified arcs and sides previously linked to a dirty
+            # polygon.
+            sides = np.column_stack([np.isin(idxs, changed)] * 2) | \
+                np.isin(self.df[[self.id_meshblock_left, self.id_meshblock_right]].values[idxs], ids_dirty)
+
+            # Compile candidate faces: faces formed by dirty sides.
+            candidates = np.setdiff1d(faces[sides], [-1])
+
+            # Compile missing arcs - face cycles of dirty sides which are unbounded but form a face in the full
+            # dataset.
+            halfedges = (2 * idxs[:, None] + np.array([0, 1]))[sides & (faces == -1)]
+            halfedges = halfedges[areas[labels[halfedges]] > 0]
+            missing = topology.gather(cycle_offsets, cycle_arcs, np.unique(labels[halfedges]))
+
+            # Compile missing arcs - arcs entering candidate faces.
+            idxs_poly, idxs_arc = self.df.sindex.query_bulk(polys[candidates], predicate="intersects")
+            flag = ~np.isin(idxs_arc, idxs)
+            idxs_poly, idxs_arc = idxs_poly[flag], idxs_arc[flag]
+            flag = ~pygeos.touches(self.geoms[idxs_arc], polys[candidates][idxs_poly])
+            missing = np.setdiff1d(np.union1d(missing, idxs_arc[flag]), idxs)
+
+            if not len(missing):
+                break
+            idxs = np.union1d(idxs, missing)
+
+        # Compile replaced existing meshblock polygons: dirty polygons and polygons overlapping candidate faces.
+        n_faces = len(polys)
+        polys = polys[candidates]
+        idxs_poly, idxs_existing = existing.sindex.query_bulk(polys, predicate="intersects")
+        flag = pygeos.relate_pattern(polys[idxs_poly], helpers.to_pygeos(existing.iloc[idxs_existing]), "T********")
+        replaced = np.union1d(dirty, idxs_existing[flag]).astype(np.int64)
+
+        logger.info(f"Dirty region: {len(replaced)} existing polygons replaced by {len(polys)} polygons, formed by "
+                    f"{len(idxs)} arcs.")
+
+        # Meshblock - Restore unique identifiers. For non-matches, generate a new identifier.
+        meshblock = gpd.GeoDataFrame(geometry=gpd.GeoSeries(polys, crs=self.df.crs))
+        meshblock.rename_geometry(self.geom_col, inplace=True)
+        ids_replaced = self.meshblock_existing[self.id_meshblock].values[replaced]
+        idxs_poly, idxs_existing = existing.iloc[replaced].sindex.query_bulk(polys, predicate="covers")
+        order = np.lexsort((idxs_existing, idxs_poly))
+        idxs_poly, idxs_existing = idxs_poly[order], idxs_existing[order]
+        idxs_poly, first = np.unique(idxs_poly, return_index=True)
+        matches = dict(zip(idxs_poly, idxs_existing[first]))
+        meshblock[self.id_meshblock] = [ids_replaced[matches[idx]] if idx in matches else uuid.uuid4()
+                                        for idx in range(len(meshblock))]
+
+        # Meshblock - Restore parent unique identifiers. Populate non-matches with the Nil UUID.
+        parent_lookup = dict(zip(self.meshblock_existing[self.id_meshblock],
+                                 self.meshblock_existing[self.id_meshblock_parent]))
+        meshblock[self.id_meshblock_parent] = meshblock[self.id_meshblock].map(parent_lookup).fillna(uuid.UUID(int=0))
+
+        # Meshblock - Combine unchanged and updated polygons.
+        self.meshblock = pd.concat([
+            self.meshblock_existing.drop(index=self.meshblock_existing.index[replaced])[
+                [self.id_meshblock, self.id_meshblock_parent, self.geom_col]],
+            meshblock[[self.id_meshblock, self.id_meshblock_parent, self.geom_col]]
+        ], ignore_index=True)
+
+        # Meshblock - Assign the Nil UUID to all parent unique identifiers of affected parents where the dissolved
+        # meshblock polygons no longer match (cover) any existing dissolved meshblock polygon.
+        parents = set(meshblock[self.id_meshblock_parent]).union(
+            self.meshblock_existing[self.id_meshblock_parent].values[replaced]) - {uuid.UUID(int=0)}
+        if len(parents):
+            dissolved = self._dissolve_meshblock(
+                self.meshblock.loc[self.meshblock[self.id_meshblock_parent].isin(parents)])
+            idxs_existing = np.unique(existing.sindex.query_bulk(dissolved[self.geom_col], predicate="intersects")[1])
+            parents_existing = set(self.meshblock_existing[self.id_meshblock_parent].values[idxs_existing])
+            dissolved_existing = self._dissolve_meshblock(
+                self.meshblock_existing.loc[self.meshblock_existing[self.id_meshblock_parent].isin(parents_existing)])
+            idxs_valid, _ = dissolved_existing.sindex.query_bulk(dissolved[self.geom_col], predicate="covers")
+            invalid = set(dissolved.loc[~np.isin(np.arange(len(dissolved)), idxs_valid), self.id_meshblock_parent])
+            self.meshblock.loc[self.meshblock[self.id_meshblock_parent].isin(invalid), self.id_meshblock_parent] = \
+                uuid.UUID(int=0)
+
+        # Arcs - Populate left and right-side meshblock identifiers of the polygonized arcs. Sides of candidate faces
+        # are assigned the face identifier, unbounded sides of added and modified arcs are assigned a null identifier,
+        # and all other sides are unchanged.
+        ids = np.full(n_faces + 1, None, dtype=object)
+        ids[candidates] = meshblock[self.id_meshblock].values
+        flag_changed = np.isin(idxs, changed)
+        for side, col in enumerate((self.id_meshblock_left, self.id_meshblock_right)):
+            flag = np.isin(faces[:, side], candidates) | (flag_changed & (faces[:, side] == -1))
+            self.df.loc[self.df.index[idxs[flag]], col] = ids[faces[flag, side]]
+
+    def _subset(self, idxs: np.ndarray) -> "DatasetValidation":
+        """
+        Returns a dataset validation instance of a subset of arcs, sharing all other attributes.
+
+        \b
+        :param np.ndarray idxs: sorted positional indexes of the subset arcs.
+        :return DatasetValidation: dataset validation instance.
+        """
+
+        subset = copy(self)
+        subset.errors = dict()
+        subset.validations = {code: getattr(subset, func.__name__) for code, func in self.validations.items()}
+        subset.df = self.df.iloc[idxs]
+        subset.arc_coords = topology.CoordinateStore.from_geometry(subset.df[self.geom_col])
+        subset.graph = topology.NodeEdgeGraph(subset.arc_coords)
+        subset.arc_faces = None
+        subset.plan = dict.fromkeys(self.validations, "python")
+        subset._gen_reusable_variables()
+
+        return subset
+
+    def _is_exterior(self, idxs: np.ndarray, sides: np.ndarray) -> np.ndarray:
+        """
+        Returns whether the given sides of arcs lie on the unbounded face of all arcs, i.e. whether any of a fan of rays
+        cast from the midpoint of the first segment of the arc, towards that side, leaves the extent of all arcs without
+        intersecting another arc or returning to the arc itself. Sides which cannot be confirmed are returned as False.
+
+        \b
+        :param np.ndarray idxs: positional indexes of the arcs.
+        :param np.ndarray sides: side of each arc, 0 (left) or 1 (right).
+        :return np.ndarray: boolean array.
+        """
+
+        # Compile the midpoint and the normal towards the given side of the first segment of each arc.
+        starts = pygeos.get_coordinates(pygeos.get_point(self.geoms[idxs], 0))
+        ends = pygeos.get_coordinates(pygeos.get_point(self.geoms[idxs], 1))
+        mids = (starts + ends) / 2
+        lengths = np.hypot(*(ends - starts).T)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normals = np.stack([starts[:, 1] - ends[:, 1], ends[:, 0] - starts[:, 0]], axis=1) / lengths[:, None]
+        normals[sides == 1] *= -1
+
+        # Generate rays, rotated from the normal, which are long enough to leave the extent of all arcs.
+        minx, miny, maxx, maxy = self._extent
+        distance = 2 * np.hypot(maxx - minx, maxy - miny) + 1
+        angles = np.radians([0, -30, 30, -60, 60])
+        cos_, sin_ = np.cos(angles)[None, :], np.sin(angles)[None, :]
+        dx = normals[:, [0]] * cos_ - normals[:, [1]] * sin_
+        dy = normals[:, [0]] * sin_ + normals[:, [1]] * cos_
+        owners = np.repeat(np.arange(len(idxs)), len(angles))
+        valid = np.isfinite(dx.ravel()) & np.isfinite(dy.ravel())
+        owners = owners[valid]
+        coords = np.stack([mids[owners], mids[owners] + distance * np.stack([dx.ravel(), dy.ravel()], axis=1)[valid]],
+                          axis=1)
+        rays = pygeos.linestrings(coords)
+
+        # Flag rays intersecting another arc.
+        blocked = np.zeros(len(rays), dtype=bool)
+        idxs_rays, idxs_arcs = self.df.sindex.query_bulk(rays, predicate="intersects")
+        blocked[idxs_rays[idxs_arcs != idxs[owners[idxs_rays]]]] = True
+
+        # Flag rays returning to their own arc, beyond the ray origin.
+        intersections = pygeos.intersection(rays, self.geoms[idxs[owners]])
+        returns = pygeos.hausdorff_distance(intersections, pygeos.points(mids[owners]))
+        blocked |= ~(pygeos.is_empty(intersections) | (returns <= lengths[owners] * 1e-6))
+
+        return np.bincount(owners[~blocked], minlength=len(idxs)) > 0
+
+    def _gen_tile_faces(self, idxs: np.ndarray) -> Union[np.ndarray, None]:
+        """
+        Compiles the arcs which form the meshblock polygons (faces) of the tile arcs, from the arcs intersecting a
+        window of the tile bounds plus a buffer. The window is extended until the faces of all tile arcs are exact,
+        being either bounded faces within the window or unbounded faces confirmed by _is_exterior, or until the window
+        covers all arcs.
+
+        \b
+        :param np.ndarray idxs: positional indexes of the tile arcs.
+        :return Union[np.ndarray, None]: positional indexes of the arcs forming the faces of the tile arcs, or None if
+            the window arcs are not noded.
+        """
+
+        bounds = pygeos.total_bounds(self.geoms[idxs])
+        buffer = max(bounds[2] - bounds[0], bounds[3] - bounds[1], self.tile_size) / 4
+
+        while True:
+
+            # Compile window arcs.
+            window = np.array([*(bounds[:2] - buffer), *(bounds[2:] + buffer)])
+            idxs_window = np.sort(self.df.sindex.query(pygeos.box(*window), predicate="intersects"))
+            complete = (window[:2] <= self._extent[:2]).all() and (window[2:] >= self._extent[2:]).all()
+
+            # Traverse window faces.
+            subset = self._subset(idxs_window)
+            if not subset._is_noded():
+                return None
+            polys, arc_faces = subset.graph.polygonize()
+            faces = arc_faces[np.searchsorted(idxs_window, idxs)]
+
+            # Flag faces which are not exact: bounded faces extending beyond the window and unconfirmed unbounded faces.
+            if not complete:
+                poly_bounds = pygeos.bounds(polys)
+                flag_faces = (poly_bounds[:, :2] < window[:2]).any(axis=1) | \
+                             (poly_bounds[:, 2:] > window[2:]).any(axis=1)
+                flag_bounded = np.append(flag_faces, False)[faces]
+                idxs_unbounded, sides_unbounded = np.nonzero(faces < 0)
+                flag_unbounded = np.zeros(faces.shape, dtype=bool)
+                flag_unbounded[idxs_unbounded, sides_unbounded] = ~self._is_exterior(idxs[idxs_unbounded],
+                                                                                      sides_unbounded)
+
+                # Extend window to the inexact bounded faces and double the buffer.
+                if flag_bounded.any() or flag_unbounded.any():
+                    extents = poly_bounds[np.unique(faces[flag_bounded])]
+                    bounds = np.array([*np.minimum(bounds[:2], extents[:, :2].min(axis=0, initial=np.inf)),
+                                       *np.maximum(bounds[2:], extents[:, 2:].max(axis=0, initial=-np.inf))])
+                    buffer *= 2
+                    continue
+
+            # Compile arcs forming the faces of the tile arcs.
+            faces = np.unique(faces[faces >= 0])
+            return idxs_window[np.isin(arc_faces, faces).any(axis=1)]
+
+    def _validate_tile(self, idxs: np.ndarray, codes: List[int]) -> Tuple[List[Tuple[int, set, float]], bool]:
+        """
+        Executes validations for a spatial tile of arcs. The tile is validated as a separate dataset validation
+        instance, formed by the tile arcs plus a halo of all arcs which intersect the tile arcs and, for meshblock
+        validations, all arcs which form the meshblock polygons of the tile arcs (see _gen_tile_faces). The validation
+        scope is limited to the tile arcs. Meshblock validations are skipped if the arcs surrounding the tile are not
+        noded.
+
+        \b
+        :param np.ndarray idxs: positional indexes of the tile arcs.
+        :param List[int] codes: validation codes.
+        :return Tuple[List[Tuple[int, set, float]], bool]: validation code, set containing identifiers of erroneous
+            records, and wall time in seconds, for each validation, and whether meshblock validations were skipped.
+        """
+
+        # Compile halo - intersecting arcs.
+        halo = self.df.sindex.query_bulk(self.geoms[idxs], predicate="intersects")[1]
+
+        # Compile halo - arcs forming the meshblock polygons of the tile arcs.
+        skipped = False
+        if self.validations_meshblock.intersection(codes):
+            idxs_faces = self._gen_tile_faces(idxs)
+            if idxs_faces is None:
+                skipped = True
+                codes = [code for code in codes if code not in self.validations_meshblock]
+            else:
+                halo = np.concatenate([halo, idxs_faces])
+
+        # Create tile validation instance.
+        tile = self._subset(np.union1d(idxs, halo))
+
+        # Configure tile validation scope.
+        core = self.df.index[idxs]
+        tile.scope_changed = self.scope_changed.intersection(core)
+        tile.scope_neighbourhood = self.scope_neighbourhood.intersection(core)
+        tile.state_prior = None
+
+        # Filter existing meshblock to polygons intersecting the tile.
+        idxs_existing = np.unique(self.meshblock_existing.sindex.query_bulk(tile.df[self.geom_col],
+                                                                            predicate="intersects")[1])
+        tile.meshblock_existing = self.meshblock_existing.iloc[idxs_existing]
+
+        # Generate meshblock.
+        if self.validations_meshblock.intersection(codes):
+            tile._gen_meshblock()
+
+        return [tile._apply_validation(code) for code in codes], skipped
+
+    def _validate_tiles(self, codes: List[int]) -> List[Tuple[int, set, float]]:
+        """
+        Executes validations for spatial tiles of arcs (see _validate_tile), concurrently if multiple workers are
+        configured, and merges the results. Meshblock validations of tiles surrounded by arcs which are not noded are
+        executed for all arcs at once, and their results are limited to the arcs of those tiles.
+
+        \b
+        :param List[int] codes: validation codes.
+        :return List[Tuple[int, set, float]]: validation code, set containing identifiers of erroneous records, and
+            total wall time in seconds, for each validation.
+        """
+
+        global _validation
+
+        # Compile tiles.
+        tiles = self._configure_tiles()
+
+        # Build the arc spatial index and extent, shared by all tiles.
+        self.df.sindex
+        self._extent = pygeos.total_bounds(self.geoms)
+
+        logger.info(f"Applying validations to {len(tiles)} tiles ({self.tile_mode}).")
+
+        # Execute validations per tile, concurrently or sequentially.
+        results = {code: [set(), 0.0] for code in codes}
+        skipped = list()
+        _validation = self
+        try:
+            if self.workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+                with ProcessPoolExecutor(max_workers=self.workers,
+                                         mp_context=multiprocessing.get_context("fork")) as executor:
+                    results_tiles = list(executor.map(_validate_tile, tiles, repeat(codes)))
+
+                # Record validation stages, which are not traced within worker processes.
+                for results_tile, _ in results_tiles:
+                    for code, errors, seconds in results_tile:
+                        helpers.tracer.record(f"validation_{code}", seconds, rows_out=len(errors))
+
+            else:
+                results_tiles = map(self._validate_tile, tiles, repeat(codes))
+
+            # Merge tile results.
+            for idxs, (results_tile, skipped_tile) in zip(tiles, results_tiles):
+                for code, errors, seconds in results_tile:
+                    results[code][0].update(errors)
+                    results[code][1] += seconds
+                if skipped_tile:
+                    skipped.append(idxs)
+
+        finally:
+            _validation = None
+
+        # Execute meshblock validations for all arcs, limited to the arcs of skipped tiles.
+        if skipped:
+            logger.warning(f"Arcs of {len(skipped)} tiles are not noded. Meshblock validations will be applied to all "
+                           f"arcs.")
+            self._gen_meshblock()
+            ids = set(self.df.index[np.concatenate(skipped)])
+            codes_meshblock = sorted(self.validations_meshblock.intersection(codes))
+            for code, errors, seconds in map(self._apply_validation, codes_meshblock):
+                results[code][0].update(errors.intersection(ids))
+                results[code][1] += seconds
+
+        return [(code, *results[code]) for code in codes]
+
+    def validate(self) -> Dict[int, set]:
+        """
+        Applies the validations, without writing validation errors, the validation state, or meshblock updates.
+
+        \b
+        :return Dict[int, set]: dictionary of validation codes and invalid arc identifiers.
+        """
+
+        with helpers.tracer.stage("validate", rows_in=len(self.df)):
+            self._validate()
+
+        return self.errors
 
     def _validate(self) -> None:
-        """Executes validations."""
+        """
+        Executes validations. If multiple workers are configured, validations are applied concurrently by forked
+        worker processes which inherit the datasets, coordinate arrays, and spatial indexes copy-on-write, such that
+        only the validation codes and results are transferred between processes.
+        """
+
+        global _validation
 
         logger.info("Applying validations.")
 
-        # Iterate validations.
-        for code, func in self.validations.items():
-            logger.info(f"Applying validation {code}: {func.__name__}.")
+        # Apply in-database validations (see plan).
+        plan = self.plan
+        codes = [code for code in self.validations if plan[code] == "python"]
+        results = [self._apply_validation_sql(code) for code in self.validations if plan[code] == "postgis"]
+
+        # Configure concurrency, only warning of an unavailable fork start method if validations could run concurrently.
+        concurrent = self.workers > 1 and len(codes) > 0
+        if concurrent and "fork" not in multiprocessing.get_all_start_methods():
+            logger.warning("Concurrent validation requires the fork start method, which is unavailable on this "
+                           "platform. Validations will be applied sequentially.")
+            concurrent = False
+
+        # Apply validations per spatial tile.
+        if self.tile_mode:
+            results.extend(self._validate_tiles(codes))
+
+        # Apply validations concurrently.
+        elif concurrent:
+            logger.info(f"Applying {len(codes)} validations with {self.workers} worker processes.")
 
+            _validation = self
             try:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(codes)),
+                                         mp_context=multiprocessing.get_context("fork")) as executor:
+                    results_pool = list(executor.map(_apply_validation, codes))
+            finally:
+                _validation = None
+
+            # Record validation stages, which are not traced within worker processes.
+            for code, errors, seconds in results_pool:
+                helpers.tracer.record(f"validation_{code}", seconds, rows_out=len(errors))
+            results.extend(results_pool)
+
+        # Apply validations sequentially.
+        else:
+            results.extend(map(self._apply_validation, codes))
 
-                # Execute validation and store results.
-                self.errors[code] = deepcopy(func())
+        # Iterate validation results in order.
+        for code, errors, seconds in sorted(results, key=itemgetter(0)):
+            logger.info(f"Applied validation {code}: {self.validations[code].__name__} ({plan[code]}, "
+                        f"{seconds:.2f}s).")
 
-            except (KeyError, SyntaxError, ValueError) as e:
-                logger.exception(f"Unable to apply validation {code}: {func.__name__}. Exception details:\n"
-                                 f"{type(e).__name__}: {e}", exc_info=False)
-                sys.exit(1)
+            # Store results.
+            self.errors[code] = errors
+
+            # Merge results with previous results outside of the validation scope.
+            if self.state_prior is not None:
+                scope = self.scope_changed if code in self.validations_geometry else self.scope_neighbourhood
+                errors_prior = self.state_prior.index[self.state_prior[f"v{code}"].values]
+                self.errors[code].update(errors_prior.difference(scope).intersection(self.df.index))
 
     def _write_errors(self) -> None:
         """Write validation error flags to dataset as integer columns."""
 
-        logger.info(f"Writing error flags to dataset: {self.schema}.{self.dataset}.")
+        # Write error flags.
+        if self.writer == "postgis":
+            logger.info(f"Writing error flags to dataset: {self.schema}.{self.dataset}.")
+            if self.write_mode == "copy":
+                self._write_errors_copy()
+            else:
+                self._write_errors_sql()
+
+        # Log validation results summary.
+        summary = tabulate(
+            [[f"{code} ({self.validations[code].__name__})", len(vals)] for code, vals in sorted(self.errors.items())],
+            headers=["Validation", "Invalid Count"], tablefmt="rst", colalign=("left", "right"))
+
+        logger.info("Validation results:\n" + summary)
+
+    def _write_errors_copy(self) -> None:
+        """
+        Write validation error flags to dataset by streaming all (identifier, code) pairs into an unlogged staging
+        table via COPY and applying them with a single set-based update (see helpers.write_error_flags).
+        """
+
+        helpers.write_error_flags(self.engine, table=f"{self.schema}.{self.dataset}", identifier=self.id,
+                                  errors=self.errors)
+
+    def _write_errors_sql(self) -> None:
+        """Write validation error flags to dataset with one update statement of literal values per validation."""
+
+        # Execute statements.
+        helpers.execute_sql(engine=self.engine, statements=self._compile_errors_sql())
+
+    def _compile_errors_sql(self) -> Tuple[str, ...]:
+        """
+        Compiles the SQL statements which write validation error flags to dataset, with one update statement of literal
+        values per validation.
+
+        \b
+        :return Tuple[str, ...]: SQL statements.
+        """
 
         # Iterate validation results.
         statements = list()
@@ -309,103 +1426,184 @@ class DatasetValidation:
                 UPDATE {self.schema}.{self.dataset} SET v{code} = 1 WHERE {self.id} IN {*vals,};
                 """)
 
-        # Execute statements.
-        helpers.execute_sql(engine=self.engine, statements=tuple(statements))
+        return tuple(statements)
 
-        # Log validation results summary.
-        summary = tabulate(
-            [[f"{code} ({self.validations[code].__name__})", len(vals)] for code, vals in sorted(self.errors.items())],
-            headers=["Validation", "Invalid Count"], tablefmt="rst", colalign=("left", "right"))
+    def _write_state(self, meshblock: bool = False) -> None:
+        """
+        Writes the validation state (arc hashes, bounds, and validation results) for subsequent incremental runs.
 
-        logger.info("Validation results:\n" + summary)
+        \b
+        :param bool meshblock: write the meshblock state (arc hashes and bounds) instead, default=False.
+        """
+
+        path = self._meshblock_state_path if meshblock else self._state_path
+        logger.info(f"Writing {'meshblock' if meshblock else 'validation'} state: {path}.")
+
+        state = pd.DataFrame({self.id: self.df.index, "hash": self.hashes.values})
+        state[["minx", "miny", "maxx", "maxy"]] = self.df.bounds.values
+        if not meshblock:
+            for code, vals in sorted(self.errors.items()):
+                state[f"v{code}"] = state[self.id].isin(vals)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state.to_feather(path)
+
+    def _write_file(self) -> None:
+        """
+        Writes dataset segment, with validation error flags as integer columns, and, if generated, the meshblock to the
+        output file.
+        """
+
+        # Write arcs with error flags.
+        df = self.df.reset_index(drop=True)
+        for code, vals in sorted(self.errors.items()):
+            df[f"v{code}"] = df[self.id].isin(vals).astype(int)
+        helpers.write_file_dataset(df, self.output, layer=self.dataset)
+
+        # Write meshblock.
+        if self.updates is not None:
+            meshblock = self.meshblock[[self.id_meshblock, self.id_meshblock_parent, self.geom_col]]
+            helpers.write_file_dataset(meshblock.reset_index(drop=True), self.output, layer=self.dataset_meshblock)
 
     def _write_meshblock_updates(self) -> None:
         f"""Write meshblock updates to datasets {self.dataset_meshblock} and {self.dataset}."""
 
-        logger.info(f"Writing meshblock updates to dataset: {self.schema}.{self.dataset_meshblock} and underlying "
-                    f"dataset: {self.schema}.{self.dataset}.")
+        self.updates = self._gen_meshblock_updates()
 
-        statements = dict()
+        if self.writer == "postgis":
 
-        # Compile meshblock updates.
-        meshblock_added = set(self.meshblock[self.id_meshblock]) - set(self.meshblock_existing[self.id_meshblock])
-        meshblock_removed = set(self.meshblock_existing[self.id_meshblock]) - set(self.meshblock[self.id_meshblock])
+            logger.info(f"Writing meshblock updates to dataset: {self.schema}.{self.dataset_meshblock} and underlying "
+                        f"dataset: {self.schema}.{self.dataset}.")
 
-        # Create SQL statements for added meshblock records.
-        if len(meshblock_added):
+            # Stream updates and execute statements.
+            for update_type, update in self._compile_meshblock_updates(self.updates).items():
+                if update["count"]:
+                    logger.info(f"Writing meshblock updates for: {update_type}.")
+                    helpers.execute_copy(engine=self.engine, binary=True, **update["copy"])
 
-            values = self.meshblock.loc[self.meshblock[self.id_meshblock].isin(meshblock_added),
-                                        [self.id_meshblock, self.id_meshblock_parent, self.geom_col]]\
-                .apply(lambda row: f"('{itemgetter(0)(row)}', '{itemgetter(1)(row)}', '{itemgetter(2)(row)}')", axis=1)
+        # Log meshblock updates.
+        summary = tabulate([["Added", len(self.updates["meshblock_added"])],
+                            ["Removed", len(self.updates["meshblock_removed"])],
+                            ["Unchanged", len(self.meshblock) - len(self.updates["meshblock_added"])]],
+                           headers=["Status", "Count"], tablefmt="rst", colalign=("left", "right"))
+        logger.info(f"Meshblock ({self.dataset_meshblock}) updates:\n" + summary)
 
-            statements["meshblock_added"] = f"""
-            INSERT INTO {self.schema}.{self.dataset_meshblock} ({self.id_meshblock}, {self.id_meshblock_parent}, 
-            {self.geom_col}) VALUES {', '.join(values)};
-            """
+        # Log arc-meshblock identifier updates.
+        summary = tabulate([["Modified", len(self.updates["arcs_modified"])],
+                            ["Unchanged", len(self.df) - len(self.updates["arcs_modified"])]],
+                           headers=["Status", "Count"], tablefmt="rst", colalign=("left", "right"))
+        logger.info(f"Arc-meshblock identifier ({self.dataset}.{self.id_meshblock_left}/{self.id_meshblock_right}) "
+                    f"updates:\n" + summary)
 
-        # Create SQL statements for removed meshblock records.
-        if len(meshblock_removed):
+    def _gen_meshblock_updates(self) -> Dict[str, pd.DataFrame]:
+        """
+        Generates the meshblock updates as in-memory datasets: added meshblock records (meshblock_added), arc-meshblock
+        identifier updates (arcs_modified), and removed meshblock records (meshblock_removed).
 
-            statements["meshblock_removed"] = f"""
-            DELETE FROM {self.schema}.{self.dataset_meshblock} WHERE {self.id_meshblock} IN {*meshblock_removed,};
-            """
+        \b
+        :return Dict[str, pd.DataFrame]: dictionary of update types and (Geo)DataFrames.
+        """
 
-        # Compile arc-meshblock identifier updates.
-        df_updated = self.df.loc[
+        # Generate meshblock updates.
+        meshblock_ids = set(self.meshblock[self.id_meshblock])
+        meshblock_existing_ids = set(self.meshblock_existing[self.id_meshblock])
+        cols = [self.id_meshblock, self.id_meshblock_parent, self.geom_col]
+        meshblock_added = self.meshblock.loc[
+            self.meshblock[self.id_meshblock].isin(meshblock_ids - meshblock_existing_ids), cols]
+        meshblock_removed = self.meshblock_existing.loc[
+            self.meshblock_existing[self.id_meshblock].isin(meshblock_existing_ids - meshblock_ids), cols]
+
+        # Generate arc-meshblock identifier updates.
+        arcs_modified = self.df.loc[
             (self.df[self.id_meshblock_left].fillna(-1) !=
              self.df[self.id].map(self.arc_id_meshblock_left_lookup).fillna(-1)) |
             (self.df[self.id_meshblock_right].fillna(-1) !=
-             self.df[self.id].map(self.arc_id_meshblock_right_lookup).fillna(-1))
-        ].copy(deep=True)
+             self.df[self.id].map(self.arc_id_meshblock_right_lookup).fillna(-1)),
+            [self.id, self.id_meshblock_left, self.id_meshblock_right]
+        ]
 
-        # Create SQL statements for arc-meshblock identifier updates.
-        if len(df_updated):
+        return {"meshblock_added": meshblock_added.reset_index(drop=True),
+                "arcs_modified": pd.DataFrame(arcs_modified).reset_index(drop=True),
+                "meshblock_removed": meshblock_removed.reset_index(drop=True)}
 
-            values = df_updated[[self.id, self.id_meshblock_left, self.id_meshblock_right]]\
-                .apply(lambda row: f"('{itemgetter(0)(row)}', '{itemgetter(1)(row)}', '{itemgetter(2)(row)}')", axis=1)\
-                .map(lambda val: val.replace("'None'", "NULL"))
+    def _compile_meshblock_updates(self, updates: Dict[str, pd.DataFrame] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Compiles the meshblock updates to be written, in order: added meshblock records, arc-meshblock identifier
+        updates, and removed meshblock records. Each update is streamed via binary COPY (UUIDs and WKB geometries) into
+        a temporary table and applied with a single statement.
 
-            statements["arcs_modified"] = (
-                f"""
-                CREATE TABLE {self.schema}._ ({self.id} uuid, {self.id_meshblock_left} uuid, {self.id_meshblock_right} 
-                uuid);
-                """,
-                f"""
-                INSERT INTO {self.schema}._ ({self.id}, {self.id_meshblock_left}, {self.id_meshblock_right}) VALUES 
-                {', '.join(values)};
-                """,
-                f"""
-                UPDATE {self.schema}.{self.dataset} AS dst SET {self.id_meshblock_left} = src.{self.id_meshblock_left} 
-                FROM {self.schema}._ AS src WHERE dst.{self.id} = src.{self.id};
-                """,
-                f"""
-                UPDATE {self.schema}.{self.dataset} AS dst SET {self.id_meshblock_right} = src.{self.id_meshblock_right} 
-                FROM {self.schema}._ AS src WHERE dst.{self.id} = src.{self.id};
-                """,
+        \b
+        :param Dict[str, pd.DataFrame] updates: meshblock updates. Generated if not provided (see
+            _gen_meshblock_updates), default=None.
+        :return Dict[str, Dict[str, Any]]: dictionary of update types and, for each, the number of records (count) and
+            the keyword arguments of helpers.execute_copy (copy), with records as a generator.
+        """
+
+        if updates is None:
+            updates = self._gen_meshblock_updates()
+
+        meshblock = updates["meshblock_added"]
+        df_updated = updates["arcs_modified"]
+        meshblock_removed = updates["meshblock_removed"][self.id_meshblock]
+
+        compiled = dict()
+
+        # Added meshblock records: insert from the temporary table.
+        compiled["meshblock_added"] = {"count": len(meshblock), "copy": {
+            "table": "_meshblock_added",
+            "columns": (self.id_meshblock, self.id_meshblock_parent, self.geom_col),
+            "records": zip(map(helpers.encode_uuid, meshblock[self.id_meshblock]),
+                           map(helpers.encode_uuid, meshblock[self.id_meshblock_parent]),
+                           pygeos.to_wkb(helpers.to_pygeos(meshblock[self.geom_col]))),
+            "statements_pre": f"""
+            CREATE TEMPORARY TABLE _meshblock_added ({self.id_meshblock} uuid, {self.id_meshblock_parent} uuid, 
+            {self.geom_col} bytea) ON COMMIT DROP;
+            """,
+            "statements_post": f"""
+            INSERT INTO {self.schema}.{self.dataset_meshblock} ({self.id_meshblock}, {self.id_meshblock_parent}, 
+            {self.geom_col}) 
+            SELECT {self.id_meshblock}, {self.id_meshblock_parent}, 
+                   ST_SetSRID(ST_GeomFromWKB({self.geom_col}), 
+                              Find_SRID('{self.schema}', '{self.dataset_meshblock}', '{self.geom_col}')) 
+            FROM _meshblock_added;
+            """
+        }}
+
+        # Arc-meshblock identifier updates: apply both sides in a single update.
+        compiled["arcs_modified"] = {"count": len(df_updated), "copy": {
+            "table": "_arcs_modified",
+            "columns": (self.id, self.id_meshblock_left, self.id_meshblock_right),
+            "records": zip(map(helpers.encode_uuid, df_updated[self.id]),
+                           map(helpers.encode_uuid, df_updated[self.id_meshblock_left]),
+                           map(helpers.encode_uuid, df_updated[self.id_meshblock_right])),
+            "statements_pre": f"""
+            CREATE TEMPORARY TABLE _arcs_modified ({self.id} uuid, {self.id_meshblock_left} uuid, 
+            {self.id_meshblock_right} uuid) ON COMMIT DROP;
+            """,
+            "statements_post": (
+                "ANALYZE _arcs_modified;",
                 f"""
-                DROP TABLE {self.schema}._;
+                UPDATE {self.schema}.{self.dataset} AS dst 
+                SET {self.id_meshblock_left} = src.{self.id_meshblock_left}, 
+                    {self.id_meshblock_right} = src.{self.id_meshblock_right} 
+                FROM _arcs_modified AS src WHERE dst.{self.id} = src.{self.id};
                 """
             )
+        }}
+
+        # Removed meshblock records: delete using the temporary table.
+        compiled["meshblock_removed"] = {"count": len(meshblock_removed), "copy": {
+            "table": "_meshblock_removed",
+            "columns": (self.id_meshblock,),
+            "records": ((helpers.encode_uuid(val),) for val in meshblock_removed),
+            "statements_pre": f"CREATE TEMPORARY TABLE _meshblock_removed ({self.id_meshblock} uuid) ON COMMIT DROP;",
+            "statements_post": f"""
+            DELETE FROM {self.schema}.{self.dataset_meshblock} AS dst USING _meshblock_removed AS src 
+            WHERE dst.{self.id_meshblock} = src.{self.id_meshblock};
+            """
+        }}
 
-        # Execute statements.
-        for update_type in [k for k in ("meshblock_added", "arcs_modified", "meshblock_removed") if k in statements]:
-            logger.info(f"Writing meshblock updates for: {update_type}.")
-            helpers.execute_sql(engine=self.engine, statements=statements[update_type])
-
-        # Log meshblock updates.
-        summary = tabulate([["Added", len(meshblock_added)],
-                            ["Removed", len(meshblock_removed)],
-                            ["Unchanged", len(set(self.meshblock[self.id_meshblock])
-                                              .intersection(set(self.meshblock_existing[self.id_meshblock])))]],
-                           headers=["Status", "Count"], tablefmt="rst", colalign=("left", "right"))
-        logger.info(f"Meshblock ({self.dataset_meshblock}) updates:\n" + summary)
-
-        # Log arc-meshblock identifier updates.
-        summary = tabulate([["Modified", len(df_updated)],
-                            ["Unchanged", len(self.df) - len(df_updated)]],
-                           headers=["Status", "Count"], tablefmt="rst", colalign=("left", "right"))
-        logger.info(f"Arc-meshblock identifier ({self.dataset}.{self.id_meshblock_left}/{self.id_meshblock_right}) "
-                    f"updates:\n" + summary)
+        return compiled
 
     def connectivity_node_intersection(self) -> set:
         """
@@ -417,24 +1615,13 @@ class DatasetValidation:
 
         errors = set()
 
-        # Compile nodes.
-        nodes = set(pd.concat([self.df["pt_start"], self.df["pt_end"]]))
-
-        # Compile interior vertices (non-nodes).
-        # Note: only arcs with > 2 vertices are used.
-        non_nodes = set(self.df.loc[self.df["pts_tuple"].map(len) > 2, "pts_tuple"]
-                        .map(lambda pts: set(pts[1:-1])).explode())
-
-        # Compile invalid vertices.
-        invalid_pts = nodes.intersection(non_nodes)
-        if len(invalid_pts):
-
-            # Flag arcs with an invalid vertex as a node.
-            flag = (self.df["pt_start"].isin(invalid_pts)) | (self.df["pt_end"].isin(invalid_pts))
+        # Flag arcs within scope with a node which coincides with an interior vertex (non-node) of any arc.
+        scope = self.df.index.get_indexer(self.df_scope.index)
+        flag = self.graph.node_flag_to_arcs(self.graph.hits > 0)[scope]
 
-            # Compile errors.
-            if sum(flag):
-                errors.update(set(self.df.loc[flag].index))
+        # Compile errors.
+        if flag.any():
+            errors.update(set(self.df.index[scope[flag]]))
 
         return errors
 
@@ -449,14 +1636,14 @@ class DatasetValidation:
         errors = set()
 
         # Query arcs which cross each arc.
-        crosses = self.df[self.geom_col].map(lambda g: set(self.df.sindex.query(g, predicate="crosses")))
+        idxs, _ = self._query_predicate("arcs", "arcs", "crosses", self.df.index.get_indexer(self.df_scope.index))
 
         # Flag arcs which have one or more crossing arcs.
-        flag = crosses.map(len) > 0
+        flag = np.unique(idxs)
 
         # Compile errors.
-        if sum(flag):
-            errors.update(set(self.df.loc[flag].index))
+        if len(flag):
+            errors.update(set(self.df.index[flag]))
 
         return errors
 
@@ -471,19 +1658,24 @@ class DatasetValidation:
         errors = set()
 
         # Filter arcs to those with > 2 vertices.
-        df = self.df.loc[self.df["pts_tuple"].map(len) > 2]
-        if len(df):
+        scope = self.df.index.get_indexer(self.df_scope.index)
+        scope = scope[self.arc_coords.counts[scope] > 2]
+        if len(scope):
 
-            # Explode arc coordinate pairs and calculate distances.
-            coord_pairs = df["pts_ordered_pairs"].explode()
-            coord_dist = coord_pairs.map(lambda pair: math.dist(*pair))
+            # Calculate distances between adjacent vertices of the coordinate store.
+            # Note: distances spanning two arcs are NaN and therefore never flagged.
+            coord_dist = self.arc_coords.segment_lengths()
 
             # Flag pairs with distances that are too small.
             flag = coord_dist < self._min_vertex_dist
 
+            # Reduce flagged pairs to arc positional indexes and filter to scope.
+            idxs = np.unique(self.arc_coords.arc_index(np.flatnonzero(flag)))
+            idxs = np.intersect1d(idxs, scope)
+
             # Compile errors.
-            if sum(flag):
-                errors.update(set(coord_pairs.loc[flag].index))
+            if len(idxs):
+                errors.update(set(self.df.index[idxs]))
 
         return errors
 
@@ -498,11 +1690,11 @@ class DatasetValidation:
         errors = set()
 
         # Flag complex (non-simple) geometries.
-        flag = ~self.df.is_simple
+        flag = ~self.df_scope.is_simple
 
         # Compile errors.
         if sum(flag):
-            errors.update(set(self.df.loc[flag].index))
+            errors.update(set(self.df_scope.loc[flag].index))
 
         return errors
 
@@ -517,11 +1709,11 @@ class DatasetValidation:
         errors = set()
 
         # Flag arcs with zero length.
-        flag = self.df.length == 0
+        flag = self.df_scope.length == 0
 
         # Compile errors.
         if sum(flag):
-            errors.update(set(self.df.loc[flag].index))
+            errors.update(set(self.df_scope.loc[flag].index))
 
         return errors
 
@@ -535,20 +1727,32 @@ class DatasetValidation:
 
         errors = set()
 
-        # Filter arcs to those with duplicated lengths.
-        df = self.df.loc[self.df.length.duplicated(keep=False)]
-        if len(df):
+        # Generate canonical arc keys: coordinate sequences without collinear vertices, quantized to the cluster
+        # tolerance, and normalized for direction.
+        keys = pygeos.normalize(pygeos.set_precision(pygeos.simplify(self.geoms, 0), self._min_vertex_dist))
+
+        # Replace the empty keys of arcs which collapse when quantized (shorter than the cluster tolerance) with their
+        # normalized geometry, such that collapsed arcs do not share a single hash bucket.
+        collapsed = pygeos.is_empty(keys)
+        keys[collapsed] = pygeos.normalize(self.geoms[collapsed])
 
-            # Filter arcs to those with duplicated nodes.
-            df = df.loc[df[["pt_start", "pt_end"]].agg(set, axis=1).map(tuple).duplicated(keep=False)]
+        # Filter arcs to those with duplicated key hashes.
+        hashes = pd.Series(pd.util.hash_array(pygeos.to_wkb(keys)))
+        hashes = hashes.loc[hashes.duplicated(keep=False)]
+        if len(hashes):
 
-            # Flag duplicated geometries.
-            duplicates = df.loc[
-                df[self.geom_col].map(lambda g1: df[self.geom_col].map(lambda g2: g1.equals(g2)).sum() > 1)]
+            # Compile all pairs of arcs within each hash bucket.
+            pairs = [pair for idxs in hashes.groupby(hashes).groups.values()
+                     for pair in combinations(sorted(idxs), r=2)]
+            idxs_1, idxs_2 = np.array(pairs, dtype=np.int64).T
+
+            # Flag duplicated geometries (confirmed by exact equality) within the validation scope.
+            flag = pygeos.equals(self.geoms[idxs_1], self.geoms[idxs_2])
+            duplicates = self.df.index[np.union1d(idxs_1[flag], idxs_2[flag])].intersection(self.df_scope.index)
 
             # Compile errors.
             if len(duplicates):
-                errors.update(set(duplicates.index))
+                errors.update(set(duplicates))
 
         return errors
 
@@ -563,14 +1767,14 @@ class DatasetValidation:
         errors = set()
 
         # Query arcs which overlap each arc.
-        overlaps = self.df[self.geom_col].map(lambda g: set(self.df.sindex.query(g, predicate="overlaps")))
+        idxs, _ = self._query_predicate("arcs", "arcs", "overlaps", self.df.index.get_indexer(self.df_scope.index))
 
         # Flag arcs which have one or more overlapping arcs.
-        flag = overlaps.map(len) > 0
+        flag = np.unique(idxs)
 
         # Compile errors.
-        if sum(flag):
-            errors.update(set(overlaps.loc[flag].index))
+        if len(flag):
+            errors.update(set(self.df.index[flag]))
 
         return errors
 
@@ -584,12 +1788,17 @@ class DatasetValidation:
 
         errors = set()
 
+        # Count meshblock polygon boundaries covering each arc.
+        scope = self.df.index.get_indexer(self.df_scope.index)
+        idxs, _ = self._query_predicate("arcs", "meshblock_boundary", "covered_by", scope)
+        counts = np.bincount(idxs, minlength=len(self.df))[scope]
+
         # Flag boundary arcs which do not form a meshblock polygon.
-        flag = (self.df["segment_type"] == 2) & (self.df["meshblock_boundary_covered_by"].map(len) == 0)
+        flag = (self.df_scope["segment_type"] == 2) & (counts == 0)
 
         # Compile error logs.
         if sum(flag):
-            errors.update(set(self.df.loc[flag].index))
+            errors.update(set(self.df_scope.loc[flag].index))
 
         return errors
 
@@ -603,43 +1812,245 @@ class DatasetValidation:
 
         errors = set()
 
+        # Count meshblock polygons covering each arc.
+        scope = self.df.index.get_indexer(self.df_scope.index)
+        idxs, _ = self._query_predicate("arcs", "meshblock", "covered_by", scope)
+        counts = pd.Series(np.bincount(idxs, minlength=len(self.df))[scope], index=self.df_scope.index)
+
         # Flag arcs which form an invalid amount of meshblock polygons.
-        flag = ~self.df["meshblock_covered_by"].map(len).between(1, 2, inclusive="both")
+        flag = ~counts.between(1, 2, inclusive="both")
 
         # Compile error logs.
         if sum(flag):
-            errors.update(set(self.df.loc[flag].index))
+            errors.update(set(self.df_scope.loc[flag].index))
 
         return errors
 
 
+def _apply_validation(code: int) -> Tuple[int, set, float]:
+    """
+    Executes a validation of the shared dataset validation instance within a worker process.
+
+    \b
+    :param int code: validation code.
+    :return Tuple[int, set, float]: validation code, set containing identifiers of erroneous records, and wall time in
+        seconds.
+    """
+
+    return _validation._apply_validation(code)
+
+
+def _validate_tile(idxs: np.ndarray, codes: List[int]) -> Tuple[List[Tuple[int, set, float]], bool]:
+    """
+    Executes validations for a spatial tile of arcs of the shared dataset validation instance within a worker process.
+
+    \b
+    :param np.ndarray idxs: positional indexes of the tile arcs.
+    :param List[int] codes: validation codes.
+    :return Tuple[List[Tuple[int, set, float]], bool]: validation code, set containing identifiers of erroneous
+        records, and wall time in seconds, for each validation, and whether meshblock validations were skipped.
+    """
+
+    return _validation._validate_tile(idxs, codes)
+
+
+@registry.artifact(MODEL, "segment_validation", datasets={
+    "segment": ["segment_id", "bb_uid_l", "bb_uid_r", "segment_type", registry.GEOMETRY],
+    "basic_block": ["bb_uid", "cb_uid", registry.GEOMETRY]})
+def _build_segment_validation(dfs: Dict[str, gpd.GeoDataFrame], artifacts: Dict[str, Any]) -> DatasetValidation:
+    """
+    Data model artifact: dataset validation instance of segment, including the arc topology and meshblock. The loaded
+    datasets are shared without copying.
+
+    \b
+    :param Dict[str, gpd.GeoDataFrame] dfs: dictionary of dataset names and GeoDataFrames.
+    :param Dict[str, Any] artifacts: dictionary of artifact names and artifacts.
+    :return DatasetValidation: dataset validation instance.
+    """
+
+    return DatasetValidation.from_datasets(dfs["segment"], dfs["basic_block"], engine="python",
+                                           geom_col=dfs["segment"].geometry.name, copy=False)
+
+
+@registry.artifact(MODEL, "topology", artifacts=["segment_validation"])
+def _build_topology(dfs: Dict[str, gpd.GeoDataFrame], artifacts: Dict[str, Any]) -> topology.NodeEdgeGraph:
+    """
+    Data model artifact: node-edge topology of segment.
+
+    \b
+    :param Dict[str, gpd.GeoDataFrame] dfs: dictionary of dataset names and GeoDataFrames.
+    :param Dict[str, Any] artifacts: dictionary of artifact names and artifacts.
+    :return topology.NodeEdgeGraph: node-edge graph.
+    """
+
+    return artifacts["segment_validation"].graph
+
+
+@registry.artifact(MODEL, "meshblock", artifacts=["segment_validation"])
+def _build_meshblock(dfs: Dict[str, gpd.GeoDataFrame], artifacts: Dict[str, Any]) -> gpd.GeoDataFrame:
+    """
+    Data model artifact: meshblock formed by segment.
+
+    \b
+    :param Dict[str, gpd.GeoDataFrame] dfs: dictionary of dataset names and GeoDataFrames.
+    :param Dict[str, Any] artifacts: dictionary of artifact names and artifacts.
+    :return gpd.GeoDataFrame: meshblock.
+    """
+
+    return artifacts["segment_validation"].meshblock
+
+
+@registry.validation(MODEL, "segment", artifacts=["segment_validation"])
+def _validate_segment(dfs: Dict[str, gpd.GeoDataFrame], artifacts: Dict[str, Any]) -> Dict[int, Dict[str, set]]:
+    """
+    Data model validation: validations of segment (see DatasetValidation.validations).
+
+    \b
+    :param Dict[str, gpd.GeoDataFrame] dfs: dictionary of dataset names and GeoDataFrames.
+    :param Dict[str, Any] artifacts: dictionary of artifact names and artifacts.
+    :return Dict[int, Dict[str, set]]: dictionary of validation codes and, for each, dictionary of dataset names and
+        identifiers of erroneous records.
+    """
+
+    validation = artifacts["segment_validation"]
+
+    return {code: {validation.dataset: errors} for code, errors in validation.validate().items()}
+
+
 @click.command()
-@click.argument("url", type=click.STRING)
+@click.argument("url", type=click.STRING, required=False)
 @click.option("--schema", default="public", show_default=True, help="Database schema.")
 @click.option("--geom_col", default="geom", show_default=True, help="Geometry column for spatial datasets.")
-def main(url: str, schema: str = "public", geom_col: str = "geom") -> None:
+@click.option("--write_mode", type=click.Choice(["copy", "sql"], False), default="copy", show_default=True,
+              help="Method of writing results to the database: bulk COPY into a staging table (copy) or SQL statements "
+                   "with literal values (sql).")
+@click.option("--chunksize", type=click.IntRange(min=1), default=None,
+              help="Number of records per batch when streaming datasets from the database. Loads each dataset with a "
+                   "single query if not provided.")
+@click.option("--pool_size", type=click.IntRange(min=1), default=5, show_default=True,
+              help="Maximum number of concurrent database connections. Datasets are loaded concurrently.")
+@click.option("--cache_dir", type=click.Path(file_okay=False, path_type=Path), default=None,
+              help="Directory of the local dataset snapshot cache. Unchanged datasets are loaded from their snapshot "
+                   "instead of the database. Disabled if not provided.")
+@click.option("--cache_size", type=click.IntRange(min=0), default=10240, show_default=True,
+              help="Maximum total size of the dataset snapshot cache, in MiB.")
+@click.option("--state_dir", type=click.Path(file_okay=False, path_type=Path), default=None,
+              help="Directory of the validation state (arc hashes, bounds, and validation results) which is written "
+                   "after each run. Required for incremental validation.")
+@click.option("--incremental", is_flag=True, default=False,
+              help="Only revalidate arcs changed since the previous run (see --state_dir) and their neighbourhood.")
+@click.option("--workers", type=click.IntRange(min=1), default=1, show_default=True,
+              help="Number of worker processes used to apply validations (or tiles, see --tile_mode) concurrently.")
+@click.option("--tile_mode", type=click.Choice(["grid", "parent"], False), default=None,
+              help="Method of partitioning arcs into spatial tiles which are validated independently: regular grid "
+                   "(grid, see --tile_size) or existing meshblock parent polygons (parent). Disabled if not provided.")
+@click.option("--tile_size", type=click.FloatRange(min=0, min_open=True), default=10000, show_default=True,
+              help="Size of grid tiles, in the units of the dataset coordinate reference system.")
+@click.option("--engine", type=click.Choice(["python", "postgis", "auto"], False), default="auto",
+              show_default=True, help="Engine used to apply validations with an in-database equivalent: in memory "
+                                      "(python), SQL within the database (postgis), or planned per validation (auto).")
+@click.option("--segment", type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None,
+              help="File (.gpkg, .fgb, .parquet) of dataset segment, loaded instead of the database. Requires "
+                   "--basic_block.")
+@click.option("--basic_block", type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None,
+              help="File (.gpkg, .fgb, .parquet) of dataset basic_block, loaded instead of the database. Requires "
+                   "--segment.")
+@click.option("--writer", type=click.Choice(["postgis", "file", "none"], False), default=None,
+              help="Destination of validation errors and meshblock updates: the database (postgis), a file (file, see "
+                   "--output), or logged results only (none). Defaults to postgis if URL is provided, otherwise none.")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="Output file (.gpkg, .fgb, .parquet) for --writer file.")
+@click.option("--trace_dir", type=click.Path(file_okay=False, path_type=Path), default=None,
+              help="Directory of the stage trace (validate_segment.json) and stage metrics for the Prometheus textfile "
+                   "collector (validate_segment.prom). Disabled if not provided.")
+@click.option("--trace_memory", type=click.Choice(["rss", "tracemalloc"], False), default="rss", show_default=True,
+              help="Method of measuring the peak memory of each stage: peak resident set size of the process (rss) or "
+                   "peak memory allocated within the stage (tracemalloc, slower).")
+@click.option("--profile_stage", default=None,
+              help="Name or path (e.g. validate_segment/run/validate/validation_302) of a stage to be profiled. "
+                   "Requires --trace_dir.")
+@click.option("--profiler", type=click.Choice(["cprofile", "pyinstrument"], False), default="cprofile",
+              show_default=True, help="Profiler of --profile_stage.")
+def main(url: str = None, schema: str = "public", geom_col: str = "geom", write_mode: str = "copy",
+         chunksize: int = None, pool_size: int = 5, cache_dir: Path = None, cache_size: int = 10240,
+         state_dir: Path = None, incremental: bool = False, workers: int = 1, tile_mode: str = None,
+         tile_size: float = 10000, engine: str = "auto", segment: Path = None, basic_block: Path = None,
+         writer: str = None, output: Path = None, trace_dir: Path = None, trace_memory: str = "rss",
+         profile_stage: str = None, profiler: str = "cprofile") -> None:
     """
     Validates dataset: segment.
 
-    URL: Database URL. General format: postgresql://[user[:password]@][netloc][:port][/dbname]
+    URL: Database URL. General format: postgresql://[user[:password]@][netloc][:port][/dbname]. Optional if datasets
+    are loaded from files (see --segment, --basic_block).
 
     \f\b
     :param str url: database URL. General format: postgresql://[user[:password]@][netloc][:port][/dbname]
     :param str schema: database schema, default=public.
     :param str geom_col: geometry column for spatial datasets, default=geom.
+    :param str write_mode: method of writing results to the database, one of: copy, sql, default=copy.
+    :param int chunksize: number of records per batch when streaming datasets from the database, default=None.
+    :param int pool_size: maximum number of concurrent database connections, default=5.
+    :param Path cache_dir: directory of the local dataset snapshot cache, default=None.
+    :param int cache_size: maximum total size of the dataset snapshot cache, in MiB, default=10240.
+    :param Path state_dir: directory of the validation state, default=None.
+    :param bool incremental: only revalidate arcs changed since the previous run and their neighbourhood,
+        default=False.
+    :param int workers: number of worker processes used to apply validations concurrently, default=1.
+    :param str tile_mode: method of partitioning arcs into spatial tiles, one of: grid, parent, default=None.
+    :param float tile_size: size of grid tiles, default=10000.
+    :param str engine: engine used to apply validations with an in-database equivalent, one of: python, postgis, auto,
+        default=auto.
+    :param Path segment: file of dataset segment, default=None.
+    :param Path basic_block: file of dataset basic_block, default=None.
+    :param str writer: destination of validation errors and meshblock updates, one of: postgis, file, none,
+        default=None.
+    :param Path output: output file for writer=file, default=None.
+    :param Path trace_dir: directory of the stage trace and stage metrics, default=None.
+    :param str trace_memory: method of measuring the peak memory of each stage, one of: rss, tracemalloc,
+        default=rss.
+    :param str profile_stage: name or path of a stage to be profiled, default=None.
+    :param str profiler: profiler of the profiled stage, one of: cprofile, pyinstrument, default=cprofile.
     """
 
+    # Validate file datasets.
+    if (segment is None) != (basic_block is None):
+        logger.exception("Both --segment and --basic_block are required to load datasets from files.")
+        sys.exit(1)
+
+    writer = writer or ("postgis" if url else "none")
+
+    # Configure stage tracer.
+    if trace_dir:
+        helpers.tracer.configure(memory=trace_memory, profile=profile_stage, profiler=profiler,
+                                 profile_dir=trace_dir)
+
     try:
 
-        with helpers.Timer():
-            validation = DatasetValidation(url, schema, geom_col)
-            validation()
+        with helpers.Timer(), helpers.tracer.stage("validate_segment"):
+            kwargs = {"schema": schema, "geom_col": geom_col, "write_mode": write_mode, "chunksize": chunksize,
+                      "pool_size": pool_size, "cache_dir": cache_dir, "cache_size": cache_size * 1024 ** 2,
+                      "state_dir": state_dir, "incremental": incremental, "workers": workers, "tile_mode": tile_mode,
+                      "tile_size": tile_size, "engine": engine, "writer": writer, "output": output}
+            with helpers.tracer.stage("init"):
+                if segment is not None:
+                    validation = DatasetValidation.from_datasets(segment, basic_block, url=url, **kwargs)
+                else:
+                    validation = DatasetValidation(url, **kwargs)
+            with helpers.tracer.stage("run"):
+                validation()
 
     except Exception as e:
         logger.exception(f"Unhandled exception encountered. Exception details:\n{type(e).__name__}: {e}",
                          exc_info=False)
         sys.exit(1)
 
+    finally:
+
+        # Write stage trace and metrics, including those of failed runs.
+        if trace_dir:
+            helpers.tracer.write_json(trace_dir / "validate_segment.json")
+            helpers.tracer.write_prometheus(trace_dir / "validate_segment.prom", labels={"script": "validate_segment"})
+
 
 if __name__ == "__main__":
     main()
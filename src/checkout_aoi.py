@@ -1,2 +1,441 @@
-# TODO: checkout an area of interest - copy the dataset records relevant to the area of interest and copy them into a user's schema.
-# TODO: aoi boundaries must not be modified. A larger aoi should be checked out if they want to do this. National boundaries are the exception since they do not affect neighbouring AOIs.
\ No newline at end of file
+import click
+import helpers
+import logging
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from sqlalchemy import exc
+from tabulate import tabulate
+from typing import List, Tuple, Union
+
+# Set logger.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler(sys.stdout)
+handler.setLevel(logging.INFO)
+handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
+logger.addHandler(handler)
+
+# Define data models, being the directories containing a datasets.yaml.
+MODELS = sorted(path.parent.name for path in Path(__file__).resolve().parent.glob("*/datasets.yaml"))
+
+
+class CheckoutAOI:
+    """
+    Checks out an area of interest (AOI) by copying the records of all data model datasets relevant to the AOI from the
+    source schema into a user schema of the same database. Records are selected and copied server-side:
+
+    \b
+    - Spatial datasets: records intersecting the AOI. Records intersecting the AOI boundary are flagged as locked in
+        the side table aoi_locked, since AOI boundaries must not be modified (a larger AOI should be checked out
+        instead).
+    - Tabular datasets: records related to the checked out records of another dataset, via the identifier references
+        of the data model (references.yaml, e.g. street_name_link.segment_id -> segment.segment_id).
+    - Tabular datasets without references (e.g. lookups): all records.
+    """
+
+    def __init__(self, model: str, url: str, aoi: Union[Path, str], user_schema: str, layer: str = None,
+                 schema: str = "public", geom_col: str = "geom", overwrite: bool = False, pool_size: int = 5) -> None:
+        """
+        Class initialization.
+
+        \b
+        :param str model: name of the data model to be checked out.
+        :param str url: database URL.
+        :param Union[Path, str] aoi: path to a file (.gpkg, .fgb, .parquet) of the AOI polygon(s).
+        :param str user_schema: user schema to which the AOI is checked out.
+        :param str layer: layer name of the AOI within a GeoPackage, default=None.
+        :param str schema: source database schema, default=public.
+        :param str geom_col: geometry column for spatial datasets, default=geom.
+        :param bool overwrite: overwrite existing datasets in the user schema, default=False.
+        :param int pool_size: maximum number of concurrent database connections. Datasets are checked out
+            concurrently, default=5.
+        """
+
+        logger.info(f"Initializing AOI checkout for: {model}.")
+
+        self.model = model
+        self.url = url
+        self.user_schema = user_schema
+        self.schema = schema
+        self.geom_col = geom_col
+        self.overwrite = overwrite
+        self.pool_size = pool_size
+        self.model_dir = Path(__file__).resolve().parent / model
+        self.counts = dict()
+        self.created = set()
+
+        if self.user_schema == self.schema:
+            logger.exception(f"Invalid user schema: {self.user_schema}. Must differ from the source schema.")
+            sys.exit(1)
+
+        # Load data model datasets and identifier references.
+        self.datasets = helpers.load_yaml(self.model_dir / "datasets.yaml")
+        self.references = dict()
+        if (self.model_dir / "references.yaml").exists():
+            self.references = helpers.load_yaml(self.model_dir / "references.yaml") or dict()
+        else:
+            logger.warning(f"No identifier references (references.yaml) defined for data model: {self.model}. Tabular "
+                           f"datasets will be checked out in full.")
+
+        # Load AOI.
+        try:
+            df = helpers.load_file_dataset(aoi, layer=layer)
+        except (OSError, ValueError) as e:
+            logger.exception(f"Unable to load AOI: {aoi}. Exception details:\n{type(e).__name__}: {e}", exc_info=False)
+            sys.exit(1)
+
+        self.aoi_srid = df.crs.to_epsg() if df.crs else None
+        if not self.aoi_srid or not len(df) or not set(df.geom_type).issubset({"Polygon", "MultiPolygon"}):
+            logger.exception(f"Invalid AOI: {aoi}. Must contain (multi)polygons with an EPSG coordinate reference "
+                             f"system.")
+            sys.exit(1)
+
+        self.aoi = df.geometry.unary_union
+
+        # Create database engine.
+        self.engine = helpers.create_db_engine(self.url, pool_size=self.pool_size)
+
+        # Configure datasets, identifiers (being the first column of each dataset), and spatial datasets.
+        try:
+            self.db_columns = helpers.get_db_columns(self.engine, schema=self.schema)
+            existing = set(helpers.get_db_columns(self.engine, schema=self.user_schema))
+            self.user_schema_exists = helpers.execute_query(
+                self.engine, "select exists (select 1 from pg_namespace where nspname = :schema)",
+                {"schema": self.user_schema})[0][0]
+        except exc.SQLAlchemyError as e:
+            logger.exception(f"Unable to query database catalog. Exception details:\n{type(e).__name__}: {e}",
+                             exc_info=False)
+            sys.exit(1)
+
+        missing = set(self.datasets) - set(self.db_columns)
+        if len(missing):
+            logger.warning(f"Data model dataset(s) not found in schema {self.schema}: {*sorted(missing),}. These "
+                           f"datasets will not be checked out.".replace(",)", ")"))
+
+        self.datasets = [dataset for dataset in self.datasets if dataset in self.db_columns]
+        self.columns = {dataset: [column for column, _ in self.db_columns[dataset]] for dataset in self.datasets}
+        self.identifiers = {dataset: self.columns[dataset][0] for dataset in self.datasets}
+        self.spatial = {dataset for dataset in self.datasets if self.geom_col in self.columns[dataset]}
+
+        # Validate user schema.
+        existing = sorted(existing.intersection(self.datasets))
+        if len(existing) and not self.overwrite:
+            logger.exception(f"Dataset(s) already exist in user schema {self.user_schema}: {*existing,}. Use "
+                             f"--overwrite to replace them.".replace(",)", ")"))
+            sys.exit(1)
+
+        # Configure dataset spatial reference systems.
+        self.srids = dict()
+        for dataset in sorted(self.spatial):
+            self.srids[dataset] = helpers.execute_query(
+                self.engine, "select Find_SRID(:schema, :table, :column)",
+                {"schema": self.schema, "table": dataset, "column": self.geom_col})[0][0]
+
+        self._configure_stages()
+
+    def __call__(self) -> None:
+        """Executes the class."""
+
+        # Check out datasets of each stage concurrently.
+        # Note: SystemExit is raised by failed database operations, hence all exceptions are handled.
+        executor = ThreadPoolExecutor(max_workers=self.pool_size)
+        try:
+            self._create_aoi()
+
+            for index, stage in enumerate(self.stages):
+                logger.info(f"Checking out stage {index + 1} of {len(self.stages)}: {', '.join(sorted(stage))}.")
+                futures = {dataset: executor.submit(self._checkout_dataset, dataset, selection)
+                           for dataset, selection in stage.items()}
+                for dataset, future in futures.items():
+                    self.counts[dataset] = future.result()
+
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._drop_checkout()
+            raise
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+            # Drop intermediate AOI tables.
+            helpers.execute_sql(self.engine, tuple(f"DROP TABLE IF EXISTS {self.user_schema}._aoi_{srid}, "
+                                                   f"{self.user_schema}._aoi_boundary_{srid};"
+                                                   for srid in sorted(set(self.srids.values()))))
+
+        # Log checkout summary.
+        summary = tabulate([[dataset, self.selections[dataset], self.counts[dataset]]
+                            for dataset in sorted(self.counts)],
+                           headers=["Dataset", "Selection", "Record Count"], tablefmt="rst",
+                           colalign=("left", "left", "right"))
+
+        logger.info("Checkout results:\n" + summary)
+
+    def _configure_stages(self) -> None:
+        """
+        Configures the selection of each dataset and groups datasets into stages, such that each dataset is checked out
+        after all datasets its selection depends on. Datasets within a stage are independent.
+        """
+
+        stages = [dict()]
+        self.selections = dict()
+
+        # Select spatial datasets and tabular datasets without references to or from other datasets.
+        references = {dataset: self._get_references(dataset) for dataset in self.datasets}
+        referenced = {other for relations in references.values() for _, other in relations}
+        for dataset in self.datasets:
+            if dataset in self.spatial:
+                stages[0][dataset] = "aoi"
+                self.selections[dataset] = "AOI"
+            elif not len(references[dataset]) and dataset not in referenced:
+                stages[0][dataset] = "all"
+                self.selections[dataset] = "All"
+
+        # Select tabular datasets via references to or from checked out datasets.
+        resolved = set(stages[0])
+        while True:
+            stage = dict()
+            for dataset in sorted(set(self.datasets) - resolved):
+
+                # Compile relations as (dataset, dataset column, column), referencing or referenced by the dataset.
+                related = [(other, self.identifiers[other], column) for column, other in references[dataset]
+                           if other in resolved] + \
+                          [(other, column, self.identifiers[dataset]) for other in sorted(resolved)
+                           for column, target in references[other] if target == dataset]
+                if len(related):
+                    stage[dataset] = related
+                    self.selections[dataset] = ", ".join(f"{other}.{column}" for other, column, _ in related)
+
+            if not len(stage):
+                break
+
+            stages.append(stage)
+            resolved.update(stage)
+
+        # Select remaining datasets, unrelated to any checked out dataset, in full.
+        for dataset in sorted(set(self.datasets) - resolved):
+            stages[0][dataset] = "all"
+            self.selections[dataset] = "All"
+
+        self.stages = stages
+
+    def _get_references(self, dataset: str) -> List[Tuple[str, str]]:
+        """
+        Returns the identifier references of a dataset (see references.yaml), limited to existing columns and datasets.
+        Columns referencing multiple datasets (e.g. segment or ferry) are returned once per referenced dataset.
+
+        \b
+        :param str dataset: dataset name.
+        :return List[Tuple[str, str]]: column and referenced dataset names.
+        """
+
+        return [(column, other) for column, others in self.references.get(dataset, dict()).items()
+                if column in self.columns[dataset] for other in others if other in self.identifiers]
+
+    def _drop_checkout(self) -> None:
+        """
+        Drops a partial checkout, such that the user schema never contains an incomplete AOI. The user schema is dropped
+        if created by this checkout, otherwise only the AOI tables and the datasets checked out by this checkout.
+        """
+
+        logger.warning(f"Checkout failed. Dropping partial checkout from user schema: {self.user_schema}.")
+
+        if not self.user_schema_exists:
+            statement = f"DROP SCHEMA IF EXISTS {self.user_schema} CASCADE;"
+        else:
+            tables = ("aoi", "aoi_locked", *sorted(self.created))
+            statement = f"DROP TABLE IF EXISTS {', '.join(f'{self.user_schema}.{table}' for table in tables)};"
+
+        helpers.execute_sql(self.engine, statement)
+
+    def _create_aoi(self) -> None:
+        """
+        Creates the user schema, the AOI, the lock table, and the intermediate AOI tables, transformed to the spatial
+        reference system of each spatial dataset. The AOI and its boundary are subdivided into GiST-indexed pieces of
+        bounded complexity, such that each piece probes the spatial index of a dataset with a cheap intersection test.
+        """
+
+        logger.info(f"Creating AOI in user schema: {self.user_schema}.")
+
+        aoi = f"ST_SetSRID(ST_GeomFromWKB(decode('{self.aoi.wkb_hex}', 'hex')), {self.aoi_srid})"
+
+        statements = [
+            f"CREATE SCHEMA IF NOT EXISTS {self.user_schema};",
+            f"DROP TABLE IF EXISTS {self.user_schema}.aoi;",
+            f"CREATE TABLE {self.user_schema}.aoi AS SELECT {aoi} AS geom;",
+            f"DROP TABLE IF EXISTS {self.user_schema}.aoi_locked;",
+            f"CREATE TABLE {self.user_schema}.aoi_locked (dataset text NOT NULL, identifier text NOT NULL, "
+            f"PRIMARY KEY (dataset, identifier));"
+        ]
+
+        for srid in sorted(set(self.srids.values())):
+            geom = f"ST_Transform(geom, {srid})"
+            for table, pieces in ((f"_aoi_{srid}", f"ST_Subdivide({geom}, 256)"),
+                                  (f"_aoi_boundary_{srid}", f"ST_Subdivide(ST_Boundary({geom}), 256)")):
+                statements.extend([
+                    f"DROP TABLE IF EXISTS {self.user_schema}.{table};",
+                    f"CREATE UNLOGGED TABLE {self.user_schema}.{table} AS SELECT {pieces} AS geom "
+                    f"FROM {self.user_schema}.aoi;",
+                    f"CREATE INDEX ON {self.user_schema}.{table} USING gist (geom);",
+                    f"ANALYZE {self.user_schema}.{table};"
+                ])
+
+        helpers.execute_sql(self.engine, tuple(statements))
+
+    def _get_definitions(self, dataset: str) -> List[str]:
+        """
+        Returns the SQL statements which recreate the indexes, unique and primary key constraints, and triggers of a
+        source dataset on the corresponding user dataset.
+
+        \b
+        :param str dataset: dataset name.
+        :return List[str]: SQL statements.
+        """
+
+        table = f"{self.user_schema}.{dataset}"
+        regclass = {"regclass": f"{self.schema}.{dataset}"}
+
+        # Query index and trigger definitions.
+        indexes = helpers.execute_query(self.engine, """
+        SELECT pg_get_indexdef(i.indexrelid), c.relname, con.contype FROM pg_index i
+          JOIN pg_class c ON c.oid = i.indexrelid
+          LEFT JOIN pg_constraint con ON con.conindid = i.indexrelid AND con.contype IN ('p', 'u')
+        WHERE i.indrelid = CAST(:regclass AS regclass);
+        """, regclass)
+        triggers = helpers.execute_query(self.engine, """
+        SELECT pg_get_triggerdef(oid) FROM pg_trigger WHERE tgrelid = CAST(:regclass AS regclass) AND NOT tgisinternal;
+        """, regclass)
+
+        # Retarget definitions to the user dataset.
+        pattern = re.compile(rf" ON (ONLY )?({re.escape(self.schema)}\.)?{re.escape(dataset)} ")
+        statements = list()
+
+        for definition, name, contype in indexes:
+            statements.append(pattern.sub(f" ON \\1{table} ", definition, count=1) + ";")
+            if contype:
+                constraint = "PRIMARY KEY" if contype == "p" else "UNIQUE"
+                statements.append(f"ALTER TABLE {table} ADD CONSTRAINT {name} {constraint} USING INDEX {name};")
+
+        for definition, in triggers:
+            statements.append(pattern.sub(f" ON {table} ", definition, count=1) + ";")
+
+        return statements
+
+    def _checkout_dataset(self, dataset: str, selection: Union[str, List[Tuple[str, str, str]]]) -> int:
+        """
+        Checks out a dataset in a single transaction. The user dataset is created without indexes, populated via
+        INSERT ... SELECT, then indexed, such that indexes are built once rather than maintained per record.
+
+        \b
+        :param str dataset: dataset name.
+        :param Union[str, List[Tuple[str, str, str]]] selection: record selection, one of: aoi, all, or a list of
+            relations (checked out dataset, checked out dataset column, column) to checked out datasets.
+        :return int: number of checked out records.
+        """
+
+        logger.info(f"Checking out dataset: {self.schema}.{dataset}.")
+
+        # Register dataset for removal on failure, since an existing user dataset is replaced.
+        self.created.add(dataset)
+
+        src = f"{self.schema}.{dataset}"
+        dst = f"{self.user_schema}.{dataset}"
+        columns = ", ".join(self.columns[dataset])
+        columns_src = ", ".join(f"src.{column}" for column in self.columns[dataset])
+
+        statements = [
+            f"DROP TABLE IF EXISTS {dst};",
+            f"CREATE TABLE {dst} (LIKE {src} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED);"
+        ]
+
+        # Spatial selection.
+        if selection == "aoi":
+
+            # Select records intersecting the AOI, flagging records intersecting the AOI boundary as locked.
+            # Note: records intersecting multiple AOI pieces are deduplicated by identifier.
+            srid = self.srids[dataset]
+            identifier = self.identifiers[dataset]
+            statements.extend([
+                f"""
+                INSERT INTO {dst} ({columns})
+                SELECT DISTINCT ON (src.{identifier}) {columns_src}
+                FROM {self.user_schema}._aoi_{srid} AS a
+                  JOIN {src} AS src ON ST_Intersects(src.{self.geom_col}, a.geom);
+                """,
+                f"""
+                INSERT INTO {self.user_schema}.aoi_locked (dataset, identifier)
+                SELECT DISTINCT '{dataset}', CAST(src.{identifier} AS text)
+                FROM {self.user_schema}._aoi_boundary_{srid} AS b
+                  JOIN {src} AS src ON ST_Intersects(src.{self.geom_col}, b.geom);
+                """
+            ])
+
+        # Full selection.
+        elif selection == "all":
+            statements.append(f"INSERT INTO {dst} ({columns}) SELECT {columns} FROM {src};")
+
+        # Related selection.
+        else:
+            conditions = [f"EXISTS (SELECT 1 FROM {self.user_schema}.{other} AS rel WHERE rel.{column_rel} = "
+                          f"src.{column})" for other, column_rel, column in selection]
+            statements.append(f"INSERT INTO {dst} ({columns}) SELECT {columns_src} FROM {src} AS src "
+                              f"WHERE {' OR '.join(conditions)};")
+
+        # Recreate indexes, constraints, and triggers, then collect statistics for subsequent selections.
+        statements.extend([*self._get_definitions(dataset), f"ANALYZE {dst};"])
+
+        helpers.execute_sql(self.engine, tuple(statements))
+
+        return helpers.execute_query(self.engine, f"select count(*) from {dst}")[0][0]
+
+
+@click.command()
+@click.argument("model", type=click.Choice(MODELS, False))
+@click.argument("url", type=click.STRING)
+@click.argument("aoi", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("user_schema", type=click.STRING)
+@click.option("--layer", default=None, help="Layer name of the AOI within a GeoPackage.")
+@click.option("--schema", default="public", show_default=True, help="Source database schema.")
+@click.option("--geom_col", default="geom", show_default=True, help="Geometry column for spatial datasets.")
+@click.option("--overwrite", is_flag=True, default=False, show_default=True,
+              help="Overwrite existing datasets in the user schema.")
+@click.option("--pool_size", type=click.IntRange(min=1), default=5, show_default=True,
+              help="Maximum number of concurrent database connections. Datasets are checked out concurrently.")
+def main(model: str, url: str, aoi: Path, user_schema: str, layer: str = None, schema: str = "public",
+         geom_col: str = "geom", overwrite: bool = False, pool_size: int = 5) -> None:
+    """
+    Checks out an area of interest (AOI) into a user schema.
+
+    \b
+    MODEL: Name of the data model to be checked out.
+    URL: Database URL. General format: postgresql://[user[:password]@][netloc][:port][/dbname]
+    AOI: Path to a file (.gpkg, .fgb, .parquet) of the AOI polygon(s).
+    USER_SCHEMA: User schema to which the AOI is checked out.
+
+    \f\b
+    :param str model: name of the data model to be checked out.
+    :param str url: database URL.
+    :param Path aoi: path to a file (.gpkg, .fgb, .parquet) of the AOI polygon(s).
+    :param str user_schema: user schema to which the AOI is checked out.
+    :param str layer: layer name of the AOI within a GeoPackage, default=None.
+    :param str schema: source database schema, default=public.
+    :param str geom_col: geometry column for spatial datasets, default=geom.
+    :param bool overwrite: overwrite existing datasets in the user schema, default=False.
+    :param int pool_size: maximum number of concurrent database connections, default=5.
+    """
+
+    try:
+
+        with helpers.Timer():
+            checkout = CheckoutAOI(model, url, aoi, user_schema, layer, schema, geom_col, overwrite, pool_size)
+            checkout()
+
+    except Exception as e:
+        logger.exception(f"Unhandled exception encountered. Exception details:\n{type(e).__name__}: {e}",
+                         exc_info=False)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
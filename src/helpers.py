@@ -1,14 +1,45 @@
+import cProfile
+import csv
+import ctypes
 import datetime
+import fiona
 import geopandas as gpd
+import hashlib
+import io
+import json
 import logging
+import numpy as np
+import os
 import pandas as pd
+import psycopg2
+import pygeos
+import struct
 import sys
+import threading
 import time
+import tracemalloc
+import uuid
 import yaml
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from pyarrow import feather
 from sqlalchemy import create_engine, exc, inspect, text
-from sqlalchemy.engine.base import Engine
-from typing import Any, Dict, Sequence, Tuple, Union
+from sqlalchemy.engine.base import Connection, Engine
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+try:
+    import resource
+except ImportError:
+    # Windows.
+    resource = None
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
 
 
 # Set logger.
@@ -49,12 +80,326 @@ class Timer:
         logger.info(f"Finished. Time elapsed: {delta}.")
 
 
-def create_db_engine(url: str) -> Engine:
+class Tracer:
+    """
+    Records a hierarchy of stages with their wall time, CPU time, peak memory, and input and output row counts. Stages
+    are nested by the order in which they are entered on each thread and are only recorded while the tracer is enabled
+    (see configure). Use the module-level instance: tracer.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the Tracer class."""
+
+        self.enabled = False
+        self.memory = "rss"
+        self.profile = None
+        self.profiler = "cprofile"
+        self.profile_dir = None
+        self.stages = list()
+        self.start_time = None
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool = True, memory: str = "rss", profile: str = None, profiler: str = "cprofile",
+                  profile_dir: Union[Path, str] = None) -> None:
+        """
+        Configures and resets the tracer.
+
+        \b
+        :param bool enabled: record stages, default=True.
+        :param str memory: method of measuring peak memory, one of: rss (peak resident set size of the process at the
+            end of each stage, see get_peak_rss), tracemalloc (peak memory allocated by Python and numpy within each
+            stage, at a significant runtime cost), default=rss.
+        :param str profile: name or path (names of the stage and its parents, separated by "/") of a stage to be
+            profiled. Disabled if not provided, default=None.
+        :param str profiler: profiler of the profiled stage, one of: cprofile (written as .prof), pyinstrument
+            (written as .html, if installed), default=cprofile.
+        :param Union[Path, str] profile_dir: directory of profiler output. Defaults to the working directory,
+            default=None.
+        """
+
+        self.enabled = enabled
+        self.memory = memory
+        self.profile = profile
+        self.profiler = profiler
+        self.profile_dir = Path(profile_dir or ".").resolve()
+        self.stages = list()
+        self.start_time = time.time()
+
+        # Configure memory tracing.
+        if self.enabled and self.memory == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        if self.profile and self.profiler == "pyinstrument" and not pyinstrument:
+            logger.warning("Profiler pyinstrument is not installed. Stage will be profiled with cProfile instead.")
+            self.profiler = "cprofile"
+
+    @property
+    def current(self) -> Union[Dict[str, Any], None]:
+        """
+        Returns the innermost stage of the current thread.
+
+        \b
+        :return Union[Dict[str, Any], None]: stage record, None if no stage has been entered.
+        """
+
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def _add(self, name: str, parent: Dict[str, Any] = None, rows_in: int = None) -> Dict[str, Any]:
+        """
+        Creates and adds a stage record to the hierarchy.
+
+        \b
+        :param str name: stage name.
+        :param Dict[str, Any] parent: parent stage record. Defaults to the innermost stage of the current thread,
+            default=None.
+        :param int rows_in: number of input rows, default=None.
+        :return Dict[str, Any]: stage record.
+        """
+
+        parent = parent or self.current
+        record = {"name": name, "path": f"{parent['path']}/{name}" if parent else name,
+                  "rows_in": None if rows_in is None else int(rows_in), "rows_out": None, "wall_seconds": None,
+                  "cpu_seconds": None, "peak_memory_bytes": None, "stages": list()}
+
+        with self._lock:
+            (parent["stages"] if parent else self.stages).append(record)
+
+        return record
+
+    def record(self, name: str, wall_seconds: float, rows_in: int = None, rows_out: int = None) -> None:
+        """
+        Records a completed stage which was not measured by the tracer, such as work executed by worker processes.
+
+        \b
+        :param str name: stage name.
+        :param float wall_seconds: wall time, in seconds.
+        :param int rows_in: number of input rows, default=None.
+        :param int rows_out: number of output rows, default=None.
+        """
+
+        if self.enabled:
+            record = self._add(name, rows_in=rows_in)
+            record["wall_seconds"] = wall_seconds
+            record["rows_out"] = None if rows_out is None else int(rows_out)
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = None, parent: Dict[str, Any] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Records a stage for the duration of the context. The number of output rows can be assigned to the yielded stage
+        record (rows_out).
+
+        \b
+        :param str name: stage name.
+        :param int rows_in: number of input rows, default=None.
+        :param Dict[str, Any] parent: parent stage record, required to nest stages entered on worker threads. Defaults
+            to the innermost stage of the current thread, default=None.
+        :return Iterator[Dict[str, Any]]: stage record.
+        """
+
+        if not self.enabled:
+            yield dict()
+            return
+
+        record = self._add(name, parent=parent, rows_in=rows_in)
+        main = threading.current_thread() is threading.main_thread()
+        tracing = self.memory == "tracemalloc" and tracemalloc.is_tracing()
+
+        if not hasattr(self._local, "stack"):
+            self._local.stack = list()
+        stack = self._local.stack
+
+        # Carry the peak traced memory of the parent stage over the reset.
+        if tracing and main:
+            if stack:
+                stack[-1]["peak_memory_bytes"] = max(stack[-1]["peak_memory_bytes"] or 0,
+                                                     tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        # Start profiler.
+        profiler = None
+        if self.profile in {record["name"], record["path"]}:
+            logger.info(f"Profiling stage: {record['path']}.")
+            if self.profiler == "pyinstrument":
+                profiler = pyinstrument.Profiler()
+                profiler.start()
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+
+        # Note: CPU time is measured per process on the main thread, to include the threads it starts.
+        cpu_time = time.process_time if main else time.thread_time
+        start_time, start_cpu = time.perf_counter(), cpu_time()
+        stack.append(record)
+
+        try:
+            yield record
+
+        finally:
+            stack.pop()
+            record["wall_seconds"] = time.perf_counter() - start_time
+            record["cpu_seconds"] = cpu_time() - start_cpu
+            if record["rows_out"] is not None:
+                record["rows_out"] = int(record["rows_out"])
+
+            # Measure peak memory.
+            if tracing:
+                record["peak_memory_bytes"] = max(record["peak_memory_bytes"] or 0, tracemalloc.get_traced_memory()[1])
+                if main:
+                    if stack:
+                        stack[-1]["peak_memory_bytes"] = max(stack[-1]["peak_memory_bytes"] or 0,
+                                                             record["peak_memory_bytes"])
+                    tracemalloc.reset_peak()
+            else:
+                record["peak_memory_bytes"] = get_peak_rss()
+
+            # Stop profiler and write output.
+            if profiler:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                path = self.profile_dir / record["path"].replace("/", ".")
+                if self.profiler == "pyinstrument":
+                    profiler.stop()
+                    path.with_suffix(".html").write_text(profiler.output_html(), encoding="utf8")
+                else:
+                    profiler.disable()
+                    profiler.dump_stats(path.with_suffix(".prof"))
+                logger.info(f"Wrote profile of stage: {record['path']}.")
+
+    def _flatten(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterates all stage records, depth first.
+
+        \b
+        :return Iterator[Dict[str, Any]]: stage records.
+        """
+
+        stack = list(reversed(self.stages))
+        while stack:
+            record = stack.pop()
+            yield record
+            stack.extend(reversed(record["stages"]))
+
+    @staticmethod
+    def _escape(val: Any) -> str:
+        """
+        Escapes a Prometheus label value.
+
+        \b
+        :param Any val: label value.
+        :return str: escaped label value.
+        """
+
+        return str(val).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+    def write_json(self, path: Union[Path, str]) -> None:
+        """
+        Writes the stage hierarchy as JSON.
+
+        \b
+        :param Union[Path, str] path: output path.
+        """
+
+        path = Path(path).resolve()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        trace = {"start_time": datetime.datetime.fromtimestamp(self.start_time or time.time()).isoformat(),
+                 "memory": self.memory, "stages": self.stages}
+        with open(path, "w", encoding="utf8") as f:
+            json.dump(trace, f, indent=2)
+
+        logger.info(f"Wrote trace: {path}.")
+
+    def write_prometheus(self, path: Union[Path, str], labels: Dict[str, str] = None,
+                         prefix: str = "egp_stage") -> None:
+        """
+        Writes the stage metrics in the Prometheus text exposition format, for the node exporter textfile collector. The
+        file is replaced atomically. Metrics of repeated stages (identical paths) are summed, except for peak memory.
+
+        \b
+        :param Union[Path, str] path: output path (.prom).
+        :param Dict[str, str] labels: labels added to all metrics, default=None.
+        :param str prefix: metric name prefix, default=egp_stage.
+        """
+
+        path = Path(path).resolve()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        metrics = {"wall_seconds": ("Wall time of the stage.", sum),
+                   "cpu_seconds": ("CPU time of the stage.", sum),
+                   "peak_memory_bytes": (f"Peak memory of the stage ({self.memory}).", max),
+                   "rows_in": ("Number of input rows of the stage.", sum),
+                   "rows_out": ("Number of output rows of the stage.", sum)}
+
+        # Group metric values by stage path.
+        values = dict()
+        for record in self._flatten():
+            for metric in metrics:
+                if record[metric] is not None:
+                    values.setdefault((metric, record["path"]), list()).append(record[metric])
+
+        # Compile metrics.
+        labels = ",".join(f'{k}="{self._escape(v)}"' for k, v in (labels or dict()).items())
+        lines = list()
+        for metric, (description, agg) in metrics.items():
+            lines.extend([f"# HELP {prefix}_{metric} {description}", f"# TYPE {prefix}_{metric} gauge"])
+            for (metric_, stage), vals in values.items():
+                if metric_ == metric:
+                    lines.append(f'{prefix}_{metric}{{{labels}{"," if labels else ""}stage="{self._escape(stage)}"}} '
+                                 f'{agg(vals)}')
+
+        # Write file atomically.
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf8")
+        os.replace(tmp_path, path)
+
+        logger.info(f"Wrote stage metrics: {path}.")
+
+
+# Set tracer.
+tracer = Tracer()
+
+
+def get_peak_rss() -> Union[int, None]:
     """
-    Creates a database engine based on a database URL.
+    Returns the peak resident set size (high-water mark of physical memory usage) of the current process.
+
+    \b
+    :return Union[int, None]: peak resident set size, in bytes. None if unavailable for the current platform.
+    """
+
+    # POSIX. Note: ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    if resource:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    # Windows.
+    if sys.platform == "win32":
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+
+    return None
+
+
+def create_db_engine(url: str, pool_size: int = 5) -> Engine:
+    """
+    Creates a database engine based on a database URL, backed by a pool of reusable connections.
 
     \b
     :param str url: database URL.
+    :param int pool_size: maximum number of concurrent database connections, default=5.
     :return sqlalchemy.engine.base.Engine: database engine.
     """
 
@@ -63,7 +408,8 @@ def create_db_engine(url: str) -> Engine:
     try:
 
         # Create database engine.
-        engine = create_engine(url)
+        # Note: overflow connections are disabled such that pool_size is a hard limit on concurrent connections.
+        engine = create_engine(url, pool_size=pool_size, max_overflow=0, pool_pre_ping=True)
 
         # Test database connection.
         _ = inspect(engine)
@@ -94,11 +440,13 @@ def execute_sql(engine: Engine, statements: Union[str, Tuple[str, ...]]) -> None
     # Run and commit transaction.
     try:
 
-        with engine.begin() as con:
+        with tracer.stage("execute_sql", rows_in=len(statements)), engine.begin() as con:
 
             # Iterate statements.
-            for statement in statements:
-                _ = con.execute(text(statement.replace(",)", ")")))
+            for index, statement in enumerate(statements):
+                with tracer.stage(f"statement_{index}") as stage:
+                    result = con.execute(text(statement.replace(",)", ")")))
+                    stage["rows_out"] = result.rowcount if result.rowcount >= 0 else None
 
     except exc.SQLAlchemyError as e:
         logger.exception(f"Unable to execute SQL statement. Exception details:\n{type(e).__name__}: {e}",
@@ -106,25 +454,643 @@ def execute_sql(engine: Engine, statements: Union[str, Tuple[str, ...]]) -> None
         sys.exit(1)
 
 
-def load_db_datasets(engine: Engine, subset: Sequence[str] = None, schema: str = "public", geom_col: str = "geom") -> \
-        Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]:
+def execute_query(engine: Engine, query: str, params: Dict[str, Any] = None) -> List[Tuple[Any, ...]]:
+    """
+    Executes a SQL query and returns the resulting rows.
+
+    \b
+    :param sqlalchemy.engine.base.Engine engine: database engine.
+    :param str query: SQL query.
+    :param Dict[str, Any] params: bound query parameters, default=None.
+    :return List[Tuple[Any, ...]]: list of rows.
+    """
+
+    try:
+
+        with engine.connect() as con:
+            return [tuple(row) for row in con.execute(text(query), params or dict())]
+
+    except exc.SQLAlchemyError as e:
+        logger.exception(f"Unable to execute SQL query. Exception details:\n{type(e).__name__}: {e}", exc_info=False)
+        sys.exit(1)
+
+
+def encode_copy_binary(records: Sequence[Sequence[Union[bytes, None]]]) -> bytes:
+    """
+    Encodes records in the PostgreSQL binary COPY format: a signature and header, each record as a field count followed
+    by the length (-1 for NULL) and bytes of each value, and a trailer.
+
+    \b
+    :param Sequence[Sequence[Union[bytes, None]]] records: sequence of records, each a sequence of binary values.
+    :return bytes: binary COPY data.
+    """
+
+    chunks = [b"PGCOPY\n\xff\r\n\x00", struct.pack("!ii", 0, 0)]
+
+    for record in records:
+        chunks.append(struct.pack("!h", len(record)))
+        for val in record:
+            if val is None:
+                chunks.append(struct.pack("!i", -1))
+            else:
+                chunks.append(struct.pack("!i", len(val)))
+                chunks.append(val)
+
+    chunks.append(struct.pack("!h", -1))
+
+    return b"".join(chunks)
+
+
+def encode_uuid(val: Any) -> Union[bytes, None]:
+    """
+    Returns the binary representation (16 bytes) of a UUID for PostgreSQL binary COPY.
+
+    \b
+    :param Any val: UUID or UUID string.
+    :return Union[bytes, None]: UUID bytes, None if the value is null.
+    """
+
+    if val is None or (isinstance(val, float) and np.isnan(val)):
+        return None
+
+    return val.bytes if isinstance(val, uuid.UUID) else uuid.UUID(str(val)).bytes
+
+
+def execute_copy(engine: Engine, table: str, columns: Sequence[str], records: Iterable[Sequence[Any]],
+                 statements_pre: Union[str, Tuple[str, ...]] = (), statements_post: Union[str, Tuple[str, ...]] = (),
+                 batch_size: int = 100000, binary: bool = False) -> int:
+    """
+    Streams records into a database table via PostgreSQL COPY, in fixed-size batches, as a database transaction. SQL
+    statements can be executed before (e.g. to create a staging table) and after (e.g. to apply the staged records) the
+    COPY within the same transaction, such that temporary tables created with ON COMMIT DROP are available to all
+    statements.
+
+    \b
+    :param sqlalchemy.engine.base.Engine engine: database engine.
+    :param str table: schema-qualified name of the destination table.
+    :param Sequence[str] columns: destination column names, in the order of the record values.
+    :param Iterable[Sequence[Any]] records: iterable of records, each a sequence of values. None values are written as
+        NULL.
+    :param Union[str, Tuple[str, ...]] statements_pre: SQL statement or sequence of statements to be executed before
+        the COPY, default=().
+    :param Union[str, Tuple[str, ...]] statements_post: SQL statement or sequence of statements to be executed after
+        the COPY, default=().
+    :param int batch_size: number of records per COPY batch, default=100000.
+    :param bool binary: copy records in the PostgreSQL binary format, in which case each value must be the binary
+        representation of its column type (e.g. see encode_uuid; WKB for bytea) or None, default=False.
+    :return int: number of copied records.
+    """
+
+    logger.info(f"Copying records into table: {table}.")
+
+    # Resolve statement inputs.
+    if isinstance(statements_pre, str):
+        statements_pre = (statements_pre,)
+    if isinstance(statements_post, str):
+        statements_post = (statements_post,)
+
+    query = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT {'binary' if binary else 'csv'})"
+    records = iter(records)
+    count = 0
+
+    # Run and commit transaction.
+    try:
+
+        with tracer.stage(f"execute_copy_{table}") as stage, engine.begin() as con:
+
+            # Execute pre-COPY statements.
+            for statement in statements_pre:
+                _ = con.execute(text(statement))
+
+            # Stream records in batches.
+            start_time = time.time()
+            cursor = con.connection.cursor()
+
+            while True:
+
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+
+                if binary:
+                    buffer = io.BytesIO(encode_copy_binary(batch))
+                else:
+                    buffer = io.StringIO()
+                    csv.writer(buffer, lineterminator="\n").writerows(batch)
+                    buffer.seek(0)
+                cursor.copy_expert(query, buffer)
+                count += len(batch)
+
+            cursor.close()
+            stage["rows_out"] = count
+            total_seconds = max(time.time() - start_time, 1e-9)
+
+            # Execute post-COPY statements.
+            for statement in statements_post:
+                _ = con.execute(text(statement))
+
+    except (exc.SQLAlchemyError, psycopg2.Error) as e:
+        logger.exception(f"Unable to copy records into table: {table}. Exception details:\n{type(e).__name__}: {e}",
+                         exc_info=False)
+        sys.exit(1)
+
+    logger.info(f"Copied {count} records into {table} in {datetime.timedelta(seconds=total_seconds)} "
+                f"({count / total_seconds:,.0f} records/s).")
+
+    return count
+
+
+def write_error_flags(engine: Engine, table: str, identifier: str, errors: Dict[int, Iterable[Any]],
+                      dtype: str = "uuid") -> int:
+    """
+    Writes validation error flags to a database table as one integer column per validation code (v<code>), by streaming
+    all (identifier, code) pairs into an unlogged staging table via COPY and applying them with a single set-based
+    update. Pre-existing columns of all codes are dropped, and columns are only added for codes with errors. Nothing is
+    written if no codes are provided.
+
+    \b
+    :param sqlalchemy.engine.base.Engine engine: database engine.
+    :param str table: schema-qualified name of the table.
+    :param str identifier: identifier column of the table.
+    :param Dict[int, Iterable[Any]] errors: dictionary of validation codes and identifiers of invalid records.
+    :param str dtype: data type of the identifier column, default=uuid.
+    :return int: number of copied (identifier, code) pairs.
+    """
+
+    # Skip table without codes, since there are no columns to drop or add.
+    if not len(errors):
+        return 0
+
+    schema, dataset = table.rsplit(".", 1)
+    staging = f"{schema}._{dataset}_errors"
+    codes = sorted(code for code, vals in errors.items() if len(vals))
+
+    # Create SQL statements to create the staging table.
+    statements_pre = (
+        f"DROP TABLE IF EXISTS {staging};",
+        f"CREATE UNLOGGED TABLE {staging} ({identifier} {dtype}, code integer);"
+    )
+
+    # Create SQL statements to drop pre-existing columns.
+    statements_post = [
+        f"ALTER TABLE {table} {', '.join(f'DROP COLUMN IF EXISTS v{code}' for code in sorted(errors))};"
+    ]
+
+    if len(codes):
+
+        # Create SQL statements to add and populate new columns for invalid records.
+        flags = ", ".join(f"MAX((code = {code})::integer) AS v{code}" for code in codes)
+        statements_post.extend([
+            f"ANALYZE {staging};",
+            f"ALTER TABLE {table} {', '.join(f'ADD COLUMN v{code} INTEGER DEFAULT 0' for code in codes)};",
+            f"""
+            UPDATE {table} AS dst SET {', '.join(f'v{code} = src.v{code}' for code in codes)}
+            FROM (SELECT {identifier}, {flags} FROM {staging} GROUP BY {identifier}) AS src
+            WHERE dst.{identifier} = src.{identifier};
+            """
+        ])
+
+    statements_post.append(f"DROP TABLE {staging};")
+
+    # Stream error flags and execute statements.
+    records = ((val, code) for code, vals in sorted(errors.items()) for val in vals)
+    return execute_copy(engine=engine, table=staging, columns=(identifier, "code"), records=records,
+                        statements_pre=statements_pre, statements_post=tuple(statements_post))
+
+
+def to_pygeos(geoms: Union[gpd.GeoSeries, np.ndarray]) -> np.ndarray:
+    """
+    Returns the geometries of a GeoSeries as an array of pygeos geometries, without copying if the GeoSeries is already
+    backed by pygeos.
+
+    \b
+    :param Union[gpd.GeoSeries, np.ndarray] geoms: GeoSeries or array of pygeos geometries.
+    :return np.ndarray: array of pygeos geometries.
+    """
+
+    if isinstance(geoms, gpd.GeoSeries):
+        return geoms.values.data if gpd.options.use_pygeos else pygeos.from_shapely(geoms.values)
+
+    return geoms
+
+
+def get_coordinate_arrays(geoms: Union[gpd.GeoSeries, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extracts the coordinates of a sequence of geometries as a flat array with per-geometry offsets, such that the
+    coordinates of geometry i are: coords[offsets[i]: offsets[i + 1]].
+
+    \b
+    :param Union[gpd.GeoSeries, np.ndarray] geoms: GeoSeries or array of pygeos geometries.
+    :return Tuple[np.ndarray, np.ndarray]: float64 array of shape (N, 2) of xy coordinates and int64 array of shape
+        (n + 1,) of offsets.
+    """
+
+    geoms = to_pygeos(geoms)
+
+    # Extract coordinates and compute offsets from per-geometry coordinate counts.
+    coords = pygeos.get_coordinates(geoms)
+    offsets = np.zeros(len(geoms) + 1, dtype=np.int64)
+    np.cumsum(pygeos.get_num_coordinates(geoms), out=offsets[1:])
+
+    return coords, offsets
+
+
+def _concat_batches(batches: Iterator[pd.DataFrame], count: int) -> Union[gpd.GeoDataFrame, pd.DataFrame, None]:
+    """
+    Concatenates batches of records into column arrays preallocated for the total number of records, releasing each
+    batch once copied, such that only the result and a single batch are held in memory rather than all batches and
+    their concatenation.
+
+    \b
+    :param Iterator[pd.DataFrame] batches: iterator of (Geo)DataFrames with identical columns.
+    :param int count: total number of records.
+    :return Union[gpd.GeoDataFrame, pd.DataFrame, None]: (Geo)DataFrame, or None if there are no batches.
+    """
+
+    arrays = dict()
+    template = None
+    position = 0
+
+    for batch in batches:
+        if template is None:
+            template = batch.iloc[:0]
+
+        if position + len(batch) > count:
+            raise ValueError(f"Number of records exceeds the expected total: {count}.")
+
+        # Copy batch values into column arrays.
+        # Note: arrays are upcast if a batch requires a wider data type (e.g. integers with nulls).
+        for column in batch.columns:
+            values = batch[column].values
+            values = values.data if isinstance(values, gpd.array.GeometryArray) else np.asarray(values)
+
+            if column not in arrays:
+                arrays[column] = np.empty(count, dtype=values.dtype)
+            elif not np.can_cast(values.dtype, arrays[column].dtype):
+                arrays[column] = arrays[column].astype(np.result_type(arrays[column].dtype, values.dtype))
+
+            arrays[column][position: position + len(batch)] = values
+
+        position += len(batch)
+        del batch
+
+    if template is None:
+        return None
+
+    # Compile result from column arrays, restoring geometry and extension data types.
+    df = pd.DataFrame(index=pd.RangeIndex(position))
+    for column in template.columns:
+        values, dtype = arrays.pop(column)[:position], template[column].dtype
+        if isinstance(dtype, gpd.array.GeometryDtype):
+            values = gpd.array.GeometryArray(values, crs=template[column].crs)
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            values = pd.array(values, dtype=dtype)
+        df[column] = values
+
+    if isinstance(template, gpd.GeoDataFrame):
+        df = gpd.GeoDataFrame(df, geometry=template.geometry.name, crs=template.crs)
+
+    return df
+
+
+def _read_wkb(query: str, con: Any, geom_col: str = "geom", crs: str = None, chunksize: int = None) -> \
+        Union[gpd.GeoDataFrame, Iterator[gpd.GeoDataFrame]]:
+    """
+    Reads a query with a WKB-encoded geometry column into a GeoDataFrame, decoding the geometry column at once via
+    pygeos. Mirrors the signature of geopandas.read_postgis.
+
+    \b
+    :param str query: SQL query returning the geometry column as WKB (e.g. ST_AsBinary).
+    :param Any con: database engine or connection.
+    :param str geom_col: geometry column, default=geom.
+    :param str crs: coordinate reference system of the geometry column, default=None.
+    :param int chunksize: number of records per batch. If provided, an iterator of GeoDataFrames is returned,
+        default=None.
+    :return Union[gpd.GeoDataFrame, Iterator[gpd.GeoDataFrame]]: GeoDataFrame or iterator of GeoDataFrames.
+    """
+
+    def _decode(df: pd.DataFrame) -> gpd.GeoDataFrame:
+        """
+        Decodes the WKB geometry column of a DataFrame.
+
+        \b
+        :param pd.DataFrame df: DataFrame with a WKB geometry column.
+        :return gpd.GeoDataFrame: GeoDataFrame.
+        """
+
+        # Note: bytea values are returned as memoryview objects which pygeos does not accept.
+        wkb = np.array([None if val is None else bytes(val) for val in df[geom_col]], dtype=object)
+
+        if gpd.options.use_pygeos:
+            geoms = gpd.array.GeometryArray(pygeos.from_wkb(wkb), crs=crs)
+        else:
+            geoms = gpd.array.from_wkb(wkb, crs=crs)
+
+        df[geom_col] = geoms
+
+        return gpd.GeoDataFrame(df, geometry=geom_col, crs=crs)
+
+    if chunksize:
+        return map(_decode, pd.read_sql(query, con=con, chunksize=chunksize))
+    else:
+        return _decode(pd.read_sql(query, con=con))
+
+
+def get_db_columns(engine: Engine, schema: str = "public") -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Retrieves the columns and column data types of all tables in a database schema with a single catalog query.
+
+    \b
+    :param sqlalchemy.engine.base.Engine engine: database engine.
+    :param str schema: database schema, default=public.
+    :return Dict[str, List[Tuple[str, str]]]: dictionary of table names and sequences of column names and data types
+        (e.g. geometry), ordered by column position.
+    """
+
+    query = text("""
+    SELECT table_name, column_name, udt_name FROM information_schema.columns 
+    WHERE table_schema = :schema AND table_name IN 
+      (SELECT table_name FROM information_schema.tables WHERE table_schema = :schema AND table_type = 'BASE TABLE') 
+    ORDER BY table_name, ordinal_position;
+    """)
+
+    columns = dict()
+    with engine.connect() as con:
+        for table, column, udt in con.execute(query, {"schema": schema}):
+            columns.setdefault(table, list()).append((column, udt))
+
+    return columns
+
+
+def _get_cache_path(engine: Engine, dataset: str, columns: Sequence[Tuple[str, str]], cache_dir: Union[Path, str],
+                    schema: str = "public") -> Path:
+    """
+    Configures the snapshot cache path of a dataset. The path is keyed by the schema, dataset, loaded columns, and a
+    change fingerprint of the dataset, such that any committed insert, update, or delete results in a new path. The
+    fingerprint is computed within a transaction, from the visible row versions of the dataset: the number of rows and
+    a checksum of the physical location (ctid) and inserting transaction (xmin) of each row, both of which change for
+    any inserted or updated row. This requires a scan of the dataset, but only reads system columns.
+
+    \b
+    :param sqlalchemy.engine.base.Engine engine: database engine.
+    :param str dataset: dataset name.
+    :param Sequence[Tuple[str, str]] columns: sequence of column names and data types to be loaded.
+    :param Union[Path, str] cache_dir: snapshot cache directory.
+    :param str schema: database schema, default=public.
+    :return Path: snapshot cache path, as {schema}.{dataset}.{column hash}.{fingerprint hash}.feather.
+    """
+
+    # Compute change fingerprint.
+    with engine.connect() as con:
+        fingerprint = con.execute(text(f"""
+        SELECT COUNT(*), COALESCE(SUM(hashtext(ctid::text || ':' || xmin::text)::bigint), 0) FROM {schema}.{dataset};
+        """)).one()
+
+    columns_hash = hashlib.sha1(repr(tuple(columns)).encode("utf8")).hexdigest()[:12]
+    fingerprint_hash = hashlib.sha1(repr(tuple(fingerprint)).encode("utf8")).hexdigest()[:12]
+
+    return Path(cache_dir).resolve() / f"{schema}.{dataset}.{columns_hash}.{fingerprint_hash}.feather"
+
+
+def _evict_cache(cache_dir: Union[Path, str], cache_size: int, keep: Iterable[Path] = ()) -> None:
+    """
+    Deletes the least recently used snapshots from the cache until the total cache size is within the size limit.
+    Retained snapshots (e.g. those just loaded or written) are never deleted, and count towards the size limit first.
+
+    \b
+    :param Union[Path, str] cache_dir: snapshot cache directory.
+    :param int cache_size: maximum total size of the snapshot cache, in bytes.
+    :param Iterable[Path] keep: snapshots to be retained, default=().
+    """
+
+    keep = {Path(path).resolve() for path in keep}
+    paths = sorted(Path(cache_dir).resolve().glob("*.feather"), key=lambda path: path.stat().st_mtime, reverse=True)
+
+    total = sum(path.stat().st_size for path in paths if path in keep)
+    for path in paths:
+        if path in keep:
+            continue
+        total += path.stat().st_size
+        if total > cache_size:
+            logger.info(f"Evicting dataset snapshot from cache: {path.name}.")
+            path.unlink(missing_ok=True)
+
+
+class _QueryRegistry:
+    """
+    Registry of the database connections of in-flight dataset queries, such that the queries can be cancelled
+    server-side from another thread (e.g. to fail fast once a concurrent dataset fails to load).
+    """
+
+    def __init__(self) -> None:
+        """Class initialization."""
+
+        self.connections = dict()
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def register(self, con: Connection, dataset: str) -> Iterator[Connection]:
+        """
+        Registers the connection of a dataset query for the duration of the context.
+
+        \b
+        :param sqlalchemy.engine.base.Connection con: database connection.
+        :param str dataset: dataset name.
+        :return Iterator[sqlalchemy.engine.base.Connection]: database connection.
+        """
+
+        with self.lock:
+            if self.cancelled.is_set():
+                raise ValueError(f"Query cancelled: {dataset}.")
+            self.connections[dataset] = con.connection
+
+        try:
+            yield con
+        finally:
+            with self.lock:
+                self.connections.pop(dataset, None)
+
+    def cancel(self) -> None:
+        """Cancels all in-flight queries and refuses subsequent queries."""
+
+        with self.lock:
+            self.cancelled.set()
+            for dataset, connection in self.connections.items():
+                try:
+                    connection.cancel()
+                except psycopg2.Error as e:
+                    logger.warning(f"Unable to cancel query: {dataset}. Exception details:\n{type(e).__name__}: {e}")
+
+
+def _load_db_dataset(engine: Engine, dataset: str, columns: Sequence[Tuple[str, str]], schema: str = "public",
+                     geom_col: str = "geom", chunksize: int = None, wkb: bool = False,
+                     cache_dir: Union[Path, str] = None, trace_parent: Dict[str, Any] = None,
+                     queries: _QueryRegistry = None) -> \
+        Tuple[Union[gpd.GeoDataFrame, pd.DataFrame], Union[Path, None]]:
     """
-    Loads all or a specified subset of datasets from a given database.
+    Loads a dataset from a given database, traced as a stage. See load_db_datasets for parameter details.
+
+    \b
+    :param sqlalchemy.engine.base.Engine engine: database engine.
+    :param str dataset: dataset name.
+    :param Sequence[Tuple[str, str]] columns: sequence of column names and data types to be loaded.
+    :param str schema: database schema, default=public.
+    :param str geom_col: geometry column for spatial datasets, default=geom.
+    :param int chunksize: number of records per batch, default=None.
+    :param bool wkb: fetch geometries as raw WKB and decode them via pygeos, default=False.
+    :param Union[Path, str] cache_dir: snapshot cache directory, default=None.
+    :param Dict[str, Any] trace_parent: parent stage record of the dataset stage (see Tracer.stage), default=None.
+    :param _QueryRegistry queries: registry of in-flight queries, such that the dataset query can be cancelled,
+        default=None.
+    :return Tuple[Union[gpd.GeoDataFrame, pd.DataFrame], Union[Path, None]]: (Geo)DataFrame and the path of its
+        snapshot, if cached.
+    """
+
+    logger.info(f"Loading dataset: {dataset}.")
+    with tracer.stage(dataset, parent=trace_parent) as stage:
+        start_time = time.time()
+        spatial = (geom_col, "geometry") in columns
+
+        # Load dataset from snapshot cache.
+        cache_path = None
+        if cache_dir:
+            cache_path = _get_cache_path(engine, dataset, columns, cache_dir=cache_dir, schema=schema)
+
+            if cache_path.exists():
+
+                # Mark snapshot as recently used.
+                os.utime(cache_path)
+
+                # Memory-map snapshot.
+                if spatial:
+                    df = gpd.read_feather(cache_path, memory_map=True)
+                else:
+                    df = feather.read_table(cache_path, memory_map=True).to_pandas()
+
+                delta = datetime.timedelta(seconds=time.time() - start_time)
+                logger.info(f"Successfully loaded {len(df)} records from {schema}.{dataset} from cache: "
+                            f"{cache_path.name}. Time elapsed: {delta}.")
+
+                stage["rows_out"] = len(df)
+                return df, cache_path
+
+        # Define query.
+        query = f"select {', '.join(column for column, _ in columns)} from {schema}.{dataset}"
+
+        # Configure dataset type and reader.
+        if spatial:
+
+            # Spatial - WKB.
+            if wkb:
+                with engine.connect() as con:
+                    srid = con.execute(text(f"select ST_SRID({geom_col}) from {schema}.{dataset} where {geom_col} is "
+                                            f"not null limit 1")).scalar()
+                query = f"select " \
+                        f"{', '.join(f'ST_AsBinary({k}) AS {k}' if k == geom_col else k for k, _ in columns)} " \
+                        f"from {schema}.{dataset}"
+                reader = partial(_read_wkb, crs=f"epsg:{srid}" if srid else None)
+
+            # Spatial.
+            else:
+                reader = gpd.read_postgis
+
+            kwargs = {"geom_col": geom_col}
+
+        # Tabular.
+        else:
+            reader, kwargs = pd.read_sql, dict()
+
+        # Load dataset.
+        queries = queries or _QueryRegistry()
+        if chunksize:
+
+            # Stream batches from a server-side cursor into preallocated columns.
+            # Note: the record count and batches are queried within a single snapshot.
+            with engine.connect().execution_options(stream_results=True, isolation_level="REPEATABLE READ") as con, \
+                    queries.register(con, dataset), con.begin():
+                count = con.execute(text(f"select count(*) from {schema}.{dataset}")).scalar()
+                df = _concat_batches(reader(query, con=con, chunksize=chunksize, **kwargs), count)
+
+            if df is None:
+                df = reader(f"{query} limit 0", con=engine, **kwargs)
+
+        else:
+            with engine.connect() as con, queries.register(con, dataset):
+                df = reader(query, con=con, **kwargs)
+
+        # Write snapshot to cache and remove outdated snapshots of the same dataset and columns.
+        if cache_path:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            for path in cache_path.parent.glob(f"{cache_path.name.rsplit('.', 2)[0]}.*.feather"):
+                path.unlink(missing_ok=True)
+
+            # Note: snapshots are uncompressed to allow for memory-mapping.
+            tmp_path = cache_path.with_suffix(".tmp")
+            df.to_feather(tmp_path, compression="uncompressed")
+            os.replace(tmp_path, cache_path)
+
+        # Log load metrics.
+        delta = datetime.timedelta(seconds=time.time() - start_time)
+        peak_rss = get_peak_rss()
+        peak_rss = "unavailable" if peak_rss is None else f"{peak_rss / 1024 ** 2:,.1f} MiB"
+        logger.info(f"Successfully loaded {len(df)} records from {schema}.{dataset}. Time elapsed: {delta}. Peak RSS: "
+                    f"{peak_rss}.")
+
+        stage["rows_out"] = len(df)
+        return df, cache_path
+
+
+def load_db_datasets(engine: Engine, subset: Sequence[str] = None, schema: str = "public", geom_col: str = "geom",
+                     columns: Dict[str, Sequence[str]] = None, chunksize: int = None, wkb: bool = False,
+                     return_coords: bool = False, workers: int = None, cache_dir: Union[Path, str] = None,
+                     cache_size: int = 10 * 1024 ** 3) -> \
+        Union[Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]],
+              Tuple[Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], Dict[str, Tuple[np.ndarray, np.ndarray]]]]:
+    """
+    Loads all or a specified subset of datasets from a given database. Datasets are loaded concurrently on worker
+    threads, each using its own pooled database connection. Loading stops at the first failed dataset: pending datasets
+    are cancelled and in-flight queries are cancelled server-side.
 
     \b
     :param sqlalchemy.engine.base.Engine engine: database engine.
     :param Sequence[str] subset: sequence of dataset names, default=None.
     :param str schema: database schema, default=public.
     :param str geom_col: geometry column for spatial datasets, default=geom.
-    :return Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]: dictionary of dataset names and (Geo)DataFrames.
+    :param Dict[str, Sequence[str]] columns: dictionary of dataset names and the columns to be loaded for each. Datasets
+        without an entry are loaded with all columns, default=None.
+    :param int chunksize: number of records per batch. If provided, records are streamed from a server-side cursor and
+        each batch is copied into columns preallocated for the record count, then released, default=None.
+    :param bool wkb: fetch geometries as raw WKB and decode each geometry column at once via pygeos, default=False.
+    :param bool return_coords: additionally return the flat coordinate and offset arrays of each spatial dataset (see
+        get_coordinate_arrays), default=False.
+    :param int workers: number of worker threads. Defaults to the connection pool size of the engine, default=None.
+    :param Union[Path, str] cache_dir: snapshot cache directory. If provided, each dataset is stored as an Arrow
+        (Feather) snapshot keyed by its schema, name, columns, and change fingerprint. Unchanged datasets are then
+        memory-mapped from their snapshot instead of being queried, default=None.
+    :param int cache_size: maximum total size of the snapshot cache, in bytes. Least recently used snapshots, other
+        than those of the loaded datasets, are evicted beyond this limit, default=10 GiB.
+    :return Union[Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], Tuple[Dict[str, Union[gpd.GeoDataFrame,
+        pd.DataFrame]], Dict[str, Tuple[np.ndarray, np.ndarray]]]]: dictionary of dataset names and (Geo)DataFrames
+        and, if return_coords=True, dictionary of spatial dataset names and coordinate and offset arrays.
     """
 
     logger.info("Loading datasets.")
 
     dfs = dict()
+    coords = dict()
+    snapshots = set()
+    columns = columns or dict()
 
     # Configure existing and requested datasets.
-    datasets = set(inspect(engine).get_table_names())
+    try:
+        db_columns = get_db_columns(engine, schema=schema)
+    except exc.SQLAlchemyError as e:
+        logger.exception(f"Unable to query database catalog. Exception details:\n{type(e).__name__}: {e}",
+                         exc_info=False)
+        sys.exit(1)
+
+    datasets = set(db_columns)
     if subset:
         datasets = datasets.intersection(subset)
 
@@ -134,34 +1100,169 @@ def load_db_datasets(engine: Engine, subset: Sequence[str] = None, schema: str =
             logger.exception(f"Invalid dataset(s) provided: {*invalid,}.".replace(",)", ")"))
             sys.exit(1)
 
-    # Load datasets.
+    # Configure dataset columns.
     for dataset in datasets:
+        if dataset in columns:
+            db_columns[dataset] = [(column, dict(db_columns[dataset]).get(column)) for column in columns[dataset]]
 
-        try:
+    # Load datasets concurrently, each traced as a stage of the calling stage.
+    workers = workers or getattr(engine.pool, "size", lambda: 1)()
+    executor = ThreadPoolExecutor(max_workers=max(min(workers, len(datasets)), 1))
+    queries = _QueryRegistry()
+    futures = {executor.submit(_load_db_dataset, engine, dataset, db_columns[dataset], schema=schema,
+                               geom_col=geom_col, chunksize=chunksize, wkb=wkb, cache_dir=cache_dir,
+                               trace_parent=tracer.current, queries=queries): dataset
+               for dataset in datasets}
 
-            logger.info(f"Loading dataset: {dataset}.")
+    # Wait for all datasets or the first failure.
+    done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+    for future in done:
 
-            # Define query.
-            query = f"select * from {schema}.{dataset}"
+        dataset = futures[future]
 
-            # Spatial.
-            if geom_col in engine.execute(f"{query} limit 0").keys():
-                dfs[dataset] = gpd.read_postgis(query, con=engine).copy(deep=True)
+        try:
+            dfs[dataset], snapshot = future.result()
+            if snapshot:
+                snapshots.add(snapshot)
 
-            # Tabular.
-            else:
-                dfs[dataset] = pd.read_sql(query, con=engine).copy(deep=True)
+        except (exc.SQLAlchemyError, pygeos.GEOSException, OSError, TypeError, ValueError) as e:
 
-            logger.info(f"Successfully loaded {len(dfs[dataset])} records from {schema}.{dataset}.")
+            # Cancel pending datasets and in-flight queries, then wait for the remaining workers to exit.
+            # Note: a worker only exits once it fails on its cancelled query. Records already received are still
+            # decoded client-side, up to one batch if chunksize is provided.
+            executor.shutdown(wait=False, cancel_futures=True)
+            queries.cancel()
+            executor.shutdown(wait=True)
 
-        except (exc.SQLAlchemyError, TypeError, ValueError) as e:
             logger.exception(f"Failed to load dataset: {schema}.{dataset}. Exception details:\n{type(e).__name__}: {e}",
                              exc_info=False)
             sys.exit(1)
 
+    executor.shutdown()
+
+    # Evict least recently used snapshots from cache, other than those of the loaded datasets.
+    if cache_dir:
+        _evict_cache(cache_dir, cache_size, keep=snapshots)
+
+    # Extract coordinate arrays.
+    if return_coords:
+        for dataset, df in dfs.items():
+            if isinstance(df, gpd.GeoDataFrame):
+                coords[dataset] = get_coordinate_arrays(df[geom_col])
+
+        return dfs, coords
+
     return dfs
 
 
+def stream_db_dataset(engine: Engine, dataset: str, columns: Sequence[str], schema: str = "public",
+                      chunksize: int = 100000) -> Iterator[pd.DataFrame]:
+    """
+    Streams the columns of a tabular dataset from a given database in fixed-size batches from a server-side cursor,
+    such that only one batch is held in memory at a time.
+
+    \b
+    :param sqlalchemy.engine.base.Engine engine: database engine.
+    :param str dataset: dataset name.
+    :param Sequence[str] columns: columns to be loaded.
+    :param str schema: database schema, default=public.
+    :param int chunksize: number of records per batch, default=100000.
+    :return Iterator[pd.DataFrame]: iterator of DataFrames.
+    """
+
+    query = f"select {', '.join(columns)} from {schema}.{dataset}"
+
+    with engine.connect().execution_options(stream_results=True) as con:
+        yield from pd.read_sql(query, con=con, chunksize=chunksize)
+
+
+def load_file_dataset(path: Union[Path, str], layer: str = None, geom_col: str = "geom") -> gpd.GeoDataFrame:
+    """
+    Loads a spatial dataset from a file, one of: GeoPackage (.gpkg), FlatGeobuf (.fgb), GeoParquet (.parquet).
+
+    \b
+    :param Union[Path, str] path: path to the file.
+    :param str layer: layer name, only used for GeoPackages. Defaults to the first layer if the GeoPackage does not
+        contain the layer, default=None.
+    :param str geom_col: name of the geometry column of the returned GeoDataFrame, default=geom.
+    :return gpd.GeoDataFrame: GeoDataFrame.
+    """
+
+    path = Path(path).resolve()
+
+    logger.info(f"Loading dataset: {path}" + (f" (layer={layer})." if layer and path.suffix == ".gpkg" else "."))
+
+    try:
+
+        with tracer.stage(layer or path.stem) as stage:
+            if path.suffix == ".parquet":
+                df = gpd.read_parquet(path)
+            elif path.suffix in {".fgb", ".gpkg"}:
+                if path.suffix == ".gpkg" and layer not in fiona.listlayers(path):
+                    layer = None
+                df = gpd.read_file(path, layer=layer if path.suffix == ".gpkg" else None)
+            else:
+                logger.exception(f"Invalid file format: {path}. Expected one of: .gpkg, .fgb, .parquet.")
+                sys.exit(1)
+            stage["rows_out"] = len(df)
+
+    except (fiona.errors.FionaError, OSError, ValueError) as e:
+        logger.exception(f"Unable to load dataset: {path}. Exception details:\n{type(e).__name__}: {e}",
+                         exc_info=False)
+        sys.exit(1)
+
+    # Standardize geometry column name.
+    if df.geometry.name != geom_col:
+        df = df.rename_geometry(geom_col)
+
+    return df
+
+
+def write_file_dataset(df: gpd.GeoDataFrame, path: Union[Path, str], layer: str) -> Path:
+    """
+    Writes a spatial dataset to a file, one of: GeoPackage (.gpkg), FlatGeobuf (.fgb), GeoParquet (.parquet). Datasets
+    are written as a layer of a GeoPackage, replacing any existing layer, or otherwise as a separate file named after
+    the layer: <stem>.<layer><suffix>. UUIDs are written as strings.
+
+    \b
+    :param gpd.GeoDataFrame df: GeoDataFrame.
+    :param Union[Path, str] path: path to the file.
+    :param str layer: layer name.
+    :return Path: path of the written file.
+    """
+
+    path = Path(path).resolve()
+    if path.suffix != ".gpkg":
+        path = path.with_name(f"{path.stem}.{layer}{path.suffix}")
+
+    logger.info(f"Writing dataset: {path}" + (f" (layer={layer})." if path.suffix == ".gpkg" else "."))
+
+    # Convert UUIDs to strings.
+    df = df.copy(deep=False)
+    for col in df.columns.difference([df.geometry.name]):
+        if df[col].dtype == object:
+            df[col] = df[col].map(lambda val: str(val) if isinstance(val, uuid.UUID) else val)
+
+    try:
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".parquet":
+            df.to_parquet(path, index=False)
+        elif path.suffix in {".fgb", ".gpkg"}:
+            df.to_file(path, layer=layer if path.suffix == ".gpkg" else None,
+                       driver="GPKG" if path.suffix == ".gpkg" else "FlatGeobuf", index=False)
+        else:
+            logger.exception(f"Invalid file format: {path}. Expected one of: .gpkg, .fgb, .parquet.")
+            sys.exit(1)
+
+    except (fiona.errors.FionaError, OSError, ValueError) as e:
+        logger.exception(f"Unable to write dataset: {path}. Exception details:\n{type(e).__name__}: {e}",
+                         exc_info=False)
+        sys.exit(1)
+
+    return path
+
+
 def load_yaml(path: Union[Path, str]) -> Any:
     """
     Loads the content of a YAML file as a Python object.
@@ -0,0 +1,170 @@
+import importlib
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+# Set logger.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler(sys.stdout)
+handler.setLevel(logging.INFO)
+handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
+logger.addHandler(handler)
+
+# Define the placeholder of the geometry column in dataset requirements, resolved by the data model validation.
+GEOMETRY = "{geom_col}"
+
+
+class Artifact:
+    """Defines a shared artifact which is built once and provided to all validations which require it."""
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any], Dict[str, Any]], Any],
+                 datasets: Dict[str, Sequence[str]] = None, artifacts: Sequence[str] = (),
+                 streams: Dict[str, Sequence[str]] = None) -> None:
+        """
+        Class initialization.
+
+        \b
+        :param str name: artifact name.
+        :param Callable[[Dict[str, Any], Dict[str, Any]], Any] func: function which builds the artifact from the
+            required datasets and artifacts, each provided as a dictionary keyed by name.
+        :param Dict[str, Sequence[str]] datasets: dictionary of required dataset names and their required columns,
+            default=None.
+        :param Sequence[str] artifacts: names of required artifacts, default=().
+        :param Dict[str, Sequence[str]] streams: dictionary of required tabular dataset names and their required
+            columns, which are streamed in chunks rather than loaded. Each is provided with the datasets as a callable
+            returning an iterator of DataFrames, default=None.
+        """
+
+        self.name = name
+        self.func = func
+        self.datasets = dict(datasets or dict())
+        self.artifacts = tuple(artifacts)
+        self.streams = dict(streams or dict())
+
+
+class Validation(Artifact):
+    """
+    Defines a validation. Validations return a dictionary of validation codes, each mapping the names of the validated
+    datasets to the set of identifiers of their invalid records. All codes checked by the validation must be returned,
+    including those without errors.
+    """
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any], Dict[str, Any]], Dict[int, Dict[str, set]]],
+                 datasets: Dict[str, Sequence[str]] = None, artifacts: Sequence[str] = (),
+                 streams: Dict[str, Sequence[str]] = None, after: Sequence[str] = ()) -> None:
+        """
+        Class initialization.
+
+        \b
+        :param str name: validation name.
+        :param Callable[[Dict[str, Any], Dict[str, Any]], Dict[int, Dict[str, set]]] func: function which applies the
+            validation to the required datasets and artifacts, each provided as a dictionary keyed by name.
+        :param Dict[str, Sequence[str]] datasets: dictionary of required dataset names and their required columns,
+            default=None.
+        :param Sequence[str] artifacts: names of required artifacts, default=().
+        :param Dict[str, Sequence[str]] streams: dictionary of required tabular dataset names and their required
+            columns, which are streamed in chunks rather than loaded, default=None.
+        :param Sequence[str] after: names of validations which must complete before this validation, default=().
+        """
+
+        super().__init__(name, func, datasets=datasets, artifacts=artifacts, streams=streams)
+        self.after = tuple(after)
+
+
+# Define registries, keyed by data model and name.
+artifacts: Dict[str, Dict[str, Artifact]] = dict()
+validations: Dict[str, Dict[str, Validation]] = dict()
+
+
+def register(model: str, plugin: Artifact) -> Artifact:
+    """
+    Registers an artifact or validation for a data model. Names must be unique per data model.
+
+    \b
+    :param str model: data model name.
+    :param Artifact plugin: artifact or validation.
+    :return Artifact: artifact or validation.
+    """
+
+    registry = validations if isinstance(plugin, Validation) else artifacts
+    plugins = registry.setdefault(model, dict())
+
+    if plugin.name in plugins and plugins[plugin.name].func is not plugin.func:
+        logger.exception(f"Duplicate {type(plugin).__name__.lower()} name for data model {model}: {plugin.name}.")
+        sys.exit(1)
+
+    plugins[plugin.name] = plugin
+    return plugin
+
+
+def artifact(model: str, name: str, datasets: Dict[str, Sequence[str]] = None, artifacts: Sequence[str] = (),
+             streams: Dict[str, Sequence[str]] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator which registers a function as an artifact of a data model. See Artifact for parameter details.
+
+    \b
+    :param str model: data model name.
+    :param str name: artifact name.
+    :param Dict[str, Sequence[str]] datasets: dictionary of required dataset names and columns, default=None.
+    :param Sequence[str] artifacts: names of required artifacts, default=().
+    :param Dict[str, Sequence[str]] streams: dictionary of streamed dataset names and columns, default=None.
+    :return Callable[[Callable], Callable]: decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        register(model, Artifact(name, func, datasets=datasets, artifacts=artifacts, streams=streams))
+        return func
+
+    return decorator
+
+
+def validation(model: str, name: str, datasets: Dict[str, Sequence[str]] = None, artifacts: Sequence[str] = (),
+               streams: Dict[str, Sequence[str]] = None, after: Sequence[str] = ()) -> Callable[[Callable], Callable]:
+    """
+    Decorator which registers a function as a validation of a data model. See Validation for parameter details.
+
+    \b
+    :param str model: data model name.
+    :param str name: validation name.
+    :param Dict[str, Sequence[str]] datasets: dictionary of required dataset names and columns, default=None.
+    :param Sequence[str] artifacts: names of required artifacts, default=().
+    :param Dict[str, Sequence[str]] streams: dictionary of streamed dataset names and columns, default=None.
+    :param Sequence[str] after: names of validations which must complete before this validation, default=().
+    :return Callable[[Callable], Callable]: decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        register(model, Validation(name, func, datasets=datasets, artifacts=artifacts, streams=streams, after=after))
+        return func
+
+    return decorator
+
+
+def discover(model_dir: Path) -> List[str]:
+    """
+    Imports all validation scripts (validate_*.py) of a data model directory, registering their artifacts and
+    validations.
+
+    \b
+    :param Path model_dir: data model directory.
+    :return List[str]: names of the imported modules.
+    """
+
+    if str(model_dir) not in sys.path:
+        sys.path.insert(1, str(model_dir))
+
+    modules = list()
+    for path in sorted(model_dir.glob("validate_*.py")):
+
+        try:
+            importlib.import_module(path.stem)
+            modules.append(path.stem)
+
+        except ImportError as e:
+            logger.exception(f"Unable to import validation script: {path}. Exception details:\n{type(e).__name__}: "
+                             f"{e}", exc_info=False)
+            sys.exit(1)
+
+    return modules
@@ -0,0 +1,657 @@
+import geopandas as gpd
+import helpers
+import numpy as np
+import pygeos
+from typing import Tuple, Union
+
+
+class CoordinateStore:
+    """
+    Ragged, array-backed store of LineString coordinates. All coordinates are held in one contiguous float64 array of
+    shape (N, 2), such that the coordinates of arc i are: coords[offsets[i]: offsets[i + 1]].
+
+    Memory usage, measured with tracemalloc on a synthetic network of 1,000,000 arcs with 2 - 5 vertices each
+    (3,501,283 vertices):
+
+    * Previous tuple columns (pts_tuple, pt_start, pt_end, pts_ordered_pairs): 685 MiB, excluding the object column
+      pointers.
+    * CoordinateStore (coords, offsets, start, end): 69 MiB.
+    """
+
+    def __init__(self, coords: np.ndarray, offsets: np.ndarray) -> None:
+        """
+        Class initialization.
+
+        \b
+        :param np.ndarray coords: float64 array of shape (N, 2) of xy coordinates.
+        :param np.ndarray offsets: int64 array of shape (n + 1,) of per-arc coordinate offsets.
+        """
+
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+        # Generate positional indexes of the start and end vertex (node) of each arc.
+        self.start = self.offsets[:-1]
+        self.end = self.offsets[1:] - 1
+
+    def __getitem__(self, idx: int) -> np.ndarray:
+        """
+        Returns the coordinates of an arc as a view of the coordinate array.
+
+        \b
+        :param int idx: positional index of the arc.
+        :return np.ndarray: float64 array of shape (k, 2) of xy coordinates.
+        """
+
+        return self.coords[self.offsets[idx]: self.offsets[idx + 1]]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of arcs.
+
+        \b
+        :return int: number of arcs.
+        """
+
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_geometry(cls, geoms: Union[gpd.GeoSeries, np.ndarray]) -> "CoordinateStore":
+        """
+        Creates a CoordinateStore from a sequence of geometries.
+
+        \b
+        :param Union[gpd.GeoSeries, np.ndarray] geoms: GeoSeries or array of pygeos geometries.
+        :return CoordinateStore: CoordinateStore.
+        """
+
+        return cls(*helpers.get_coordinate_arrays(geoms))
+
+    @property
+    def counts(self) -> np.ndarray:
+        """
+        Returns the number of vertices of each arc.
+
+        \b
+        :return np.ndarray: int64 array of shape (n,) of vertex counts.
+        """
+
+        return np.diff(self.offsets)
+
+    @property
+    def interior(self) -> np.ndarray:
+        """
+        Returns a mask of interior vertices (non-nodes), i.e. vertices which are neither the start nor end of an arc.
+
+        \b
+        :return np.ndarray: boolean array of shape (N,).
+        """
+
+        mask = np.ones(len(self.coords), dtype=bool)
+        mask[self.start] = False
+        mask[self.end] = False
+
+        return mask
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the memory usage of the store.
+
+        \b
+        :return int: memory usage, in bytes.
+        """
+
+        return self.coords.nbytes + self.offsets.nbytes
+
+    def arc_index(self, idxs: np.ndarray) -> np.ndarray:
+        """
+        Returns the positional indexes of the arcs to which the given coordinates belong.
+
+        \b
+        :param np.ndarray idxs: positional indexes of coordinates.
+        :return np.ndarray: positional indexes of arcs.
+        """
+
+        return np.searchsorted(self.offsets, idxs, side="right") - 1
+
+    def keys(self, idxs: np.ndarray = None) -> np.ndarray:
+        """
+        Returns the coordinates as hashable and sortable scalar keys (a complex128 view of each xy pair), such that
+        exact coordinate equality can be tested with vectorized set operations (e.g. np.isin, np.unique).
+
+        \b
+        :param np.ndarray idxs: positional indexes of coordinates, default=None (all).
+        :return np.ndarray: complex128 array of coordinate keys.
+        """
+
+        keys = self.coords.view(np.complex128).ravel()
+
+        return keys if idxs is None else keys[idxs]
+
+    def segment_lengths(self) -> np.ndarray:
+        """
+        Returns the distances between adjacent vertices. Index i represents the distance between coordinates i and
+        i + 1. Distances between the end vertex of an arc and the start vertex of the next arc are NaN.
+
+        \b
+        :return np.ndarray: float64 array of shape (N - 1,) of distances.
+        """
+
+        lengths = np.hypot(*np.diff(self.coords, axis=0).T)
+        lengths[self.end[:-1]] = np.nan
+
+        return lengths
+
+
+def gather(offsets: np.ndarray, values: np.ndarray, idxs: np.ndarray) -> np.ndarray:
+    """
+    Returns the concatenated values of multiple rows of a compressed sparse row (CSR) structure, such that the values of
+    row i are: values[offsets[i]: offsets[i + 1]].
+
+    \b
+    :param np.ndarray offsets: int64 array of shape (rows + 1,) of row offsets.
+    :param np.ndarray values: array of values.
+    :param np.ndarray idxs: positional indexes of rows.
+    :return np.ndarray: array of values.
+    """
+
+    starts = offsets[idxs]
+    counts = offsets[idxs + 1] - starts
+    positions = np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+
+    return values[positions]
+
+
+def _cycles(nxt: np.ndarray) -> np.ndarray:
+    """
+    Labels the cycles of a permutation with the smallest member of each cycle, using pointer doubling.
+
+    \b
+    :param np.ndarray nxt: int64 array where index i represents the successor of member i.
+    :return np.ndarray: int64 array of cycle labels.
+    """
+
+    labels = np.arange(len(nxt))
+    jump = nxt.copy()
+
+    for _ in range(int(np.ceil(np.log2(max(len(nxt), 2)))) + 1):
+        labels = np.minimum(labels, labels[jump])
+        jump = jump[jump]
+
+    return labels
+
+
+def _ranks(nxt: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """
+    Returns the position of each member of a permutation within its cycle, counted from the cycle label, using pointer
+    doubling.
+
+    \b
+    :param np.ndarray nxt: int64 array where index i represents the successor of member i.
+    :param np.ndarray labels: int64 array of cycle labels (see _cycles).
+    :return np.ndarray: int64 array of cycle positions.
+    """
+
+    members = np.arange(len(nxt))
+    heads = labels == members
+
+    # Configure predecessors, stopping at the cycle label.
+    jump = np.empty_like(nxt)
+    jump[nxt] = members
+    jump[heads] = members[heads]
+    ranks = (~heads).astype(np.int64)
+
+    for _ in range(int(np.ceil(np.log2(max(len(nxt), 2)))) + 1):
+        ranks = ranks + ranks[jump]
+        jump = jump[jump]
+
+    return ranks
+
+
+class NodeEdgeGraph:
+    """
+    Node-edge topology of an arc network. Nodes are assigned integer identifiers from the exact (or quantized) keys of
+    the arc endpoint coordinates, and the arcs incident to each node are stored as compressed sparse row (CSR) arrays,
+    such that the arcs of node i are: node_arcs[node_offsets[i]: node_offsets[i + 1]]. Interior vertices (non-nodes)
+    which coincide with a node are recorded as hits against that node.
+    """
+
+    def __init__(self, store: CoordinateStore, precision: float = None) -> None:
+        """
+        Class initialization.
+
+        \b
+        :param CoordinateStore store: coordinate store of the arcs.
+        :param float precision: grid size to which coordinates are quantized before nodes are identified. If not
+            provided, nodes are identified by exact coordinate equality, default=None.
+        """
+
+        self.store = store
+        self.precision = precision
+
+        # Generate coordinate keys.
+        if self.precision:
+            coords = np.ascontiguousarray(np.round(self.store.coords / self.precision) * self.precision)
+            keys = coords.view(np.complex128).ravel()
+        else:
+            keys = self.store.keys()
+
+        # Assign node identifiers to the start and end vertex of each arc.
+        n = len(self.store)
+        self.node_keys, nodes = np.unique(np.concatenate([keys[self.store.start], keys[self.store.end]]),
+                                          return_inverse=True)
+        self.arc_start = nodes[:n]
+        self.arc_end = nodes[n:]
+
+        # Generate CSR adjacency of arcs per node. Closed arcs are incident to their node twice.
+        order = np.argsort(nodes, kind="stable")
+        self.node_arcs = order % n
+        self.node_offsets = np.searchsorted(nodes[order], np.arange(len(self.node_keys) + 1))
+
+        # Compile interior vertices which coincide with a node.
+        interior = np.flatnonzero(self.store.interior)
+        idxs = np.searchsorted(self.node_keys, keys[interior])
+        idxs[idxs == len(self.node_keys)] = 0
+        flag = self.node_keys[idxs] == keys[interior]
+        self.hit_vertices = interior[flag]
+        self.hit_nodes = idxs[flag]
+        self.hit_arcs = self.store.arc_index(self.hit_vertices)
+
+        # Generate half-edges. Arc i is split into a forward (2i) and reverse (2i + 1) half-edge, each with an origin
+        # node, an outgoing angle (direction of its first segment), and a signed area (shoelace) contribution.
+        coords = self.store.coords
+        self.halfedge_origin = np.column_stack([self.arc_start, self.arc_end]).ravel()
+        vectors = np.stack([coords[self.store.start + 1] - coords[self.store.start],
+                            coords[self.store.end - 1] - coords[self.store.end]], axis=1).reshape(-1, 2)
+        self.halfedge_angle = np.arctan2(vectors[:, 1], vectors[:, 0])
+
+        cross = coords[:-1, 0] * coords[1:, 1] - coords[1:, 0] * coords[:-1, 1]
+        cross[self.store.end[:-1]] = 0
+        area = np.bincount(self.store.arc_index(np.arange(len(cross))), weights=cross, minlength=n) / 2
+        self.halfedge_area = np.column_stack([area, -area]).ravel()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of nodes.
+
+        \b
+        :return int: number of nodes.
+        """
+
+        return len(self.node_keys)
+
+    def arcs(self, node: int) -> np.ndarray:
+        """
+        Returns the arcs incident to a node.
+
+        \b
+        :param int node: node identifier.
+        :return np.ndarray: positional indexes of arcs.
+        """
+
+        return self.node_arcs[self.node_offsets[node]: self.node_offsets[node + 1]]
+
+    @property
+    def degree(self) -> np.ndarray:
+        """
+        Returns the number of arc endpoints incident to each node.
+
+        \b
+        :return np.ndarray: int64 array of shape (nodes,) of node degrees.
+        """
+
+        return np.diff(self.node_offsets)
+
+    @property
+    def hits(self) -> np.ndarray:
+        """
+        Returns the number of interior vertices (non-nodes) which coincide with each node.
+
+        \b
+        :return np.ndarray: int64 array of shape (nodes,) of interior vertex hits.
+        """
+
+        return np.bincount(self.hit_nodes, minlength=len(self))
+
+    def node_flag_to_arcs(self, flag: np.ndarray) -> np.ndarray:
+        """
+        Returns a mask of arcs with a start or end node matching the given node mask.
+
+        \b
+        :param np.ndarray flag: boolean array of shape (nodes,).
+        :return np.ndarray: boolean array of shape (arcs,).
+        """
+
+        return flag[self.arc_start] | flag[self.arc_end]
+
+    @property
+    def overlaps(self) -> bool:
+        """
+        Returns whether any two half-edges leave the same node in the same direction (i.e. arcs overlap at a node).
+
+        \b
+        :return bool: flag.
+        """
+
+        keys = np.unique(np.column_stack([self.halfedge_origin, self.halfedge_angle]), axis=0)
+
+        return len(keys) != len(self.halfedge_origin)
+
+    def _link(self, halfedges: np.ndarray) -> np.ndarray:
+        """
+        Links each half-edge to the next half-edge along the face on its left, being the half-edge which follows its
+        twin clockwise around their shared node. Half-edges which are not provided are linked to themselves.
+
+        \b
+        :param np.ndarray halfedges: half-edges to link. Must include both half-edges of each arc.
+        :return np.ndarray: int64 array of shape (2 * arcs,) of next half-edges.
+        """
+
+        nxt = np.arange(2 * len(self.store))
+        if not len(halfedges):
+            return nxt
+
+        # Sort outgoing half-edges counter-clockwise around each node.
+        order = halfedges[np.lexsort((self.halfedge_angle[halfedges], self.halfedge_origin[halfedges]))]
+        origin = self.halfedge_origin[order]
+        first = np.searchsorted(origin, origin, side="left")
+        last = np.searchsorted(origin, origin, side="right") - 1
+        positions = np.empty(len(nxt), dtype=np.int64)
+        positions[order] = np.arange(len(order))
+
+        # Link each half-edge to the predecessor of its twin, wrapping around each node.
+        idxs = positions[halfedges ^ 1]
+        nxt[halfedges] = order[np.where(idxs > first[idxs], idxs - 1, last[idxs])]
+
+        return nxt
+
+    def _vertices(self, halfedges: np.ndarray) -> np.ndarray:
+        """
+        Returns the positional indexes of the vertices along a sequence of half-edges, excluding the last vertex of
+        each half-edge.
+
+        \b
+        :param np.ndarray halfedges: half-edges.
+        :return np.ndarray: positional indexes of coordinates.
+        """
+
+        arcs = halfedges >> 1
+        forward = (halfedges & 1) == 0
+        counts = self.store.counts[arcs] - 1
+        steps = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        return np.repeat(np.where(forward, self.store.start[arcs], self.store.end[arcs]), counts) + \
+            np.repeat(np.where(forward, 1, -1), counts) * steps
+
+    def _locate(self, shells: np.ndarray, areas: np.ndarray, pts: np.ndarray) -> np.ndarray:
+        """
+        Returns the smallest shell strictly containing each point.
+
+        \b
+        :param np.ndarray shells: pygeos polygons (shells only).
+        :param np.ndarray areas: areas of the shells.
+        :param np.ndarray pts: float64 array of shape (k, 2) of xy coordinates.
+        :return np.ndarray: positional indexes of shells, -1 where no shell contains the point.
+        """
+
+        faces = np.full(len(pts), -1, dtype=np.int64)
+        if len(pts) and len(shells):
+            idxs, idxs_shell = pygeos.STRtree(shells).query_bulk(pygeos.points(pts), predicate="within")
+            order = np.lexsort((areas[idxs_shell], idxs))
+            idxs, first = np.unique(idxs[order], return_index=True)
+            faces[idxs] = idxs_shell[order][first]
+
+        return faces
+
+    def cycles(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the face cycle of each half-edge and the signed area of each face cycle, without generating geometries.
+        Counter-clockwise cycles (positive area) bound a face, while clockwise cycles (negative area) form the outer
+        boundary of a connected component. Dangles and bridges are included in the cycles of their face.
+
+        \b
+        :return Tuple[np.ndarray, np.ndarray]: int64 array of shape (2 * arcs,) of face cycle labels (the smallest
+            half-edge of each cycle) and float64 array of shape (2 * arcs,) of signed areas, indexed by cycle label.
+        """
+
+        labels = _cycles(self._link(np.arange(2 * len(self.store))))
+        areas = np.bincount(labels, weights=self.halfedge_area, minlength=len(labels))
+
+        return labels, areas
+
+    def polygonize(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the faces (polygons) formed by the arcs and the left and right face of each arc, by traversing the
+        half-edges of the graph. Counter-clockwise face cycles form polygon shells, while clockwise face cycles (outer
+        boundaries of connected components) form holes of the smallest shell containing them. Arcs with the same face
+        on both sides (dangles and bridges) are excluded from the polygon rings. Face cycles which revisit a node are
+        split into minimal rings at that node, as per shapely.ops.polygonize.
+
+        Requires a noded network (i.e. simple arcs which only intersect at nodes and do not overlap).
+
+        \b
+        :return Tuple[np.ndarray, np.ndarray]: array of pygeos polygons and int64 array of shape (arcs, 2) of the
+            positional indexes of the left and right face of each arc, in that order. Index -1 represents the unbounded
+            face.
+        """
+
+        n = len(self.store)
+        coords = self.store.coords
+        halfedges = np.arange(2 * n)
+
+        # Flag arcs with the same face cycle on both sides (dangles and bridges).
+        cycles_all = _cycles(self._link(halfedges))
+        flag = np.repeat(cycles_all[0::2] != cycles_all[1::2], 2)
+        active = halfedges[flag]
+
+        # Traverse face cycles of the remaining arcs, ordering half-edges along each cycle.
+        nxt = self._link(active)
+        cycles = _cycles(nxt)
+        ranks = _ranks(nxt, cycles)
+        active = active[np.lexsort((ranks[active], cycles[active]))]
+        _, first, cycle_idxs = np.unique(cycles[active], return_index=True, return_inverse=True)
+        cycle_areas = np.bincount(cycle_idxs, weights=self.halfedge_area[active])
+        shell_cycles = cycle_areas > 0
+
+        # Split cycles which revisit a node into minimal rings.
+        ring_idxs = cycle_idxs.copy()
+        keys = cycle_idxs * len(self) + self.halfedge_origin[active]
+        keys_unique, counts = np.unique(keys, return_counts=True)
+        pinched = np.unique(keys_unique[counts > 1] // len(self))
+        ring_cycles = list(range(len(first)))
+        for cycle in pinched:
+            idxs = np.flatnonzero(cycle_idxs == cycle)
+            stack, seen = list(), dict()
+            for idx in idxs:
+                node = self.halfedge_origin[active[idx]]
+                if node in seen:
+                    ring = stack[seen[node]:]
+                    del stack[seen[node]:]
+                    for idx_ring in ring:
+                        seen.pop(self.halfedge_origin[active[idx_ring]])
+                    ring_idxs[ring] = len(ring_cycles)
+                    ring_cycles.append(cycle)
+                seen[node] = len(stack)
+                stack.append(idx)
+        ring_cycles = np.array(ring_cycles, dtype=np.int64)
+
+        # Order half-edges by ring and generate ring geometries.
+        order = np.argsort(ring_idxs, kind="stable")
+        active, ring_idxs = active[order], ring_idxs[order]
+        vertices = self._vertices(active)
+        rings = pygeos.linearrings(coords[vertices], indices=np.repeat(ring_idxs, self.store.counts[active >> 1] - 1))
+        ring_areas = np.bincount(ring_idxs, weights=self.halfedge_area[active], minlength=len(ring_cycles))
+
+        # Assign faces to counter-clockwise cycles, with the largest ring of each cycle as the shell.
+        cycle_faces = np.full(len(first), -1, dtype=np.int64)
+        cycle_faces[shell_cycles] = np.arange(shell_cycles.sum())
+        ring_order = np.lexsort((-ring_areas, ring_cycles))
+        cycle_ids, ring_first = np.unique(ring_cycles[ring_order], return_index=True)
+        shells = ring_order[ring_first][shell_cycles[cycle_ids]]
+        shell_areas = ring_areas[shells]
+        shell_polys = pygeos.polygons(rings[shells])
+
+        # Assign faces to clockwise cycles, being the smallest shell containing their first vertex.
+        hole_cycles = np.flatnonzero(~shell_cycles)
+        starts = active[np.searchsorted(ring_idxs, hole_cycles)]
+        pts = coords[np.where((starts & 1) == 0, self.store.start[starts >> 1], self.store.end[starts >> 1])]
+        cycle_faces[hole_cycles] = self._locate(shell_polys, shell_areas, pts)
+
+        # Compile polygons from shells and holes.
+        ring_faces = cycle_faces[ring_cycles]
+        flag_shell = np.zeros(len(ring_cycles), dtype=bool)
+        flag_shell[shells] = True
+        idxs = np.flatnonzero(ring_faces >= 0)
+        idxs = idxs[np.lexsort((~flag_shell[idxs], ring_faces[idxs]))]
+        polys = pygeos.polygons(rings[idxs], indices=ring_faces[idxs]) if len(idxs) else np.empty(0, dtype=object)
+
+        # Assign faces to half-edges.
+        faces = np.full(2 * n, -1, dtype=np.int64)
+        faces[active] = cycle_faces[ring_cycles[ring_idxs]]
+
+        # Assign faces to half-edges of dangles and bridges from the remaining half-edges of their original cycle. If
+        # none exist (tree components), use the smallest shell containing their start vertex.
+        removed = halfedges[~flag]
+        if len(removed):
+            lookup = np.full(2 * n, -2, dtype=np.int64)
+            lookup[cycles_all[active]] = faces[active]
+            faces[removed] = lookup[cycles_all[removed]]
+            idxs = removed[faces[removed] == -2]
+            faces[idxs] = self._locate(shell_polys, shell_areas, coords[self.store.start[idxs >> 1]])
+
+        return polys, faces.reshape(n, 2)
+
+
+def dissolve(polys: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """
+    Dissolves the polygons of a polygonal coverage by group. Polygons are normalized (shells clockwise, holes
+    counter-clockwise) such that each ring segment has the polygon interior on its right. Segments traversed in both
+    directions within a group (shared edges between polygons of the same group) are dropped, and the remaining
+    segments are linked into rings, turning counter-clockwise at nodes shared by multiple rings. Holes are assigned to
+    the smallest shell of the same group which covers them.
+
+    Requires a clean coverage (i.e. polygons do not overlap and share vertices along their shared edges). Groups which
+    do not form consistent rings, or which form invalid polygons or polygons with a different area than their input
+    polygons, are dissolved by unary union instead.
+
+    \b
+    :param np.ndarray polys: pygeos polygons.
+    :param np.ndarray codes: int64 array of the group code of each polygon, from 0 to the number of groups - 1.
+    :return np.ndarray: array of pygeos (multi)polygons, being the dissolved geometry of each group code.
+    """
+
+    polys = pygeos.normalize(np.asarray(polys, dtype=object))
+    codes = np.asarray(codes, dtype=np.int64)
+    n_groups = codes.max() + 1 if len(codes) else 0
+    invalid = np.zeros(n_groups, dtype=bool)
+    if not len(polys):
+        return np.empty(0, dtype=object)
+
+    # Compile rings of each polygon.
+    idxs = np.arange(len(polys))
+    counts = pygeos.get_num_interior_rings(polys)
+    ring_polys = np.concatenate([idxs, np.repeat(idxs, counts)])
+    rings = np.concatenate([pygeos.get_exterior_ring(polys),
+                            pygeos.get_interior_ring(polys[ring_polys[len(polys):]],
+                                                     np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts,
+                                                                                         counts))])
+    coords, ring_idxs = pygeos.get_coordinates(rings, return_index=True)
+
+    # Compile directed segments and assign vertex identifiers from exact coordinate keys.
+    _, vertices = np.unique(np.ascontiguousarray(coords).view(np.complex128).ravel(), return_inverse=True)
+    starts = np.flatnonzero((ring_idxs[:-1] == ring_idxs[1:]) & (vertices[:-1] != vertices[1:]))
+    seg_groups = codes[ring_polys[ring_idxs[starts]]]
+    a, b = vertices[starts], vertices[starts + 1]
+
+    # Drop segments traversed in both directions within a group. Repeated segments in the same direction represent
+    # overlapping polygons.
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    order = np.lexsort((hi, lo, seg_groups))
+    keys = np.column_stack([seg_groups, lo, hi])[order]
+    runs = np.cumsum(np.concatenate([[True], (keys[1:] != keys[:-1]).any(axis=1)])) - 1
+    forward = np.bincount(runs, weights=(a < b)[order])
+    total = np.bincount(runs)
+    shared = np.zeros(len(starts), dtype=bool)
+    shared[order] = ((forward == 1) & (total == 2))[runs]
+    invalid[seg_groups[order][((forward > 1) | (total - forward > 1))[runs]]] = True
+    starts, seg_groups, a, b = starts[~shared], seg_groups[~shared], a[~shared], b[~shared]
+
+    # Link each segment to the next segment of its ring, being the segment leaving its end node (within the same
+    # group) which is first counter-clockwise from its reversed direction.
+    n_vertices = vertices.max() + 1 if len(vertices) else 0
+    nodes_out = seg_groups * n_vertices + a
+    nodes_in = seg_groups * n_vertices + b
+    vectors = coords[starts + 1] - coords[starts]
+    angles = np.arctan2(vectors[:, 1], vectors[:, 0])
+    order = np.lexsort((angles, nodes_out))
+    first = np.searchsorted(nodes_out[order], nodes_in, side="left")
+    last = np.searchsorted(nodes_out[order], nodes_in, side="right")
+    segs = np.arange(len(starts))
+    nxt = segs.copy()
+    flag = last - first == 1
+    nxt[flag] = order[first[flag]]
+    invalid[seg_groups[last == first]] = True
+    for seg in np.flatnonzero(last - first > 1):
+        candidates = order[first[seg]: last[seg]]
+        turns = np.mod(angles[candidates] - angles[seg] - np.pi, 2 * np.pi)
+        turns[turns == 0] = 2 * np.pi
+        nxt[seg] = candidates[np.argmin(turns)]
+
+    # Order segments by ring and generate ring geometries.
+    labels = _cycles(nxt)
+    ranks = _ranks(nxt, labels)
+    order = np.lexsort((ranks, labels))
+    _, ring_first, ring_idxs = np.unique(labels[order], return_index=True, return_inverse=True)
+    segs = order
+    cross = coords[starts, 0] * coords[starts + 1, 1] - coords[starts + 1, 0] * coords[starts, 1]
+    ring_areas = np.bincount(ring_idxs, weights=cross[segs]) / 2
+    ring_groups = seg_groups[segs[ring_first]]
+    ring_counts = np.bincount(ring_idxs)
+    flag = ring_counts >= 3
+    invalid[ring_groups[~flag]] = True
+    rings_new = pygeos.linearrings(coords[starts[segs]], indices=ring_idxs)
+
+    # Assign holes to the smallest shell of the same group which covers them.
+    shells = np.flatnonzero(flag & (ring_areas < 0))
+    holes = np.flatnonzero(flag & (ring_areas > 0))
+    ring_faces = np.full(len(ring_areas), -1, dtype=np.int64)
+    ring_faces[shells] = np.arange(len(shells))
+    shell_polys = pygeos.polygons(rings_new[shells])
+    if len(holes) and len(shells):
+        idxs, idxs_shell = pygeos.STRtree(shell_polys).query_bulk(pygeos.polygons(rings_new[holes]),
+                                                                  predicate="covered_by")
+        flag = ring_groups[holes[idxs]] == ring_groups[shells[idxs_shell]]
+        idxs, idxs_shell = idxs[flag], idxs_shell[flag]
+        order = np.lexsort((-ring_areas[shells[idxs_shell]], idxs))
+        idxs, first = np.unique(idxs[order], return_index=True)
+        ring_faces[holes[idxs]] = idxs_shell[order][first]
+    invalid[ring_groups[holes[ring_faces[holes] == -1]]] = True
+
+    # Compile polygons from shells and holes, and (multi)polygons from the polygons of each group.
+    idxs = np.flatnonzero(ring_faces >= 0)
+    idxs = idxs[np.lexsort((ring_areas[idxs] > 0, ring_faces[idxs]))]
+    polys_new = pygeos.polygons(rings_new[idxs], indices=ring_faces[idxs]) if len(idxs) else \
+        np.empty(0, dtype=object)
+    poly_groups = ring_groups[shells]
+    order = np.argsort(poly_groups, kind="stable")
+    geoms = np.full(n_groups, None, dtype=object)
+    counts = np.bincount(poly_groups, minlength=n_groups)
+    flag = counts == 1
+    geoms[poly_groups[flag[poly_groups]]] = polys_new[flag[poly_groups]]
+    flag = counts > 1
+    if flag.any():
+        idxs = order[flag[poly_groups[order]]]
+        geoms[flag] = pygeos.multipolygons(polys_new[idxs], indices=np.unique(poly_groups[idxs],
+                                                                              return_inverse=True)[1])
+    invalid[counts == 0] = True
+
+    # Validate dissolved geometries against the input polygons, falling back to unary union.
+    flag = ~invalid
+    flag[flag] = pygeos.is_valid(geoms[flag])
+    areas = np.bincount(codes, weights=pygeos.area(polys), minlength=n_groups)
+    flag[flag] = np.isclose(pygeos.area(geoms[flag]), areas[flag], rtol=1e-9, atol=0)
+    for idx in np.flatnonzero(~flag):
+        geoms[idx] = pygeos.union_all(polys[codes == idx])
+
+    return geoms
@@ -1,11 +1,16 @@
-# TODO: Modify this script to compile and execute all individual validation scripts within the directory of the given data model.
-#       The only question mark is how to handle validation scripts with different inputs.
-
 import click
 import helpers
 import logging
+import pandas as pd
+import registry
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
 from pathlib import Path
+from sqlalchemy import exc
+from tabulate import tabulate
+from typing import Any, Dict, Iterator, List, Tuple
 
 # Set logger.
 logger = logging.getLogger(__name__)
@@ -15,11 +20,19 @@ handler.setLevel(logging.INFO)
 handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
 logger.addHandler(handler)
 
+# Define data models, being the directories containing a datasets.yaml.
+MODELS = sorted(path.parent.name for path in Path(__file__).resolve().parent.glob("*/datasets.yaml"))
+
 
 class DataModelValidation:
-    """Validates a data model."""
+    """
+    Validates a data model by executing all validations registered by the validation scripts (validate_*.py) within
+    the data model directory (see registry). Each required dataset is loaded once, each required artifact is built
+    once, and validations are executed concurrently in dependency order.
+    """
 
-    def __init__(self, model: str, url: str, schema: str = "public", geom_col: str = "geom") -> None:
+    def __init__(self, model: str, url: str, schema: str = "public", geom_col: str = "geom", workers: int = 1,
+                 pool_size: int = 5, chunksize: int = 100000) -> None:
         """
         Class initialization.
 
@@ -28,6 +41,10 @@ class DataModelValidation:
         :param str url: database URL.
         :param str schema: database schema, default=public.
         :param str geom_col: geometry column for spatial datasets, default=geom.
+        :param int workers: number of worker threads used to build artifacts and apply validations concurrently,
+            default=1.
+        :param int pool_size: maximum number of concurrent database connections, default=5.
+        :param int chunksize: number of records per batch of streamed datasets, default=100000.
         """
 
         logger.info(f"Initializing data model validation for: {model}.")
@@ -36,52 +53,404 @@ class DataModelValidation:
         self.url = url
         self.schema = schema
         self.geom_col = geom_col
+        self.workers = workers
+        self.pool_size = pool_size
+        self.chunksize = chunksize
+        self.model_dir = Path(__file__).resolve().parent / model
+
+        # Define outputs.
         self.dfs = dict()
+        self.artifacts = dict()
+        self.errors = dict()
+
+        # Load data model datasets.
+        self.datasets = helpers.load_yaml(self.model_dir / "datasets.yaml")
 
         # Create database engine.
-        self.engine = helpers.create_db_engine(self.url)
+        self.engine = helpers.create_db_engine(self.url, pool_size=self.pool_size)
+
+        # Configure dataset columns and identifiers, being the first column of each dataset.
+        try:
+            self.db_columns = helpers.get_db_columns(self.engine, schema=self.schema)
+        except exc.SQLAlchemyError as e:
+            logger.exception(f"Unable to query database catalog. Exception details:\n{type(e).__name__}: {e}",
+                             exc_info=False)
+            sys.exit(1)
 
-        # Define validations.
-        self.validations = {
-            #TODO - may not be needed.
-        }
+        self.identifiers = {dataset: self.db_columns[dataset][0][0] for dataset in self.datasets
+                            if dataset in self.db_columns}
+
+        missing = set(self.datasets) - set(self.identifiers)
+        if len(missing):
+            logger.warning(f"Data model dataset(s) not found in schema {self.schema}: {*sorted(missing),}. "
+                           f"Validations requiring these datasets will be skipped.".replace(",)", ")"))
+
+        # Discover and configure artifacts and validations.
+        modules = registry.discover(self.model_dir)
+        logger.info(f"Discovered validation scripts: {', '.join(modules) or 'none'}.")
+
+        self.plugins_artifacts = dict(registry.artifacts.get(self.model, dict()))
+        self.validations = dict(registry.validations.get(self.model, dict()))
+        self._register_builtins()
+        self._configure_graph()
 
     def __call__(self) -> None:
         """Executes the class."""
 
-        self.dfs = helpers.load_db_datasets(self.engine, schema=self.schema, geom_col=self.geom_col)
-        self._validate()
-        self._write_errors()
+        # Note: datasets which are only streamed are not loaded.
+        if len(self.columns):
+            with helpers.tracer.stage("load_db_datasets"):
+                self.dfs = helpers.load_db_datasets(self.engine, subset=sorted(self.columns), schema=self.schema,
+                                                    geom_col=self.geom_col, columns=self.columns, wkb=True)
+
+        # Index datasets by their identifier.
+        for dataset, df in self.dfs.items():
+            df.index = df[self.identifiers[dataset]]
+
+        with helpers.tracer.stage("validate"):
+            self._validate()
+        with helpers.tracer.stage("write_errors"):
+            self._write_errors()
+
+    def _register_builtins(self) -> None:
+        """
+        Registers the built-in artifacts and validations of all data model datasets:
+
+        \b
+        - keys:<dataset>: hash index of the unique identifiers of a dataset, built only if required by a validation.
+        - sindex:<dataset>: spatial index of a spatial dataset, built only if required by a validation.
+        - unique_identifier:<dataset>: validation 501, duplicated identifiers.
+        """
+
+        # Note: artifacts of datasets missing from the database are registered such that validations requiring them
+        # are skipped rather than failing on an unregistered artifact.
+        for dataset in self.datasets:
+
+            # Identifier index.
+            self.plugins_artifacts.setdefault(f"keys:{dataset}", registry.Artifact(
+                f"keys:{dataset}", partial(self._build_keys, dataset), datasets={dataset: []}))
+
+            # Spatial index.
+            if dataset not in self.identifiers or self.geom_col in dict(self.db_columns[dataset]):
+                self.plugins_artifacts.setdefault(f"sindex:{dataset}", registry.Artifact(
+                    f"sindex:{dataset}", partial(self._build_sindex, dataset),
+                    datasets={dataset: [registry.GEOMETRY]}))
+
+            # Identifier uniqueness.
+            if dataset not in self.identifiers:
+                continue
+            self.validations.setdefault(f"unique_identifier:{dataset}", registry.Validation(
+                f"unique_identifier:{dataset}", partial(self.unique_identifier, dataset),
+                datasets={dataset: [self.identifiers[dataset]]}))
+
+    def _configure_graph(self) -> None:
+        """
+        Configures the dependency graph of the validations and their required artifacts, and the columns to be loaded
+        for each required dataset. Validations which require datasets missing from the database are skipped.
+        """
+
+        # Skip validations with missing datasets.
+        registered = set(self.validations)
+        for name, validation in sorted(self.validations.items()):
+            missing = set(self._get_datasets(validation)) - set(self.identifiers)
+            if len(missing):
+                logger.warning(f"Skipping validation {name}. Missing dataset(s): {*sorted(missing),}."
+                               .replace(",)", ")"))
+                del self.validations[name]
+
+        # Compile dependencies of required artifacts and validations, as graph nodes (type, name).
+        self.graph = dict()
+        nodes = [("validation", name) for name in self.validations]
+        while nodes:
+            node = nodes.pop()
+            if node in self.graph:
+                continue
+
+            plugin = self._get_plugin(node)
+            deps = {("artifact", name) for name in plugin.artifacts}
+            if node[0] == "validation":
+                for name in plugin.after:
+                    if name not in registered:
+                        logger.exception(f"Unregistered validation: {name}, required by validation: {node[1]}.")
+                        sys.exit(1)
+                    if name in self.validations:
+                        deps.add(("validation", name))
+
+            self.graph[node] = deps
+            nodes.extend(deps)
+
+        # Validate acyclic graph via topological sort.
+        pending = {node: set(deps) for node, deps in self.graph.items()}
+        while pending:
+            ready = {node for node, deps in pending.items() if not deps}
+            if not ready:
+                logger.exception(f"Cyclic dependencies between: {*sorted(name for _, name in pending),}."
+                                 .replace(",)", ")"))
+                sys.exit(1)
+            pending = {node: deps - ready for node, deps in pending.items() if node not in ready}
+
+        # Count consumers of each artifact, such that artifacts are released once no longer required.
+        self._consumers = {node: 0 for node in self.graph if node[0] == "artifact"}
+        for deps in self.graph.values():
+            for dep in deps:
+                if dep[0] == "artifact":
+                    self._consumers[dep] += 1
+
+        # Compile required columns of each loaded and streamed dataset.
+        self.columns = dict()
+        self.streams = dict()
+        for node in self.graph:
+            plugin = self._get_plugin(node)
+            for required, datasets in ((self.columns, plugin.datasets), (self.streams, plugin.streams)):
+                for dataset, columns in datasets.items():
+                    required.setdefault(dataset, [self.identifiers[dataset]])
+                    for column in columns:
+                        column = self.geom_col if column == registry.GEOMETRY else column
+                        if column not in required[dataset]:
+                            required[dataset].append(column)
+
+        # Validate required columns.
+        for dataset, columns in (*self.columns.items(), *self.streams.items()):
+            missing = set(columns) - set(dict(self.db_columns[dataset]))
+            if len(missing):
+                logger.exception(f"Invalid dataset: {self.schema}.{dataset}. Missing column(s) required by "
+                                 f"validations: {*sorted(missing),}.".replace(",)", ")"))
+                sys.exit(1)
+
+        logger.info(f"Configured {len(self.validations)} validations and {len(self._consumers)} artifacts for "
+                    f"{len(set(self.columns) | set(self.streams))} datasets.")
+
+    def _get_datasets(self, plugin: registry.Artifact) -> List[str]:
+        """
+        Returns the datasets required by an artifact or validation, including those of its required artifacts.
+        Artifacts are visited once, such that cyclic dependencies are reported by the dependency graph configuration.
+
+        \b
+        :param registry.Artifact plugin: artifact or validation.
+        :return List[str]: dataset names.
+        """
+
+        datasets = list()
+        plugins = [plugin]
+        visited = set()
+        while plugins:
+            plugin = plugins.pop()
+            datasets.extend([*plugin.datasets, *plugin.streams])
+            for name in set(plugin.artifacts) - visited:
+                visited.add(name)
+                if name in self.plugins_artifacts:
+                    plugins.append(self.plugins_artifacts[name])
+
+        return datasets
+
+    def _get_plugin(self, node: Tuple[str, str]) -> registry.Artifact:
+        """
+        Returns the artifact or validation of a graph node.
+
+        \b
+        :param Tuple[str, str] node: node type (artifact or validation) and name.
+        :return registry.Artifact: artifact or validation.
+        """
+
+        plugins = self.plugins_artifacts if node[0] == "artifact" else self.validations
+        if node[1] not in plugins:
+            logger.exception(f"Unregistered {node[0]}: {node[1]}.")
+            sys.exit(1)
+
+        return plugins[node[1]]
+
+    def _execute(self, node: Tuple[str, str], trace_parent: Dict[str, Any] = None) -> Tuple[Any, float]:
+        """
+        Builds an artifact or applies a validation, providing only its required datasets and artifacts.
+
+        \b
+        :param Tuple[str, str] node: node type (artifact or validation) and name.
+        :param Dict[str, Any] trace_parent: parent stage record (see helpers.Tracer.stage), default=None.
+        :return Tuple[Any, float]: artifact or validation results, and wall time in seconds.
+        """
+
+        plugin = self._get_plugin(node)
+        dfs = {dataset: self.dfs[dataset] for dataset in plugin.datasets}
+        dfs.update({dataset: partial(self._stream, dataset) for dataset in plugin.streams})
+        artifacts = {name: self.artifacts[name] for name in plugin.artifacts}
+
+        start_time = time.perf_counter()
+        with helpers.tracer.stage(node[1], parent=trace_parent):
+            result = plugin.func(dfs, artifacts)
+
+        return result, time.perf_counter() - start_time
+
+    def _stream(self, dataset: str) -> Iterator[pd.DataFrame]:
+        """
+        Streams the required columns of a dataset in batches, each indexed by the dataset identifier.
+
+        \b
+        :param str dataset: dataset name.
+        :return Iterator[pd.DataFrame]: iterator of DataFrames.
+        """
+
+        for df in helpers.stream_db_dataset(self.engine, dataset, self.streams[dataset], schema=self.schema,
+                                            chunksize=self.chunksize):
+            df.index = df[self.identifiers[dataset]]
+            yield df
 
     def _validate(self) -> None:
-        ...
+        """
+        Executes validations. Artifacts and validations are submitted to a pool of worker threads as soon as all of
+        their dependencies have completed, such that independent validations are executed concurrently.
+        """
+
+        logger.info(f"Applying {len(self.validations)} validations with {self.workers} worker thread(s).")
+
+        pending = {node: set(deps) for node, deps in self.graph.items()}
+        done = set()
+        futures = dict()
+        trace_parent = helpers.tracer.current
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        try:
+
+            while pending or futures:
+
+                # Submit nodes with completed dependencies, artifacts first since they unblock validations.
+                for node in sorted(node for node, deps in pending.items() if deps <= done):
+                    del pending[node]
+                    futures[executor.submit(self._execute, node, trace_parent=trace_parent)] = node
+
+                # Collect completed nodes.
+                completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    node = futures.pop(future)
+                    result, seconds = future.result()
+                    done.add(node)
+
+                    if node[0] == "artifact":
+                        logger.info(f"Built artifact {node[1]} ({seconds:.2f}s).")
+                        self.artifacts[node[1]] = result
+
+                    else:
+                        logger.info(f"Applied validation {node[1]} ({seconds:.2f}s).")
+
+                        # Store results.
+                        for code, vals in result.items():
+                            for dataset, ids in vals.items():
+                                self.errors.setdefault(code, dict()).setdefault(dataset, set()).update(ids)
+
+                    # Release artifacts which are no longer required.
+                    for dep in self.graph[node]:
+                        if dep[0] == "artifact":
+                            self._consumers[dep] -= 1
+                            if not self._consumers[dep]:
+                                del self.artifacts[dep[1]]
+
+        finally:
+            executor.shutdown(wait=not futures, cancel_futures=True)
 
     def _write_errors(self) -> None:
-        ...
+        """
+        Write validation error flags to each dataset as integer columns, by streaming all (identifier, code) pairs into
+        an unlogged staging table via COPY and applying them with a single set-based update per dataset (see
+        helpers.write_error_flags).
+        """
+
+        datasets = sorted({dataset for vals in self.errors.values() for dataset in vals})
+
+        for dataset in datasets:
+
+            logger.info(f"Writing error flags to dataset: {self.schema}.{dataset}.")
+
+            identifier, dtype = self.db_columns[dataset][0]
+            errors = {code: vals[dataset] for code, vals in self.errors.items() if dataset in vals}
+            helpers.write_error_flags(self.engine, table=f"{self.schema}.{dataset}", identifier=identifier,
+                                      errors=errors, dtype=dtype)
+
+        # Log validation results summary.
+        summary = tabulate([[code, dataset, len(ids)] for code, vals in sorted(self.errors.items())
+                            for dataset, ids in sorted(vals.items())],
+                           headers=["Validation", "Dataset", "Invalid Count"], tablefmt="rst",
+                           colalign=("left", "left", "right"))
+
+        logger.info("Validation results:\n" + summary)
+
+    def _build_keys(self, dataset: str, dfs: Dict[str, Any], artifacts: Dict[str, Any]) -> pd.Index:
+        """
+        Builds the hash index of the unique identifiers of a dataset, such that membership of identifiers can be tested
+        via hash lookups (see pd.Index.get_indexer).
+
+        \b
+        :param str dataset: dataset name.
+        :param Dict[str, Any] dfs: dictionary of required dataset names and (Geo)DataFrames.
+        :param Dict[str, Any] artifacts: dictionary of required artifact names and artifacts.
+        :return pd.Index: identifier index.
+        """
+
+        return pd.Index(dfs[dataset].index.unique())
+
+    def _build_sindex(self, dataset: str, dfs: Dict[str, Any], artifacts: Dict[str, Any]) -> Any:
+        """
+        Builds the spatial index of a dataset.
+
+        \b
+        :param str dataset: dataset name.
+        :param Dict[str, Any] dfs: dictionary of required dataset names and GeoDataFrames.
+        :param Dict[str, Any] artifacts: dictionary of required artifact names and artifacts.
+        :return Any: spatial index.
+        """
+
+        return dfs[dataset].sindex
+
+    def unique_identifier(self, dataset: str, dfs: Dict[str, Any], artifacts: Dict[str, Any]) -> \
+            Dict[int, Dict[str, set]]:
+        """
+        Validates: Identifiers must be unique.
+
+        \b
+        :param str dataset: dataset name.
+        :param Dict[str, Any] dfs: dictionary of required dataset names and (Geo)DataFrames.
+        :param Dict[str, Any] artifacts: dictionary of required artifact names and artifacts.
+        :return Dict[int, Dict[str, set]]: validation code and dictionary of dataset names and identifiers of
+            erroneous records.
+        """
+
+        ids = dfs[dataset].index
+        return {501: {dataset: set(ids[ids.duplicated(keep=False)])}}
 
 
 @click.command()
-@click.argument("model", type=click.Choice(sorted(set(map(lambda f: f.parent.stem, Path().glob("**/*.yaml")))), False))
-@click.argument("url", type=click.STRING,
-                help="General format: postgresql://[user[:password]@][netloc][:port][/dbname]")
-@click.option("--schema", default="public", show_default=True,
-              help="Database schema. Will detect and use the default schema if none is provided.")
+@click.argument("model", type=click.Choice(MODELS, False))
+@click.argument("url", type=click.STRING)
+@click.option("--schema", default="public", show_default=True, help="Database schema.")
 @click.option("--geom_col", default="geom", show_default=True, help="Geometry column for spatial datasets.")
-def main(model: str, url: str, schema: str = "public", geom_col: str = "geom") -> None:
+@click.option("--workers", type=click.IntRange(min=1), default=1, show_default=True,
+              help="Number of worker threads used to build artifacts and apply validations concurrently.")
+@click.option("--pool_size", type=click.IntRange(min=1), default=5, show_default=True,
+              help="Maximum number of concurrent database connections. Datasets are loaded concurrently.")
+@click.option("--chunksize", type=click.IntRange(min=1), default=100000, show_default=True,
+              help="Number of records per batch of streamed datasets.")
+def main(model: str, url: str, schema: str = "public", geom_col: str = "geom", workers: int = 1,
+         pool_size: int = 5, chunksize: int = 100000) -> None:
     """
     Validates a data model.
 
     \b
+    MODEL: Name of the data model to be validated.
+    URL: Database URL. General format: postgresql://[user[:password]@][netloc][:port][/dbname]
+
+    \f\b
     :param str model: name of the data model to be validated.
     :param str url: database URL.
     :param str schema: database schema, default=public.
     :param str geom_col: geometry column for spatial datasets, default=geom.
+    :param int workers: number of worker threads used to build artifacts and apply validations concurrently,
+        default=1.
+    :param int pool_size: maximum number of concurrent database connections, default=5.
+    :param int chunksize: number of records per batch of streamed datasets, default=100000.
     """
 
     try:
 
         with helpers.Timer():
-            validation = DataModelValidation(model, url, schema, geom_col)
+            validation = DataModelValidation(model, url, schema, geom_col, workers, pool_size, chunksize)
             validation()
 
     except Exception as e:
@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src/canadian_road_network"))
+from benchmark_segment import gen_network, run
+from validate_segment import DatasetValidation
+
+
+def test_gen_network_valid():
+    """Synthetic networks without injected errors are fully valid."""
+
+    for topology_type in ("grid", "random"):
+        for seed in range(5):
+            df, meshblock = gen_network(3000, topology_type, seed=seed)
+            errors = DatasetValidation.from_datasets(df, meshblock, engine="python").validate()
+
+            assert not any(map(len, errors.values())), (topology_type, seed)
+
+
+def test_run_stages():
+    """Benchmark runs time the meshblock update and the stages which are not executed without a database writer."""
+
+    results = run(500, "random")
+
+    assert not any(results["errors"].values())
+    for stage in ("run/update_meshblock", "compile_errors_sql", "compile_meshblock_updates", "update_meshblock_parity",
+                  "update_meshblock_parity/configure_meshblock_parity"):
+        assert stage in results["stages"]
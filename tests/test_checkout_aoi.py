@@ -0,0 +1,98 @@
+import geopandas as gpd
+import pytest
+import sys
+from pathlib import Path
+from shapely.geometry import box
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+import helpers
+from checkout_aoi import CheckoutAOI
+
+# Define the data model and its spatial datasets.
+MODEL = "canadian_road_network"
+MODEL_DIR = Path(__file__).resolve().parents[1] / "src" / MODEL
+SPATIAL = ("basic_block", "blocked_passage", "crossing", "ferry", "junction", "segment", "toll_point")
+
+
+def _gen_checkout(monkeypatch, exclude=(), indexes=(), triggers=()):
+    """
+    Returns the checkout of the data model datasets, excluding the given datasets from the source schema. Dataset
+    columns are the identifier, the identifier references (references.yaml), and the geometry of spatial datasets.
+    """
+
+    references = helpers.load_yaml(MODEL_DIR / "references.yaml")
+    columns = {dataset: [(f"{dataset}_id", "uuid"), *((column, "uuid") for column in references.get(dataset, dict())),
+                         *((("geom", "geometry"),) if dataset in SPATIAL else ())]
+               for dataset in helpers.load_yaml(MODEL_DIR / "datasets.yaml") if dataset not in exclude}
+
+    def execute_query(engine, query, params=None):
+        if "pg_namespace" in query:
+            return [(False,)]
+        if "Find_SRID" in query:
+            return [(3347,)]
+        return list(indexes if "pg_get_indexdef" in query else triggers)
+
+    monkeypatch.setattr(helpers, "load_file_dataset", lambda path, layer=None: gpd.GeoDataFrame(
+        geometry=[box(0, 0, 10, 10)], crs="EPSG:3347"))
+    monkeypatch.setattr(helpers, "create_db_engine", lambda url, pool_size=5: None)
+    monkeypatch.setattr(helpers, "get_db_columns", lambda engine, schema="public": columns if schema == "public" else
+                        dict())
+    monkeypatch.setattr(helpers, "execute_query", execute_query)
+
+    return CheckoutAOI(MODEL, "url", "aoi.gpkg", "jdoe")
+
+
+def test_configure_stages(monkeypatch):
+    """Datasets are checked out after the datasets they are related to, via references to or from them."""
+
+    checkout = _gen_checkout(monkeypatch)
+    stages = {dataset: index for index, stage in enumerate(checkout.stages) for dataset in stage}
+
+    assert [stages[dataset] for dataset in ("segment", "street_name_link", "street_name", "street_name_translation")] \
+           == [0, 1, 2, 3]
+    assert stages["provider_lookup"] == stages["ferry"] == 0
+    assert checkout.stages[0]["segment"] == "aoi"
+    assert checkout.stages[0]["provider_lookup"] == "all"
+
+    # Relations as (checked out dataset, checked out dataset column, column).
+    assert checkout.stages[1]["street_name_link"] == [("segment", "segment_id", "segment_id")]
+    assert checkout.stages[1]["route_name_link"] == [("segment", "segment_id", "segment_id"),
+                                                      ("ferry", "ferry_id", "segment_id")]
+    assert checkout.stages[1]["address_range"] == [("segment", "segment_id_left", "address_range_id"),
+                                                    ("segment", "segment_id_right", "address_range_id")]
+    assert checkout.stages[2]["street_name"] == [("street_name_link", "street_name_id", "street_name_id")]
+    assert checkout.stages[3]["street_name_translation"] == [("street_name", "street_name_id", "street_name_id")]
+
+
+def test_configure_stages_missing(monkeypatch):
+    """Datasets unrelated to any checked out dataset, due to missing datasets, are checked out in full."""
+
+    checkout = _gen_checkout(monkeypatch, exclude=("street_name_link", "ferry"))
+
+    assert checkout.stages[0]["street_name"] == checkout.stages[0]["street_name_translation"] == "all"
+    assert checkout.stages[1]["route_name_link"] == [("segment", "segment_id", "segment_id")]
+    assert "street_name_link" not in checkout.selections
+
+
+@pytest.mark.parametrize("schema", ["public", None])
+def test_get_definitions(monkeypatch, schema):
+    """Index, constraint, and trigger definitions are retargeted to the user dataset, with or without a qualified
+    source dataset."""
+
+    table = f"{schema}.segment" if schema else "segment"
+    indexes = [(f"CREATE UNIQUE INDEX segment_pkey ON {table} USING btree (segment_id)", "segment_pkey", "p"),
+               (f"CREATE UNIQUE INDEX segment_key ON ONLY {table} USING btree (segment_id, geom)", "segment_key", "u"),
+               (f"CREATE INDEX segment_on_segment_idx ON {table} USING gist (geom)", "segment_on_segment_idx", None)]
+    triggers = [(f"CREATE TRIGGER segment_snap BEFORE INSERT OR UPDATE ON {table} FOR EACH ROW EXECUTE FUNCTION "
+                 f"snap_coords('5')",)]
+
+    checkout = _gen_checkout(monkeypatch, indexes=indexes, triggers=triggers)
+
+    assert checkout._get_definitions("segment") == [
+        "CREATE UNIQUE INDEX segment_pkey ON jdoe.segment USING btree (segment_id);",
+        "ALTER TABLE jdoe.segment ADD CONSTRAINT segment_pkey PRIMARY KEY USING INDEX segment_pkey;",
+        "CREATE UNIQUE INDEX segment_key ON ONLY jdoe.segment USING btree (segment_id, geom);",
+        "ALTER TABLE jdoe.segment ADD CONSTRAINT segment_key UNIQUE USING INDEX segment_key;",
+        "CREATE INDEX segment_on_segment_idx ON jdoe.segment USING gist (geom);",
+        "CREATE TRIGGER segment_snap BEFORE INSERT OR UPDATE ON jdoe.segment FOR EACH ROW EXECUTE FUNCTION "
+        "snap_coords('5');"]
@@ -0,0 +1,96 @@
+import geopandas as gpd
+import os
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+from shapely.geometry import LineString, box
+from sqlalchemy import create_engine, text
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+from checkout_aoi import CheckoutAOI
+
+# Define the PostGIS database URL of the fixture tables. Tests are skipped if not provided.
+URL = os.environ.get("EGP_TEST_DB_URL")
+SCHEMA = "test_checkout_aoi"
+USER_SCHEMA = "test_checkout_aoi_user"
+
+requires_db = pytest.mark.skipif(not URL, reason="EGP_TEST_DB_URL (PostGIS database URL) not provided.")
+
+
+@pytest.fixture(scope="module")
+def checkout(tmp_path_factory):
+    """
+    Writes segments within, crossing, and outside of an AOI with related street names to PostGIS fixture tables, and
+    checks out the AOI. Returns the checked out identifiers of each dataset and the locked identifiers.
+    """
+
+    engine = create_engine(URL)
+    datasets = {
+        "segment": gpd.GeoDataFrame(
+            {"segment_id": ["s0", "s1", "s2"]},
+            geometry=[LineString([(2, 2), (4, 4)]), LineString([(8, 5), (12, 5)]), LineString([(20, 0), (30, 0)])],
+            crs="EPSG:3347").rename_geometry("geom"),
+        "street_name_link": pd.DataFrame({"street_name_link_id": ["l0", "l1", "l2"], "segment_id": ["s0", "s2", "s1"],
+                                          "street_name_id": ["n0", "n1", "n0"]}),
+        "street_name": pd.DataFrame({"street_name_id": ["n0", "n1", "n2"]}),
+        "street_name_translation": pd.DataFrame({"street_name_translation_id": ["t0", "t1"],
+                                                 "street_name_id": ["n0", "n1"]}),
+        "language_code_lookup": pd.DataFrame({"code": [1, 2]})
+    }
+
+    with engine.begin() as con:
+        con.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; DROP SCHEMA IF EXISTS {USER_SCHEMA} CASCADE; "
+                         f"CREATE SCHEMA {SCHEMA};"))
+
+    # Write fixture tables, with primary keys and spatial indexes as per the data model.
+    for name, df in datasets.items():
+        if isinstance(df, gpd.GeoDataFrame):
+            df.to_postgis(name, engine, schema=SCHEMA, index=False)
+        else:
+            df.to_sql(name, engine, schema=SCHEMA, index=False)
+
+        with engine.begin() as con:
+            con.execute(text(f"ALTER TABLE {SCHEMA}.{name} ADD PRIMARY KEY ({df.columns[0]});"))
+            if name == "segment":
+                con.execute(text(f"CREATE INDEX ON {SCHEMA}.{name} USING gist (geom);"))
+
+    aoi = tmp_path_factory.mktemp("aoi") / "aoi.gpkg"
+    gpd.GeoDataFrame(geometry=[box(0, 0, 10, 10)], crs="EPSG:3347").to_file(aoi, driver="GPKG")
+
+    try:
+        CheckoutAOI("canadian_road_network", URL, aoi, USER_SCHEMA, schema=SCHEMA)()
+
+        with engine.connect() as con:
+            ids = {name: set(con.execute(text(f"SELECT {df.columns[0]} FROM {USER_SCHEMA}.{name};")).scalars())
+                   for name, df in datasets.items()}
+            locked = set(con.execute(text(f"SELECT dataset, identifier FROM {USER_SCHEMA}.aoi_locked;")).fetchall())
+            keys = set(con.execute(text(f"SELECT conrelid::regclass::text FROM pg_constraint WHERE contype = 'p' AND "
+                                        f"connamespace = '{USER_SCHEMA}'::regnamespace;")).scalars())
+
+        yield ids, locked, keys
+
+    finally:
+        with engine.begin() as con:
+            con.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; DROP SCHEMA IF EXISTS {USER_SCHEMA} CASCADE;"))
+
+
+@requires_db
+def test_checkout_related(checkout):
+    """Records related to the checked out segments are checked out, via references to or from them."""
+
+    ids, locked, keys = checkout
+
+    assert ids == {"segment": {"s0", "s1"}, "street_name_link": {"l0", "l2"}, "street_name": {"n0"},
+                   "street_name_translation": {"t0"}, "language_code_lookup": {1, 2}}
+    assert locked == {("segment", "s1")}
+
+
+@requires_db
+def test_checkout_definitions(checkout):
+    """Primary keys of the source datasets are recreated on the user datasets."""
+
+    _, _, keys = checkout
+
+    assert keys == {f"{USER_SCHEMA}.{name}" for name in ("segment", "street_name_link", "street_name",
+                                                          "street_name_translation", "language_code_lookup")}
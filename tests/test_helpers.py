@@ -0,0 +1,131 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pygeos
+import pytest
+import struct
+import sys
+import uuid
+from pathlib import Path
+from shapely.geometry import LineString
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+import helpers
+from helpers import _concat_batches, encode_copy_binary, encode_uuid
+
+
+def decode_copy_binary(data):
+    """Decodes PostgreSQL binary COPY data into records of binary values (None for NULL)."""
+
+    assert data[:11] == b"PGCOPY\n\xff\r\n\x00" and struct.unpack("!ii", data[11:19]) == (0, 0)
+
+    records = list()
+    position = 19
+    while True:
+        count, = struct.unpack("!h", data[position: position + 2])
+        position += 2
+        if count == -1:
+            break
+
+        record = list()
+        for _ in range(count):
+            size, = struct.unpack("!i", data[position: position + 4])
+            position += 4
+            record.append(None if size == -1 else data[position: position + size])
+            position += max(size, 0)
+        records.append(tuple(record))
+
+    assert position == len(data)
+    return records
+
+
+def _gen_batches(sizes):
+    """Generates GeoDataFrame batches of the given sizes, with null values in later batches only."""
+
+    batches = list()
+    position = 0
+    for index, size in enumerate(sizes):
+        ids = range(position, position + size)
+        batches.append(gpd.GeoDataFrame({
+            "id": [f"r{idx}" for idx in ids],
+            "count": [None if index and not idx % 3 else idx for idx in ids],
+            "code": pd.array([None if not idx % 4 else idx for idx in ids], dtype="Int64"),
+            "flag": [bool(idx % 2) for idx in ids]},
+            geometry=[None if index and not idx % 5 else LineString([(idx, 0), (idx, 1)]) for idx in ids],
+            crs="EPSG:3347").rename_geometry("geom"))
+        position += size
+
+    return batches
+
+
+@pytest.mark.parametrize("sizes", [[10], [7, 7, 3], [1] * 5, [4, 0, 6]])
+def test_concat_batches(sizes):
+    """Batches are concatenated as per pd.concat, including geometries, extension data types, and columns upcast by
+    null values of later batches."""
+
+    batches = _gen_batches(sizes)
+    expected = pd.concat(batches, ignore_index=True)
+
+    df = _concat_batches(iter(batches), sum(sizes))
+
+    assert isinstance(df, gpd.GeoDataFrame)
+    assert df.crs == expected.crs and df.geometry.name == "geom"
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_concat_batches_count():
+    """Records are limited to those received, and records exceeding the expected total are rejected."""
+
+    batches = _gen_batches([5, 5])
+
+    assert _concat_batches(iter([]), 10) is None
+    pd.testing.assert_frame_equal(_concat_batches(iter(batches), 20), pd.concat(batches, ignore_index=True))
+
+    with pytest.raises(ValueError):
+        _concat_batches(iter(batches), 9)
+
+    # Tabular batches.
+    batches = [pd.DataFrame({"id": ["a", "b"], "val": [1, 2]}), pd.DataFrame({"id": ["c"], "val": [np.nan]})]
+    df = _concat_batches(iter(batches), 3)
+    assert not isinstance(df, gpd.GeoDataFrame)
+    pd.testing.assert_frame_equal(df, pd.concat(batches, ignore_index=True))
+
+
+def test_encode_copy_binary():
+    """Binary COPY data round-trips UUIDs, NULL values, and WKB geometries."""
+
+    ids = [uuid.UUID(int=idx) for idx in range(4)]
+    geoms = pygeos.linestrings([[(0, 0), (1, 1)], [(1, 1), (2, 0)], [(2, 0), (3, 3)], [(3, 3), (4, 0)]])
+    vals = [ids[0], str(ids[1]), None, np.nan]
+    records = [(encode_uuid(val), wkb if idx != 1 else None)
+               for idx, (val, wkb) in enumerate(zip(vals, pygeos.to_wkb(geoms)))]
+
+    decoded = decode_copy_binary(encode_copy_binary(records))
+
+    assert decoded == records
+    assert [None if val is None else uuid.UUID(bytes=val) for val, _ in decoded] == [ids[0], ids[1], None, None]
+    assert decoded[1][1] is None
+    assert pygeos.equals(pygeos.from_wkb([wkb for idx, (_, wkb) in enumerate(decoded) if idx != 1]),
+                         geoms[[0, 2, 3]]).all()
+    assert decode_copy_binary(encode_copy_binary([])) == []
+
+
+def test_write_error_flags(monkeypatch):
+    """Columns of all codes are dropped and columns of codes with errors are added, and nothing is written without
+    codes."""
+
+    copies = list()
+    monkeypatch.setattr(helpers, "execute_copy", lambda **kwargs: copies.append(kwargs) or len(list(kwargs["records"])))
+
+    assert helpers.write_error_flags(None, "public.segment", "segment_id", dict()) == 0
+    assert not copies
+
+    assert helpers.write_error_flags(None, "public.segment", "segment_id", {101: set(), 102: set()}) == 0
+    assert copies[-1]["statements_post"] == (
+        "ALTER TABLE public.segment DROP COLUMN IF EXISTS v101, DROP COLUMN IF EXISTS v102;",
+        "DROP TABLE public._segment_errors;")
+
+    assert helpers.write_error_flags(None, "public.segment", "segment_id", {101: {"s0", "s1"}, 102: set()}) == 2
+    statements = copies[-1]["statements_post"]
+    assert statements[0] == "ALTER TABLE public.segment DROP COLUMN IF EXISTS v101, DROP COLUMN IF EXISTS v102;"
+    assert statements[2] == "ALTER TABLE public.segment ADD COLUMN v101 INTEGER DEFAULT 0;"
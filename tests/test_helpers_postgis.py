@@ -0,0 +1,123 @@
+import geopandas as gpd
+import os
+import pandas as pd
+import pygeos
+import pytest
+import sys
+import uuid
+from pathlib import Path
+from shapely.geometry import LineString
+from sqlalchemy import text
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+import helpers
+
+# Define the PostGIS database URL of the fixture tables. Tests are skipped if not provided.
+URL = os.environ.get("EGP_TEST_DB_URL")
+SCHEMA = "test_helpers"
+
+requires_db = pytest.mark.skipif(not URL, reason="EGP_TEST_DB_URL (PostGIS database URL) not provided.")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Writes spatial and tabular PostGIS fixture tables, with null values."""
+
+    engine = helpers.create_db_engine(URL)
+    n = 1001
+
+    with engine.begin() as con:
+        con.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA};"))
+
+    gpd.GeoDataFrame({"segment_id": [f"s{idx}" for idx in range(n)],
+                      "count": [None if not idx % 3 else idx for idx in range(n)]},
+                     geometry=[None if not idx % 5 else LineString([(idx, 0), (idx, 1)]) for idx in range(n)],
+                     crs="EPSG:3347").rename_geometry("geom").to_postgis("segment", engine, schema=SCHEMA, index=False)
+    pd.DataFrame({"street_name_link_id": [f"l{idx}" for idx in range(n)],
+                  "segment_id": [None if not idx % 7 else f"s{idx}" for idx in range(n)]}) \
+        .to_sql("street_name_link", engine, schema=SCHEMA, index=False)
+
+    try:
+        yield engine
+
+    finally:
+        with engine.begin() as con:
+            con.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;"))
+
+
+def _load(engine, **kwargs):
+    """Loads the fixture tables, ordered by identifier."""
+
+    dfs = helpers.load_db_datasets(engine, schema=SCHEMA, **kwargs)
+    return {dataset: df.sort_values(df.columns[0], ignore_index=True) for dataset, df in dfs.items()}
+
+
+@requires_db
+@pytest.mark.parametrize("wkb", [False, True])
+@pytest.mark.parametrize("chunksize", [1, 100, 1001, 5000])
+def test_load_chunked(engine, wkb, chunksize):
+    """Datasets loaded in batches match those loaded at once."""
+
+    expected = _load(engine, wkb=wkb)
+    dfs = _load(engine, wkb=wkb, chunksize=chunksize)
+
+    assert set(dfs) == {"segment", "street_name_link"}
+    for dataset, df in dfs.items():
+        assert type(df) is type(expected[dataset])
+        pd.testing.assert_frame_equal(df, expected[dataset])
+
+    assert dfs["segment"].crs == expected["segment"].crs
+
+
+@requires_db
+def test_load_chunked_empty(engine):
+    """Empty datasets loaded in batches retain their columns and data types."""
+
+    with engine.begin() as con:
+        con.execute(text(f"CREATE TABLE {SCHEMA}.empty AS SELECT * FROM {SCHEMA}.segment LIMIT 0;"))
+
+    try:
+        expected = helpers.load_db_datasets(engine, subset=["empty"], schema=SCHEMA)["empty"]
+        df = helpers.load_db_datasets(engine, subset=["empty"], schema=SCHEMA, chunksize=10)["empty"]
+        assert isinstance(df, gpd.GeoDataFrame) and not len(df)
+        pd.testing.assert_frame_equal(df, expected)
+
+    finally:
+        with engine.begin() as con:
+            con.execute(text(f"DROP TABLE {SCHEMA}.empty;"))
+
+
+@requires_db
+@pytest.mark.parametrize("chunksize", [1, 100, 5000])
+def test_stream(engine, chunksize):
+    """Streamed batches are bounded by the batch size and match the loaded dataset."""
+
+    columns = ["street_name_link_id", "segment_id"]
+    expected = _load(engine, subset=["street_name_link"])["street_name_link"]
+    batches = list(helpers.stream_db_dataset(engine, "street_name_link", columns, schema=SCHEMA, chunksize=chunksize))
+
+    assert max(map(len, batches)) <= chunksize
+    df = pd.concat(batches).sort_values(columns[0], ignore_index=True)
+    pd.testing.assert_frame_equal(df, expected[columns])
+
+
+@requires_db
+def test_copy_binary(engine):
+    """Records copied in the binary format round-trip their UUIDs, NULL values, and WKB geometries."""
+
+    ids = [uuid.UUID(int=idx) for idx in range(3)]
+    geoms = pygeos.linestrings([[(0, 0), (1, 1)], [(1, 1), (2, 0)], [(2, 0), (3, 3)]])
+    records = [(helpers.encode_uuid(val), wkb) for val, wkb in zip([ids[0], None, str(ids[2])], pygeos.to_wkb(geoms))]
+    records[2] = (records[2][0], None)
+
+    table = f"{SCHEMA}.copy_binary"
+    count = helpers.execute_copy(engine, table, ("id", "geom"), records, binary=True, batch_size=2,
+                                 statements_pre=(f"DROP TABLE IF EXISTS {table};",
+                                                 f"CREATE TABLE {table} (id uuid, geom bytea);"))
+
+    with engine.connect() as con:
+        rows = con.execute(text(f"SELECT CAST(id AS text), ST_AsText(ST_GeomFromWKB(geom)) FROM {table};")).fetchall()
+
+    assert count == 3
+    assert sorted(rows, key=str) == sorted([(str(ids[0]), "LINESTRING(0 0,1 1)"), (None, "LINESTRING(1 1,2 0)"),
+                                            (str(ids[2]), None)], key=str)
@@ -0,0 +1,65 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pygeos
+import sys
+from pathlib import Path
+from shapely.geometry import box
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src/canadian_road_network"))
+import topology
+from benchmark_segment import gen_network
+
+
+def _dissolve(polys, codes, monkeypatch):
+    """Returns the dissolved polygons of each group code, the expected polygons (GeoDataFrame.dissolve), and the
+    number of unary union fallbacks."""
+
+    expected = gpd.GeoDataFrame({"code": codes}, geometry=gpd.GeoSeries(polys)).dissolve("code").geometry
+    expected = pygeos.from_shapely(expected.values)
+
+    fallbacks = list()
+    union_all = pygeos.union_all
+    monkeypatch.setattr(pygeos, "union_all", lambda geoms, **kwargs: fallbacks.append(1) or union_all(geoms, **kwargs))
+
+    return topology.dissolve(polys, codes), expected, len(fallbacks)
+
+
+def test_dissolve_coverage(monkeypatch):
+    """Polygons of a coverage are dissolved by traversal as per GeoDataFrame.dissolve, including groups forming
+    polygons with holes and multipolygons."""
+
+    _, meshblock = gen_network(1000, "grid", seed=0, cul_de_sacs=0)
+    polys = pygeos.from_shapely(meshblock.geometry.values)
+    codes = pd.factorize(meshblock["cb_uid"])[0]
+
+    # Group the polygons surrounding a polygon (polygon with a hole) and two distant polygons (multipolygon).
+    center = pygeos.STRtree(polys).nearest(pygeos.centroid(pygeos.envelope(pygeos.union_all(polys))))[1][0]
+    surrounding = pygeos.STRtree(polys).query(polys[center], predicate="touches")
+    codes[surrounding] = codes.max() + 1
+    codes[[0, len(polys) - 1]] = codes.max() + 1
+    codes = pd.factorize(codes)[0]
+
+    geoms, expected, fallbacks = _dissolve(polys, codes, monkeypatch)
+
+    assert fallbacks == 0
+    assert pygeos.equals(geoms, expected).all()
+    assert pygeos.get_num_interior_rings(geoms[codes[surrounding[0]]]) == 1
+    assert pygeos.get_type_id(geoms[codes[0]]) == 6
+
+
+def test_dissolve_fallback(monkeypatch):
+    """Groups which are not a clean coverage (overlapping polygons, or shared edges without shared vertices) are
+    dissolved by unary union, as per GeoDataFrame.dissolve."""
+
+    polys = pygeos.from_shapely([
+        box(0, 0, 1, 1), box(1, 0, 2, 1),
+        box(3, 0, 4.5, 1), box(4, 0, 5, 1),
+        box(6, 0, 7, 2), box(7, 0, 8, 1), box(7, 1, 8, 2)])
+    codes = np.array([0, 0, 1, 1, 2, 2, 2])
+
+    geoms, expected, fallbacks = _dissolve(polys, codes, monkeypatch)
+
+    assert fallbacks == 2
+    assert pygeos.equals(geoms, expected).all()
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src/canadian_road_network"))
+import registry
+import validate_constraints
+from validate_constraints import flag_invalid_references, invalid_references
+
+
+def _gen_link(n):
+    """Generates a link dataset referencing segments and ferries, with invalid and null references, and the expected
+    identifiers of erroneous records."""
+
+    keys = {"keys:segment": pd.Index([f"s{idx}" for idx in range(10)]),
+            "keys:ferry": pd.Index([f"f{idx}" for idx in range(5)]),
+            "keys:route_name": pd.Index([f"r{idx}" for idx in range(3)])}
+
+    rnd = np.random.default_rng(0)
+    pool = np.array([*keys["keys:segment"], *keys["keys:ferry"], "s10", "f5", None], dtype=object)
+    df = pd.DataFrame({"route_name_link_id": [f"l{idx}" for idx in range(n)],
+                       "segment_id": rnd.choice(pool, n),
+                       "route_name_id": rnd.choice(np.array([*keys["keys:route_name"], "r3", None], dtype=object), n)})
+    df.index = df["route_name_link_id"]
+
+    expected = set(df.index[df["segment_id"].isin({"s10", "f5"}) | (df["route_name_id"] == "r3")])
+
+    return df, keys, expected
+
+
+def test_flag_invalid_references():
+    """Non-null values are flagged if missing from all referenced identifier indexes. Null values are not flagged."""
+
+    vals = pd.Series(["s0", "f0", None, "s9", "s0", np.nan, "f9", "x"])
+    keys = [pd.Index(["s0", "s1"]), pd.Index(["f0", "f1"])]
+
+    assert flag_invalid_references(vals, keys).tolist() == [False, False, False, True, False, False, True, True]
+    assert flag_invalid_references(vals, keys[:1]).tolist() == [False, True, False, True, False, False, True, True]
+    assert not flag_invalid_references(pd.Series([None, None], dtype=object), keys).any()
+    assert not len(flag_invalid_references(pd.Series([], dtype=object), keys))
+
+    # Lookup codes with nulls (float-encoded).
+    vals = pd.Series([1, -1, np.nan, 7, 2])
+    assert flag_invalid_references(vals, [pd.Index([-1, 1, 2])]).tolist() == [False, False, False, True, False]
+
+
+def test_invalid_references_streamed():
+    """Errors of a dataset streamed in batches match those of the loaded dataset, for any batch size."""
+
+    df, keys, expected = _gen_link(103)
+    references = {"segment_id": ("segment", "ferry"), "route_name_id": ("route_name",)}
+
+    def stream(chunksize):
+        return lambda: (df.iloc[idx: idx + chunksize] for idx in range(0, len(df), chunksize))
+
+    assert invalid_references("route_name_link", references, 601, {"route_name_link": df}, keys) == \
+           {601: {"route_name_link": expected}}
+    for chunksize in (1, 7, 103, 1000):
+        assert invalid_references("route_name_link", references, 601, {"route_name_link": stream(chunksize)}, keys) \
+               == {601: {"route_name_link": expected}}
+
+
+def test_registered_references():
+    """Link datasets are streamed, and multi-target references require the identifier index of each target."""
+
+    validations = registry.validations[validate_constraints.MODEL]
+
+    validation = validations["referential_integrity:route_name_link"]
+    assert validation.streams == {"route_name_link": ["segment_id", "route_name_id"]}
+    assert not validation.datasets
+    assert validation.artifacts == ("keys:ferry", "keys:route_name", "keys:segment")
+
+    validation = validations["referential_integrity:segment"]
+    assert validation.datasets == {"segment": ["segment_id_left", "segment_id_right", "structure_id"]}
+    assert not validation.streams
+
+    validation = validations["lookup_domain:segment"]
+    assert "keys:provider_lookup" in validation.artifacts
+
+    # Errors of the registered validation.
+    df, keys, expected = _gen_link(50)
+    assert validations["referential_integrity:route_name_link"].func({"route_name_link": lambda: iter([df])}, keys) \
+           == {601: {"route_name_link": expected}}
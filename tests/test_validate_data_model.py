@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+import helpers
+import registry
+from validate_data_model import DataModelValidation
+
+# Define a data model outside the registered data models.
+MODEL = "test_model"
+
+
+def _gen_validation(monkeypatch, artifacts, validations, workers=1):
+    """Returns the validation of a data model of datasets a and b with the given artifacts and validations."""
+
+    datasets = {"a": {}, "b": {}}
+    monkeypatch.setattr(helpers, "load_yaml", lambda path: datasets)
+    monkeypatch.setattr(helpers, "create_db_engine", lambda url, pool_size=5: None)
+    monkeypatch.setattr(helpers, "get_db_columns", lambda engine, schema="public": {
+        dataset: [(f"{dataset}_id", "text")] for dataset in datasets})
+    monkeypatch.setattr(registry, "discover", lambda model_dir: [])
+    monkeypatch.setitem(registry.artifacts, MODEL, {plugin.name: plugin for plugin in artifacts})
+    monkeypatch.setitem(registry.validations, MODEL, {plugin.name: plugin for plugin in validations})
+
+    validation = DataModelValidation(MODEL, "url", workers=workers)
+    validation.dfs = {dataset: pd.DataFrame({f"{dataset}_id": ["x", "y"]}, index=["x", "y"]) for dataset in datasets}
+
+    return validation
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_validate_order(monkeypatch, workers):
+    """Artifacts and validations are executed once, after all of their dependencies, and artifacts are released once
+    no longer required."""
+
+    executed = list()
+    lock = threading.Lock()
+
+    def func(name, result=None):
+        def execute(dfs, artifacts):
+            with lock:
+                executed.append(name)
+            return result if result is not None else {100: {"a": set(artifacts)}}
+        return execute
+
+    artifacts = [registry.Artifact("x", func("x", "x")),
+                 registry.Artifact("y", func("y", "y"), datasets={"a": []}, artifacts=["x"])]
+    validations = [registry.Validation("v1", func("v1"), artifacts=["y"]),
+                   registry.Validation("v2", func("v2"), artifacts=["x"], after=["v1"]),
+                   registry.Validation("v3", func("v3"), streams={"b": []}, after=["v1", "v2"]),
+                   registry.Validation("v4", func("v4"), datasets={"b": []})]
+    validation = _gen_validation(monkeypatch, artifacts, validations, workers=workers)
+    validation._validate()
+
+    assert sorted(executed) == ["v1", "v2", "v3", "v4", "x", "y"]
+    for dep, node in (("x", "y"), ("y", "v1"), ("v1", "v2"), ("x", "v2"), ("v2", "v3")):
+        assert executed.index(dep) < executed.index(node)
+
+    assert validation.artifacts == dict()
+    assert validation.errors[100] == {"a": {"x", "y"}}
+    assert validation.errors[501] == {"a": set(), "b": set()}
+    assert validation.streams == {"b": ["b_id"]}
+    assert sorted(validation.columns) == ["a", "b"]
+
+
+@pytest.mark.parametrize("artifacts, validations", [
+    ([], [registry.Validation("v1", None, after=["v2"]), registry.Validation("v2", None, after=["v1"])]),
+    ([registry.Artifact("x", None, artifacts=["y"]), registry.Artifact("y", None, artifacts=["x"])],
+     [registry.Validation("v1", None, artifacts=["x"])]),
+    ([registry.Artifact("x", None)],
+     [registry.Validation("v1", None, artifacts=["x"], after=["v3"]), registry.Validation("v2", None, after=["v1"]),
+      registry.Validation("v3", None, after=["v2"])])])
+def test_validate_cycle(monkeypatch, artifacts, validations):
+    """Cyclic dependencies between validations or artifacts exit before any validation is executed."""
+
+    with pytest.raises(SystemExit):
+        _gen_validation(monkeypatch, artifacts, validations)
+
+
+def test_validate_unregistered(monkeypatch):
+    """Dependencies on unregistered validations exit, while dependencies on skipped validations are dropped."""
+
+    with pytest.raises(SystemExit):
+        _gen_validation(monkeypatch, [], [registry.Validation("v1", None, after=["v0"])])
+
+    validation = _gen_validation(monkeypatch, [], [registry.Validation("v1", None, datasets={"c": []}),
+                                                   registry.Validation("v2", lambda dfs, artifacts: dict(),
+                                                                       after=["v1"])])
+    assert ("validation", "v1") not in validation.graph
+    assert validation.graph[("validation", "v2")] == set()
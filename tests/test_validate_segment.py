@@ -0,0 +1,243 @@
+import geopandas as gpd
+import numpy as np
+import sys
+from pathlib import Path
+from shapely.geometry import LineString
+from shapely.ops import polygonize, unary_union
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src/canadian_road_network"))
+from validate_segment import DatasetValidation
+
+
+def _gen_datasets(lines):
+    """Generates segment and basic_block datasets from arcs, with the meshblock of the noded arcs."""
+
+    df = gpd.GeoDataFrame({"segment_id": [f"s{idx}" for idx in range(len(lines))], "bb_uid_l": None, "bb_uid_r": None,
+                           "segment_type": 1}, geometry=lines, crs="EPSG:3347").rename_geometry("geom")
+    polys = list(polygonize(unary_union(lines)))
+    meshblock = gpd.GeoDataFrame({"bb_uid": [f"b{idx}" for idx in range(len(polys))], "cb_uid": "c0"},
+                                 geometry=polys, crs="EPSG:3347").rename_geometry("geom")
+
+    return df, meshblock
+
+
+def test_is_noded_unsplit_t_junction():
+    """Arcs ending within the interior of another arc which shares a node with them are not noded."""
+
+    lines = [LineString([(0, 0), (10, 0)]), LineString([(0, 0), (5, 5), (5, 0)]),
+             LineString([(10, 0), (10, 10), (0, 10), (0, 0)])]
+    validation = DatasetValidation.from_datasets(*_gen_datasets(lines), engine="python")
+
+    assert not validation._is_noded()
+    assert validation.arc_faces is None
+
+    # Meshblock matches the noded and polygonized arcs.
+    expected = sorted(poly.area for poly in polygonize(unary_union(lines)))
+    assert np.allclose(sorted(validation.meshblock.area), expected)
+
+
+def test_is_noded_split_t_junction():
+    """Arcs split at the T-junction are noded."""
+
+    lines = [LineString([(0, 0), (5, 0)]), LineString([(5, 0), (10, 0)]), LineString([(0, 0), (5, 5), (5, 0)]),
+             LineString([(10, 0), (10, 10), (0, 10), (0, 0)])]
+    validation = DatasetValidation.from_datasets(*_gen_datasets(lines), engine="python")
+
+    assert validation._is_noded()
+    assert np.allclose(sorted(validation.meshblock.area), sorted(poly.area for poly in polygonize(unary_union(lines))))
+
+
+def test_incremental_meshblock_after_failed_run(tmp_path):
+    """Incremental meshblock update after a failed run matches full meshblock regeneration."""
+
+    import pandas as pd
+    import pygeos
+    from benchmark_segment import gen_network
+
+    def run(df, meshblock, state_dir=None):
+        validation = DatasetValidation.from_datasets(df, meshblock, engine="python", state_dir=state_dir,
+                                                     incremental=state_dir is not None)
+        errors, _ = validation()
+        return validation, errors
+
+    def meshblock_state(validation):
+        geoms = dict(zip(validation.meshblock["bb_uid"],
+                         pygeos.to_wkb(pygeos.normalize(validation.meshblock.geometry.values.data))))
+        links = {arc: (geoms.get(l), geoms.get(r)) for arc, l, r in
+                 validation.df[["segment_id", "bb_uid_l", "bb_uid_r"]].itertuples(index=False)}
+        return sorted(geoms.values()), links
+
+    # Initial run.
+    df, meshblock = gen_network(500, "grid", seed=0, cul_de_sacs=0)
+    df["segment_id"] = df["segment_id"].astype(str)
+    validation, errors = run(df, meshblock, tmp_path)
+    assert not any(map(len, errors.values()))
+    df, meshblock = validation.df.reset_index(drop=True), validation.meshblock
+
+    # Failed run: split a polygon with a diagonal arc and add a duplicated arc.
+    ring = pygeos.get_coordinates(pygeos.get_exterior_ring(meshblock.geometry.values.data[10]))
+    diagonal = {"segment_id": "diagonal", "bb_uid_l": None, "bb_uid_r": None, "segment_type": 1,
+                "geom": LineString([ring[0], ring[2]])}
+    duplicate = {**df.iloc[0].to_dict(), "segment_id": "duplicate"}
+    df = pd.concat([df, gpd.GeoDataFrame([diagonal, duplicate], geometry="geom", crs=df.crs)], ignore_index=True)
+    _, errors = run(df, meshblock, tmp_path)
+    assert any(map(len, errors.values()))
+
+    # Fixed run: remove the duplicated arc.
+    df = df.iloc[:-1]
+    validation_incremental, errors = run(df, meshblock, tmp_path)
+    assert not any(map(len, errors.values()))
+    validation_full, _ = run(df, meshblock)
+
+    assert meshblock_state(validation_incremental) == meshblock_state(validation_full)
+
+
+def test_tiled_matches_untiled():
+    """Tiled validation produces exactly the same errors as untiled validation."""
+
+    from benchmark_segment import gen_network
+
+    for topology_type, errors in (("grid", (101, 102, 103, 201, 202, 301, 302, 401, 402)), ("random", (401, 402))):
+        df, meshblock = gen_network(600, topology_type, seed=1, errors=errors, n_errors=2)
+        expected = DatasetValidation.from_datasets(df, meshblock, engine="python").validate()
+        assert expected[401]
+
+        for tile_mode, tile_size in (("grid", 300), ("parent", 10000)):
+            validation = DatasetValidation.from_datasets(df, meshblock, engine="python", tile_mode=tile_mode,
+                                                         tile_size=tile_size)
+            assert validation.validate() == expected
+
+
+def test_engine_auto_pushdown(monkeypatch):
+    """Engine auto applies validations 202 and 302 in-database and reuses their results for the noding check."""
+
+    import helpers
+    from benchmark_segment import gen_network
+
+    df, meshblock = gen_network(600, "grid", seed=0)
+    expected = DatasetValidation.from_datasets(df, meshblock, engine="python").validate()
+
+    # Load datasets from a mocked database, returning no invalid arcs for in-database validations.
+    queries = list()
+    monkeypatch.setattr(helpers, "create_db_engine", lambda *args, **kwargs: object())
+    monkeypatch.setattr(helpers, "load_db_datasets", lambda *args, **kwargs: (
+        {"segment": df.copy(), "basic_block": meshblock.copy()},
+        {"segment": helpers.get_coordinate_arrays(df["geom"])}))
+    monkeypatch.setattr(helpers, "execute_query", lambda engine, query, params=None: queries.append(query) or [])
+    monkeypatch.setattr(DatasetValidation, "_min_pushdown_arcs", 100)
+
+    validation = DatasetValidation("postgresql://", engine="auto")
+
+    assert validation.plan[202] == validation.plan[302] == "postgis"
+    assert ("arcs", "arcs", "crosses") not in validation._predicate_cache
+    assert ("arcs", "arcs", "overlaps") not in validation._predicate_cache
+    assert validation.arc_faces is not None
+    assert validation.validate() == expected
+    assert len(queries) == 2
+
+
+def test_duplication_duplicated(monkeypatch):
+    """Duplicated and reversed duplicated arcs are flagged, including arcs shorter than the cluster tolerance, while
+    distinct arcs which collapse when quantized are not compared."""
+
+    import pygeos
+
+    lines = [LineString([(0, 0), (10, 0)]), LineString([(0, 0), (10, 0)]),
+             LineString([(0, 10), (5, 10), (10, 10)]), LineString([(10, 10), (0, 10)]),
+             LineString([(0, 20), (10, 20)]),
+             LineString([(20, 0), (20.001, 0)]), LineString([(20.001, 0), (20, 0)])] + \
+        [LineString([(30 + idx, 0), (30.001 + idx, 0)]) for idx in range(100)]
+    validation = DatasetValidation.from_datasets(*_gen_datasets(lines), engine="python")
+
+    # Count compared arc pairs.
+    pairs = list()
+    equals = pygeos.equals
+    monkeypatch.setattr(pygeos, "equals", lambda a, b, **kwargs: pairs.append(len(a)) or equals(a, b, **kwargs))
+
+    validation.df_scope = validation.df
+    assert validation.duplication_duplicated() == {"s0", "s1", "s2", "s3", "s5", "s6"}
+    assert sum(pairs) == 3
+
+
+def test_configure_meshblock_parity_bulk():
+    """Bulk parity configuration matches the iterative parity configuration and the traversed faces, for a network
+    with holes (islands within meshblock polygons) and dangles (cul-de-sacs)."""
+
+    import pandas as pd
+    from benchmark_segment import gen_network
+
+    df, meshblock = gen_network(300, "grid", seed=0, cul_de_sacs=0.3)
+
+    # Add islands, each with a dangle, within every other meshblock polygon.
+    islands = list()
+    for x, y in (pt.coords[0] for pt in meshblock.representative_point().iloc[::2]):
+        islands.extend([LineString([(x - 3, y - 3), (x + 3, y - 3), (x + 3, y + 3)]),
+                        LineString([(x + 3, y + 3), (x - 3, y + 3), (x - 3, y - 3)]),
+                        LineString([(x + 3, y + 3), (x + 8, y + 8)])])
+    df = pd.concat([df, gpd.GeoDataFrame({"segment_id": [f"i{idx}" for idx in range(len(islands))],
+                                          "segment_type": 1}, geometry=islands, crs=df.crs).rename_geometry("geom")],
+                   ignore_index=True)
+
+    validation = DatasetValidation.from_datasets(df, meshblock, engine="python")
+    assert validation.arc_faces is not None
+    validation.meshblock_idx_geom_lookup = dict(enumerate(validation.meshblock["geom"]))
+
+    # Compile covering meshblock polygons of each arc and arcs which are not contained within a meshblock polygon.
+    idxs, idxs_meshblock = validation._query_predicate("arcs", "meshblock", "covered_by")
+    covered_by = pd.Series([tuple(idxs_meshblock[idxs == idx]) for idx in range(len(df))])
+    idxs = np.unique(validation._query_predicate("arcs", "meshblock_boundary", "covered_by")[0])
+
+    results, ambiguous = validation._configure_meshblock_parity_bulk(idxs, covered_by.iloc[idxs])
+
+    assert not ambiguous.all()
+    for idx, result, flag in zip(idxs, results, ambiguous):
+        expected = validation._configure_meshblock_parity(validation.arc_coords[idx], covered_by.iloc[idx])
+        assert expected == tuple(validation.arc_faces[idx])
+        if not flag:
+            assert tuple(result) == expected
+
+
+def test_compile_meshblock_updates():
+    """Meshblock updates are compiled, in order, into binary COPY records which round-trip their UUIDs, NULL values,
+    and geometries."""
+
+    import pandas as pd
+    import pygeos
+    import uuid
+    from helpers import encode_copy_binary
+    from test_helpers import decode_copy_binary
+
+    lines = [LineString([(0, 0), (10, 0), (10, 10)]), LineString([(10, 10), (0, 10), (0, 0)])]
+    validation = DatasetValidation.from_datasets(*_gen_datasets(lines), engine="python")
+
+    ids = [uuid.uuid4() for _ in range(6)]
+    polys = gpd.GeoSeries.from_wkt(["POLYGON ((0 0, 1 0, 1 1, 0 0))", "POLYGON ((1 1, 2 1, 2 2, 1 1))"],
+                                   crs="EPSG:3347")
+    updates = {"meshblock_added": gpd.GeoDataFrame({"bb_uid": ids[:2], "cb_uid": [ids[2], None]}, geometry=polys)
+               .rename_geometry("geom"),
+               "arcs_modified": pd.DataFrame({"segment_id": [ids[3], str(ids[4])], "bb_uid_l": [ids[0], None],
+                                              "bb_uid_r": [np.nan, str(ids[1])]}),
+               "meshblock_removed": pd.DataFrame({"bb_uid": [str(ids[5])]})}
+
+    compiled = validation._compile_meshblock_updates(updates)
+    assert list(compiled) == ["meshblock_added", "arcs_modified", "meshblock_removed"]
+    assert [update["count"] for update in compiled.values()] == [2, 2, 1]
+
+    # Decode records.
+    decoded = dict()
+    for update_type, update in compiled.items():
+        records = list(update["copy"]["records"])
+        assert decode_copy_binary(encode_copy_binary(records)) == records
+        assert all(len(record) == len(update["copy"]["columns"]) for record in records)
+        decoded[update_type] = records
+
+    def to_uuids(vals):
+        return [None if val is None else uuid.UUID(bytes=val) for val in vals]
+
+    bb_uids, cb_uids, wkbs = zip(*decoded["meshblock_added"])
+    assert to_uuids(bb_uids) == ids[:2] and to_uuids(cb_uids) == [ids[2], None]
+    assert pygeos.equals(pygeos.from_wkb(list(wkbs)), pygeos.from_shapely(polys.values)).all()
+    assert [to_uuids(record) for record in decoded["arcs_modified"]] == [[ids[3], ids[0], None],
+                                                                         [ids[4], None, ids[1]]]
+    assert to_uuids(val for val, in decoded["meshblock_removed"]) == [ids[5]]
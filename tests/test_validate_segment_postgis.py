@@ -0,0 +1,88 @@
+import os
+import pytest
+import sys
+from pathlib import Path
+from sqlalchemy import create_engine, text
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "src/canadian_road_network"))
+from benchmark_segment import gen_network
+from validate_segment import DatasetValidation
+
+# Define the PostGIS database URL of the fixture tables. Tests are skipped if not provided.
+URL = os.environ.get("EGP_TEST_DB_URL")
+SCHEMA = "test_validate_segment"
+
+requires_db = pytest.mark.skipif(not URL, reason="EGP_TEST_DB_URL (PostGIS database URL) not provided.")
+
+
+@pytest.fixture(scope="module")
+def validations():
+    """
+    Writes a synthetic network with errors for all validations to PostGIS fixture tables and validates it with the
+    python and postgis engines.
+    """
+
+    engine = create_engine(URL)
+    df, meshblock = gen_network(2000, "grid", seed=0, errors=(101, 102, 103, 201, 202, 301, 302, 401, 402), n_errors=3)
+
+    with engine.begin() as con:
+        con.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA};"))
+
+    # Write fixture tables, with uuid identifiers and spatial indexes as per the data model.
+    for name, data, columns in (("segment", df, ("segment_id", "bb_uid_l", "bb_uid_r")),
+                                ("basic_block", meshblock, ("bb_uid", "cb_uid"))):
+        data = data.copy()
+        for column in columns:
+            data[column] = data[column].map(lambda val: None if val is None else str(val))
+        data.to_postgis(name, engine, schema=SCHEMA, index=False)
+
+        with engine.begin() as con:
+            con.execute(text(f"ALTER TABLE {SCHEMA}.{name} "
+                             f"{', '.join(f'ALTER COLUMN {col} TYPE uuid USING {col}::uuid' for col in columns)}; "
+                             f"CREATE INDEX ON {SCHEMA}.{name} USING gist (geom); ANALYZE {SCHEMA}.{name};"))
+
+    try:
+        yield {engine_: DatasetValidation(URL, schema=SCHEMA, engine=engine_, writer="none")()[0]
+               for engine_ in ("python", "postgis")}
+
+    finally:
+        with engine.begin() as con:
+            con.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;"))
+
+
+@requires_db
+@pytest.mark.parametrize("code", [101, 102, 201, 202, 302])
+def test_engine_agreement(validations, code):
+    """Validations with an in-database equivalent return the same errors with both engines."""
+
+    assert len(validations["python"][code])
+    assert validations["postgis"][code] == validations["python"][code]
+
+
+def test_engine_postgis_requires_live_source():
+    """Engine postgis is refused, before connecting, for datasets which are not loaded directly from the database."""
+
+    df, meshblock = gen_network(100, "grid", seed=0)
+
+    with pytest.raises(SystemExit):
+        DatasetValidation.from_datasets(df, meshblock, url="postgresql://localhost:1/none", engine="postgis")
+
+
+@requires_db
+def test_cache_fingerprint(validations, tmp_path):
+    """Snapshot cache paths are unchanged for unchanged datasets and change immediately after a committed update."""
+
+    import helpers
+
+    engine = create_engine(URL)
+    columns = (("segment_id", "uuid"), ("geom", "geometry"))
+    path = helpers._get_cache_path(engine, "segment", columns, tmp_path, schema=SCHEMA)
+
+    assert helpers._get_cache_path(engine, "segment", columns, tmp_path, schema=SCHEMA) == path
+
+    with engine.begin() as con:
+        con.execute(text(f"UPDATE {SCHEMA}.segment SET segment_type = segment_type "
+                         f"WHERE segment_id = (SELECT segment_id FROM {SCHEMA}.segment LIMIT 1);"))
+
+    assert helpers._get_cache_path(engine, "segment", columns, tmp_path, schema=SCHEMA) != path